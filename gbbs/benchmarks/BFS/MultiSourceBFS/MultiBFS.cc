@@ -0,0 +1,68 @@
+// This code is part of the project "Theoretically Efficient Parallel Graph
+// Algorithms Can Be Fast and Scalable", presented at Symposium on Parallelism
+// in Algorithms and Architectures, 2018.
+// Copyright (c) 2018 Laxman Dhulipala, Guy Blelloch, and Julian Shun
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all  copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+// Usage:
+// numactl -i all ./MultiBFS -num_sources 64 -s -m -rounds 3 twitter_SJ
+// flags:
+//   optional:
+//     -num_sources : the number of sources, spread evenly over the vertex ids
+//     -max_hops : the number of hops after which to stop each search
+//     -rounds : the number of times to run the algorithm
+//     -c : indicate that the graph is compressed
+//     -m : indicate that the graph should be mmap'd
+//     -s : indicate that the graph is symmetric
+
+#include "MultiBFS.h"
+
+namespace gbbs {
+
+template <class Graph>
+double MultiBFS_runner(Graph& G, commandLine P) {
+  size_t num_sources = P.getOptionLongValue("-num_sources", 64);
+  uintE max_hops =
+      static_cast<uintE>(P.getOptionLongValue("-max_hops", UINT_E_MAX));
+  std::cout << "### Application: MultiBFS" << std::endl;
+  std::cout << "### Graph: " << P.getArgument(0) << std::endl;
+  std::cout << "### Threads: " << num_workers() << std::endl;
+  std::cout << "### n: " << G.n << std::endl;
+  std::cout << "### m: " << G.m << std::endl;
+  std::cout << "### Params: -num_sources = " << num_sources
+            << " -max_hops = " << max_hops << std::endl;
+  std::cout << "### ------------------------------------" << std::endl;
+  std::cout << "### ------------------------------------" << std::endl;
+
+  auto sources = sequence<uintE>::from_function(
+      num_sources, [&](size_t i) { return (uintE)(i * G.n / num_sources); });
+
+  timer t;
+  t.start();
+  auto distances = MultiBFS(G, sources, max_hops);
+  double tt = t.stop();
+
+  std::cout << "### Running Time: " << tt << std::endl;
+  return tt;
+}
+
+}  // namespace gbbs
+
+generate_main(gbbs::MultiBFS_runner, false);
@@ -0,0 +1,125 @@
+// This code is part of the project "Theoretically Efficient Parallel Graph
+// Algorithms Can Be Fast and Scalable", presented at Symposium on Parallelism
+// in Algorithms and Architectures, 2018.
+// Copyright (c) 2018 Laxman Dhulipala, Guy Blelloch, and Julian Shun
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all  copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#pragma once
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+
+// Bit-parallel multi-source BFS (Then et al., "The More the Merrier: Efficient
+// Multi-Source Graph Traversal", VLDB 2014).  Bit i of a vertex's masks stands
+// for the i-th source of a batch of up to 64 sources, so one edgeMap advances
+// the searches from every source in the batch.
+using source_mask = uint64_t;
+constexpr size_t kMultiBFSBatchSize = 8 * sizeof(source_mask);
+
+template <class W>
+struct MultiBFS_F {
+  source_mask* Seen;   // sources that have reached each vertex
+  source_mask* Visit;  // sources whose frontier contains each vertex
+  source_mask* Next;   // sources that reach each vertex in this round
+  source_mask all;     // the sources of the batch
+  MultiBFS_F(source_mask* _Seen, source_mask* _Visit, source_mask* _Next,
+             source_mask _all)
+      : Seen(_Seen), Visit(_Visit), Next(_Next), all(_all) {}
+  inline bool update(uintE s, uintE d, W w) {
+    source_mask add = Visit[s] & ~Seen[d];
+    bool first = Next[d] == 0;
+    Next[d] |= add;
+    return first && add != 0;
+  }
+  inline bool updateAtomic(uintE s, uintE d, W w) {
+    source_mask add = Visit[s] & ~Seen[d];
+    if (add == 0) return false;
+    source_mask old_next;
+    do {
+      old_next = Next[d];
+      if ((old_next | add) == old_next) return false;
+    } while (!gbbs::atomic_compare_and_swap(&Next[d], old_next,
+                                            old_next | add));
+    return old_next == 0;
+  }
+  inline bool cond(uintE d) { return (Seen[d] | Next[d]) != all; }
+};
+
+// Writes the hop distances from the k <= 64 sources to every vertex into
+// distances, which holds k rows of G.n entries, initialized to UINT_E_MAX.
+// Vertices more than max_hops hops from a source are left unreached.
+template <class Graph>
+void MultiBFS_batch(Graph& G, const uintE* sources, size_t k, uintE max_hops,
+                    uintE* distances) {
+  using W = typename Graph::weight_type;
+  size_t n = G.n;
+  auto Seen = sequence<source_mask>(n, 0);
+  auto Visit = sequence<source_mask>(n, 0);
+  auto Next = sequence<source_mask>(n, 0);
+  source_mask all =
+      (k == kMultiBFSBatchSize) ? ~source_mask{0} : (source_mask{1} << k) - 1;
+  for (size_t i = 0; i < k; i++) {
+    Seen[sources[i]] |= source_mask{1} << i;
+    Visit[sources[i]] |= source_mask{1} << i;
+    distances[i * n + sources[i]] = 0;
+  }
+  auto is_source =
+      parlay::delayed_seq<bool>(n, [&](size_t v) { return Visit[v] != 0; });
+  auto initial = parlay::pack_index<uintE>(is_source);
+  vertexSubset Frontier(n, std::move(initial));
+
+  for (uintE hops = 1; hops <= max_hops && !Frontier.isEmpty(); hops++) {
+    auto output = edgeMap(
+        G, Frontier,
+        MultiBFS_F<W>(Seen.begin(), Visit.begin(), Next.begin(), all), -1,
+        sparse_blocked);
+    vertexMap(Frontier, [&](uintE v) { Visit[v] = 0; });
+    vertexMap(output, [&](uintE v) {
+      source_mask reached = Next[v];
+      Seen[v] |= reached;
+      Visit[v] = reached;
+      Next[v] = 0;
+      while (reached) {
+        distances[__builtin_ctzll(reached) * n + v] = hops;
+        reached &= reached - 1;
+      }
+    });
+    Frontier = std::move(output);
+  }
+}
+
+// Returns the hop distances from each of the sources to every vertex, as
+// sources.size() rows of G.n entries.  Unreached vertices, including those
+// more than max_hops hops away, have distance UINT_E_MAX.
+template <class Graph>
+sequence<uintE> MultiBFS(Graph& G, const sequence<uintE>& sources,
+                         uintE max_hops = UINT_E_MAX) {
+  size_t k = sources.size();
+  auto distances = sequence<uintE>(k * G.n, UINT_E_MAX);
+  for (size_t b = 0; b < k; b += kMultiBFSBatchSize) {
+    size_t batch = std::min(kMultiBFSBatchSize, k - b);
+    MultiBFS_batch(G, sources.begin() + b, batch, max_hops,
+                   distances.begin() + b * G.n);
+  }
+  return distances;
+}
+
+}  // namespace gbbs
@@ -0,0 +1,85 @@
+#include "benchmarks/BFS/MultiSourceBFS/MultiBFS.h"
+
+#include <unordered_set>
+#include <vector>
+
+#include "gbbs/graph.h"
+#include "gbbs/macros.h"
+#include "gbbs/unit_tests/graph_test_utils.h"
+#include "gmock/gmock.h"
+#include "gtest/gtest.h"
+
+using ::testing::ElementsAre;
+using ::testing::ElementsAreArray;
+
+namespace gbbs {
+
+namespace {
+constexpr uintE kInf{UINT_E_MAX};
+}  // namespace
+
+TEST(MultiBFS, EdgelessGraph) {
+  constexpr uintE kNumVertices{3};
+  const std::unordered_set<UndirectedEdge> kEdges{};
+  auto graph{graph_test::MakeUnweightedSymmetricGraph(kNumVertices, kEdges)};
+
+  const sequence<uintE> sources{1, 2};
+  const sequence<uintE> distances{MultiBFS(graph, sources)};
+  EXPECT_THAT(distances, ElementsAre(kInf, 0, kInf, kInf, kInf, 0));
+}
+
+TEST(MultiBFS, BasicUsage) {
+  // Graph diagram:
+  //     0 - 1    2 - 3 - 4
+  //                    \ |
+  //                      5 -- 6
+  constexpr uintE kNumVertices{7};
+  const std::unordered_set<UndirectedEdge> kEdges{
+      {0, 1}, {2, 3}, {3, 4}, {3, 5}, {4, 5}, {5, 6},
+  };
+  auto graph{graph_test::MakeUnweightedSymmetricGraph(kNumVertices, kEdges)};
+
+  const sequence<uintE> sources{1, 2, 6, 2};
+  const sequence<uintE> distances{MultiBFS(graph, sources)};
+  const std::vector<uintE> kExpected{
+      1,    0,    kInf, kInf, kInf, kInf, kInf,  // from 1
+      kInf, kInf, 0,    1,    2,    2,    3,     // from 2
+      kInf, kInf, 3,    2,    2,    1,    0,     // from 6
+      kInf, kInf, 0,    1,    2,    2,    3,     // from 2
+  };
+  EXPECT_THAT(distances, ElementsAreArray(kExpected));
+}
+
+TEST(MultiBFS, MaxHops) {
+  // Graph diagram:
+  //     0 - 1 - 2 - 3
+  constexpr uintE kNumVertices{4};
+  const std::unordered_set<UndirectedEdge> kEdges{{0, 1}, {1, 2}, {2, 3}};
+  auto graph{graph_test::MakeUnweightedSymmetricGraph(kNumVertices, kEdges)};
+
+  const sequence<uintE> sources{0, 3};
+  const sequence<uintE> distances{MultiBFS(graph, sources, 1)};
+  EXPECT_THAT(distances, ElementsAre(0, 1, kInf, kInf, kInf, kInf, 1, 0));
+}
+
+TEST(MultiBFS, MoreSourcesThanBatchSize) {
+  // A path on kNumVertices vertices, searched from every vertex, so that the
+  // sources span several batches.
+  constexpr uintE kNumVertices{100};
+  std::unordered_set<UndirectedEdge> edges;
+  for (uintE v = 0; v + 1 < kNumVertices; v++) {
+    edges.insert({v, v + 1});
+  }
+  auto graph{graph_test::MakeUnweightedSymmetricGraph(kNumVertices, edges)};
+
+  const auto sources{
+      sequence<uintE>::from_function(kNumVertices, [](size_t i) { return i; })};
+  const sequence<uintE> distances{MultiBFS(graph, sources)};
+  for (uintE s = 0; s < kNumVertices; s++) {
+    for (uintE v = 0; v < kNumVertices; v++) {
+      EXPECT_EQ(distances[s * kNumVertices + v], s > v ? s - v : v - s);
+    }
+  }
+}
+
+}  // namespace gbbs
@@ -0,0 +1,134 @@
+// This code is part of the project "Theoretically Efficient Parallel Graph
+// Algorithms Can Be Fast and Scalable", presented at Symposium on Parallelism
+// in Algorithms and Architectures, 2018.
+// Copyright (c) 2018 Laxman Dhulipala, Guy Blelloch, and Julian Shun
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all  copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#pragma once
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+
+// Bellman-Ford from a batch of k sources at once.  A vertex is in the frontier
+// if its distance from any of the sources decreased, and each edge visit
+// relaxes the distances from all k sources, so the searches share their
+// edgeMaps.  SP[v * k + i] is the distance from the i-th source to v.
+template <class W, class Distance>
+struct MultiBF_F {
+  Distance* SP;
+  intE* Visited;
+  size_t k;
+  Distance max_distance;
+  MultiBF_F(Distance* _SP, intE* _Visited, size_t _k, Distance _max_distance)
+      : SP(_SP), Visited(_Visited), k(_k), max_distance(_max_distance) {}
+  inline Distance relaxed(const Distance& dist, const W& edgeLen) {
+    if
+      constexpr(std::is_same<W, gbbs::empty>()) { return dist + 1; }
+    else {
+      return dist + edgeLen;
+    }
+  }
+  inline bool update(const uintE& s, const uintE& d, const W& edgeLen) {
+    bool improved = false;
+    for (size_t i = 0; i < k; i++) {
+      Distance dist = SP[s * k + i];
+      if (dist == std::numeric_limits<Distance>::max()) continue;
+      Distance newDist = relaxed(dist, edgeLen);
+      if (newDist <= max_distance && SP[d * k + i] > newDist) {
+        SP[d * k + i] = newDist;
+        improved = true;
+      }
+    }
+    if (improved && Visited[d] == 0) {
+      Visited[d] = 1;
+      return 1;
+    }
+    return 0;
+  }
+  inline bool updateAtomic(const uintE& s, const uintE& d,
+                           const W& edgeLen) {
+    bool improved = false;
+    for (size_t i = 0; i < k; i++) {
+      Distance dist = SP[s * k + i];
+      if (dist == std::numeric_limits<Distance>::max()) continue;
+      Distance newDist = relaxed(dist, edgeLen);
+      if (newDist <= max_distance) {
+        improved |= gbbs::write_min(&SP[d * k + i], newDist);
+      }
+    }
+    return improved && gbbs::atomic_compare_and_swap(&Visited[d], 0, 1);
+  }
+  inline bool cond(uintE d) { return cond_true(d); }
+};
+
+template <class W>
+using MultiBF_Distance =
+    typename std::conditional<std::is_same<W, gbbs::empty>::value, uintE,
+                              W>::type;
+
+// Returns the distances from each of the sources to every vertex, as
+// sources.size() rows of G.n entries.  Unreached vertices, including those
+// farther than max_distance, have the maximum Distance.
+template <class Graph>
+auto MultiBellmanFord(
+    Graph& G, const sequence<uintE>& sources,
+    MultiBF_Distance<typename Graph::weight_type> max_distance =
+        std::numeric_limits<
+            MultiBF_Distance<typename Graph::weight_type>>::max()) {
+  using W = typename Graph::weight_type;
+  using Distance = MultiBF_Distance<W>;
+  constexpr Distance kMaxDistance = std::numeric_limits<Distance>::max();
+
+  size_t n = G.n;
+  size_t k = sources.size();
+  auto Visited = sequence<int>(n, 0);
+  auto SP = sequence<Distance>(n * k, kMaxDistance);
+  for (size_t i = 0; i < k; i++) {
+    SP[sources[i] * k + i] = 0;
+  }
+  auto is_source = parlay::delayed_seq<bool>(n, [&](size_t v) {
+    for (size_t i = 0; i < k; i++) {
+      if (SP[v * k + i] == 0) return true;
+    }
+    return false;
+  });
+  vertexSubset Frontier(n, parlay::pack_index<uintE>(is_source));
+  size_t round = 0;
+  while (!Frontier.isEmpty()) {
+    // Check for a negative weight cycle
+    if (round == n) {
+      std::cout << " Found negative weight cycle." << std::endl;
+      break;
+    }
+    auto em_f =
+        MultiBF_F<W, Distance>(SP.begin(), Visited.begin(), k, max_distance);
+    auto output =
+        edgeMap(G, Frontier, em_f, G.m / 10, sparse_blocked | dense_forward);
+    vertexMap(output, [&](uintE v) { Visited[v] = 0; });
+    Frontier = std::move(output);
+    round++;
+  }
+  std::cout << "n rounds = " << round << "\n";
+  return sequence<Distance>::from_function(
+      k * n, [&](size_t j) { return SP[(j % n) * k + j / n]; });
+}
+
+}  // namespace gbbs
@@ -0,0 +1,132 @@
+#include "benchmarks/GeneralWeightSSSP/BellmanFord/MultiBellmanFord.h"
+
+#include <limits>
+#include <unordered_set>
+#include <vector>
+
+#include "gbbs/graph.h"
+#include "gbbs/graph_io.h"
+#include "gbbs/macros.h"
+#include "gbbs/unit_tests/graph_test_utils.h"
+#include "gmock/gmock.h"
+#include "gtest/gtest.h"
+
+using ::testing::ElementsAre;
+using ::testing::ElementsAreArray;
+
+namespace gbbs {
+
+namespace {
+constexpr uintE kUnweightedInf{UINT_E_MAX};
+constexpr intE kInf{std::numeric_limits<intE>::max()};
+}  // namespace
+
+TEST(MultiBellmanFord, EdgelessGraph) {
+  constexpr uintE kNumVertices{3};
+  const std::unordered_set<UndirectedEdge> kEdges{};
+  auto graph{graph_test::MakeUnweightedSymmetricGraph(kNumVertices, kEdges)};
+
+  const sequence<uintE> sources{1, 2};
+  const auto distances{MultiBellmanFord(graph, sources)};
+  EXPECT_THAT(distances, ElementsAre(kUnweightedInf, 0, kUnweightedInf,
+                                     kUnweightedInf, kUnweightedInf, 0));
+}
+
+TEST(MultiBellmanFord, UnweightedGraph) {
+  // Graph diagram:
+  //     0 - 1    2 - 3 - 4
+  //                    \ |
+  //                      5 -- 6
+  constexpr uintE kNumVertices{7};
+  const std::unordered_set<UndirectedEdge> kEdges{
+      {0, 1}, {2, 3}, {3, 4}, {3, 5}, {4, 5}, {5, 6},
+  };
+  auto graph{graph_test::MakeUnweightedSymmetricGraph(kNumVertices, kEdges)};
+
+  constexpr uintE kInf{kUnweightedInf};
+  const sequence<uintE> sources{1, 2, 6};
+  const auto distances{MultiBellmanFord(graph, sources)};
+  const std::vector<uintE> kExpected{
+      1,    0,    kInf, kInf, kInf, kInf, kInf,  // from 1
+      kInf, kInf, 0,    1,    2,    2,    3,     // from 2
+      kInf, kInf, 3,    2,    2,    1,    0,     // from 6
+  };
+  EXPECT_THAT(distances, ElementsAreArray(kExpected));
+}
+
+TEST(MultiBellmanFord, WeightedGraph) {
+  // Graph diagram, with edge weights in parentheses:
+  //     0 -(1)- 1 -(1)- 2
+  //      \             /
+  //       ------(5)----
+  //     3 -(7)- 4
+  const std::vector<gbbs_io::Edge<intE>> kEdges{
+      {0, 1, 1}, {1, 2, 1}, {0, 2, 5}, {3, 4, 7},
+  };
+  auto graph{gbbs_io::edge_list_to_symmetric_graph(kEdges)};
+
+  const sequence<uintE> sources{0, 2, 3};
+  const auto distances{MultiBellmanFord(graph, sources)};
+  const std::vector<intE> kExpected{
+      0,    1,    2,    kInf, kInf,  // from 0
+      2,    1,    0,    kInf, kInf,  // from 2
+      kInf, kInf, kInf, 0,    7,     // from 3
+  };
+  EXPECT_THAT(distances, ElementsAreArray(kExpected));
+}
+
+TEST(MultiBellmanFord, NegativeWeights) {
+  // Graph diagram, with edge weights in parentheses:
+  //     0 --(4)--> 1 --(-3)--> 2
+  //     |                      ^
+  //     ----------(2)-----------
+  const std::vector<gbbs_io::Edge<intE>> kEdges{
+      {0, 1, 4}, {1, 2, -3}, {0, 2, 2},
+  };
+  auto graph{gbbs_io::edge_list_to_asymmetric_graph(kEdges)};
+
+  const sequence<uintE> sources{0, 1};
+  const auto distances{MultiBellmanFord(graph, sources)};
+  EXPECT_THAT(distances, ElementsAre(0, 4, 1, kInf, 0, -3));
+}
+
+TEST(MultiBellmanFord, MaxDistance) {
+  // Graph diagram, with edge weights in parentheses:
+  //     0 -(2)- 1 -(2)- 2 -(2)- 3
+  const std::vector<gbbs_io::Edge<intE>> kEdges{
+      {0, 1, 2}, {1, 2, 2}, {2, 3, 2},
+  };
+  auto graph{gbbs_io::edge_list_to_symmetric_graph(kEdges)};
+
+  const sequence<uintE> sources{0, 3};
+  const auto distances{MultiBellmanFord(graph, sources, 3)};
+  EXPECT_THAT(distances, ElementsAre(0, 2, kInf, kInf, kInf, kInf, 2, 0));
+}
+
+TEST(MultiBellmanFord, MatchesSingleSourceSearches) {
+  // A weighted path on kNumVertices vertices, searched from every vertex, so
+  // that each edge relaxes many sources at once.
+  constexpr uintE kNumVertices{50};
+  std::vector<gbbs_io::Edge<intE>> edges;
+  for (uintE v = 0; v + 1 < kNumVertices; v++) {
+    edges.emplace_back(v, v + 1, intE(v % 3 + 1));
+  }
+  auto graph{gbbs_io::edge_list_to_symmetric_graph(edges)};
+
+  // prefix[v] is the distance from 0 to v.
+  std::vector<intE> prefix(kNumVertices, 0);
+  for (uintE v = 1; v < kNumVertices; v++) {
+    prefix[v] = prefix[v - 1] + intE((v - 1) % 3 + 1);
+  }
+  const auto sources{
+      sequence<uintE>::from_function(kNumVertices, [](size_t i) { return i; })};
+  const auto distances{MultiBellmanFord(graph, sources)};
+  for (uintE s = 0; s < kNumVertices; s++) {
+    for (uintE v = 0; v < kNumVertices; v++) {
+      EXPECT_EQ(distances[s * kNumVertices + v],
+                s > v ? prefix[s] - prefix[v] : prefix[v] - prefix[s]);
+    }
+  }
+}
+
+}  // namespace gbbs
@@ -90,8 +90,13 @@ void initialize_trussness_values(Graph& GA, MT& multi_table) {
 //
 //   3.b Get the entries of the HT, actually decrement their coreness, see if
 //   their bucket needs to be updated and if so, update.
+//
+// Returns (u, v, k) for each edge with u < v, where k is the largest value
+// such that the edge is in a subgraph in which every edge is in at least k
+// triangles. Edges in no triangle have k = 0.
 template <class Graph>
-void KTruss_ht(Graph& GA, size_t num_buckets = 16) {
+sequence<std::tuple<uintE, uintE, uintE>> KTruss_ht(Graph& GA,
+                                                    size_t num_buckets = 16) {
   using W = typename Graph::weight_type;
   size_t n_edges = GA.m / 2;
 
@@ -197,11 +202,13 @@ void KTruss_ht(Graph& GA, size_t num_buckets = 16) {
 
     if (k == 0 || finished == n_edges) {
       // No triangles incident to these edges. We set their trussness to MAX,
-      // which is safe since there are no readers until we output.
+      // which is safe since there are no readers until we output. The edges of
+      // the last bucket are unmarked like those of the other rounds.
       parallel_for(0, rem_edges.size(), [&](size_t i) {
         edge_t id = rem_edges[i];
+        // UINT_E_MAX is reserved
         std::get<1>(trussness_multi.big_table[id]) =
-            std::numeric_limits<int>::max();  // UINT_E_MAX is reserved
+            (k == 0) ? std::numeric_limits<int>::max() : k - 1;
       });
       continue;
     }
@@ -373,6 +380,23 @@ void KTruss_ht(Graph& GA, size_t num_buckets = 16) {
   // Edges with trussness 0 had their values stored as
   // std::numeric_limits<int>::max()
   std::cout << "iters = " << iter << std::endl;
+
+  auto vertex_trussness = parlay::tabulate(GA.n, [&](size_t u) {
+    auto cells = parlay::make_slice(
+        trussness_multi.big_table + trussness_multi.offsets[u] + 1,
+        trussness_multi.big_table + trussness_multi.offsets[u + 1] - 1);
+    auto edges = parlay::filter(cells, [&](const auto& cell) {
+      return std::get<1>(cell) != UINT_E_MAX;
+    });
+    return parlay::map(edges, [&](const auto& cell) {
+      trussness_t truss = std::get<1>(cell);
+      return std::make_tuple(
+          (uintE)u, std::get<0>(cell),
+          (truss == (trussness_t)std::numeric_limits<int>::max()) ? 0
+                                                                  : truss + 1);
+    });
+  });
+  return parlay::flatten(vertex_trussness);
 }
 
 }  // namespace gbbs
@@ -185,7 +185,9 @@ class multi_table {
     offsets = sequence<size_t>(n + 1);
     parallel_for(0, n, [&](size_t i) {
       size_t table_elms = size_func(i);
-      offsets[i] = (1 << parlay::log2_up((size_t)(table_elms * 1.2))) +
+      // Vertices without edges still get a table with a single cell.
+      size_t table_size = std::max((size_t)(table_elms * 1.2), (size_t)1);
+      offsets[i] = ((size_t)1 << parlay::log2_up(table_size)) +
                    2;  // 2 cell padding (l, r)
     });
     offsets[n] = 0;
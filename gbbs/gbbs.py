@@ -1,40 +1,161 @@
 from gbbs_lib import *
 import gbbs_lib
+import asyncio
+import functools
+import itertools
+import multiprocessing
+import numpy as np
 import os
+import pickle
+import queue
+import resource
+import shutil
+import tempfile
+import threading
+import time
+import warnings
+import weakref
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from multiprocessing import shared_memory
+
+# Graphs loaded by this process, most recently used last, keyed by
+# (path, mtime, size, format, symmetric, weighted) of the input file, so that a
+# changed file is loaded again.  Graphs are evicted in LRU order once their
+# estimated size exceeds graphCacheBudget bytes.
+graphCache = OrderedDict()
+graphCacheBytes = 0
+graphCacheBudget = 4 << 30
+graphCacheLock = threading.RLock()
+# Loads in progress, keyed as in graphCache, mapped to futures of their graphs.
+# Graphs are loaded without holding graphCacheLock, so a slow load only blocks
+# the other loads of the same graph, which wait for its future.
+graphLoads = dict()
+
+def setGraphCacheBudget(budget):
+  global graphCacheBudget
+  with graphCacheLock:
+    graphCacheBudget = budget
+    evictGraphs()
+
+def clearGraphCache():
+  global graphCacheBytes
+  with graphCacheLock:
+    graphCache.clear()
+    graphCacheBytes = 0
+
+def evictGraphs():
+  global graphCacheBytes
+  while (graphCache and graphCacheBytes > graphCacheBudget):
+    _, (_, size) = graphCache.popitem(last=False)
+    graphCacheBytes -= size
+
+# Estimated size of G in bytes: the vertex data and the edges, in both
+# directions for asymmetric graphs.
+def graphBytes(G, symmetric, weighted):
+  size = 16 * G.numVertices() + (8 if weighted else 4) * G.numEdges()
+  return size if symmetric else 2 * size
+
+def cachedGraph(graphPath, format, symmetric, weighted, load):
+  global graphCacheBytes
+  path = os.path.abspath(graphPath)
+  info = os.stat(path)
+  key = (path, info.st_mtime_ns, info.st_size, format, symmetric, weighted)
+  with graphCacheLock:
+    if (key in graphCache):
+      graphCache.move_to_end(key)
+      return graphCache[key][0]
+    future = graphLoads.get(key)
+    loading = future is None
+    if (loading):
+      for stale in [k for k in graphCache
+                    if k[0] == path and k[1:3] != key[1:3]]:
+        graphCacheBytes -= graphCache.pop(stale)[1]
+      future = graphLoads[key] = Future()
+  if (not loading):
+    return future.result()
+  try:
+    G = load()
+    if (isinstance(G, gbbs_lib.GraphHandle)):
+      size = graphBytes(G.graph, G.symmetric, G.weighted)
+    else:
+      size = graphBytes(G, symmetric, weighted)
+  except BaseException as e:
+    with graphCacheLock:
+      del graphLoads[key]
+    future.set_exception(e)
+    raise
+  with graphCacheLock:
+    del graphLoads[key]
+    if (size <= graphCacheBudget):
+      graphCache[key] = (G, size)
+      graphCacheBytes += size
+      evictGraphs()
+  future.set_result(G)
+  return G
+
+# Remove artifact, a file converted from source, if source changed after it
+# was written.
+def removeStaleArtifact(source, artifact):
+  if (os.path.exists(artifact) and
+      os.path.getmtime(artifact) < os.path.getmtime(source)):
+    os.remove(artifact)
 
 def loadGraph(graphPath="",undirected=True, compressed=False, binary=False):
   if (graphPath == ""):
     print("Expect a non-empty path to the graph input file")
     exit(0)
-  if (undirected):
-    if (compressed):
-      return gbbs_lib.readCompressedSymmetricUnweightedGraph(graphPath)
-    else:
-      return gbbs_lib.readSymmetricUnweightedGraph(graphPath, binary)
-  else:
-    if (compressed):
-      return gbbs_lib.readCompressedAsymmetricUnweightedGraph(graphPath)
+  def load():
+    if (undirected):
+      if (compressed):
+        return gbbs_lib.readCompressedSymmetricUnweightedGraph(graphPath)
+      else:
+        return gbbs_lib.readSymmetricUnweightedGraph(graphPath, binary)
     else:
-      return gbbs_lib.readAsymmetricUnweightedGraph(graphPath, binary)
+      if (compressed):
+        return gbbs_lib.readCompressedAsymmetricUnweightedGraph(graphPath)
+      else:
+        return gbbs_lib.readAsymmetricUnweightedGraph(graphPath, binary)
+  format = "compressed" if compressed else ("binary" if binary else "adj")
+  return cachedGraph(graphPath, format, undirected, False, load)
 
-def loadFloatGraph(graphPath="", undirected=True):
+# Opens a graph in the adjacency text, binary, or compressed format, detecting
+# the format.  The returned handle has the graph (handle.graph) and read-only
+# NumPy views of its CSR arrays; for binary graphs these share a mapping of
+# the file.  undirected is only needed for text graphs.
+def openGraph(graphPath="", undirected=None, weightType="float"):
   if (graphPath == ""):
     print("Expect a non-empty path to the graph input file")
     exit(0)
-  if (undirected):
-    return gbbs_lib.readSymmetricFloatWeightedGraph(graphPath, binary)
-  else:
-    return gbbs_lib.readAsymmetricFloatWeightedGraph(graphPath, binary)
+  return cachedGraph(graphPath, gbbs_lib.graphFormat(graphPath), undirected,
+                     weightType,
+                     lambda: gbbs_lib.openGraph(graphPath, undirected,
+                                                weightType))
+
+def loadFloatGraph(graphPath="", undirected=True, binary=False):
+  if (graphPath == ""):
+    print("Expect a non-empty path to the graph input file")
+    exit(0)
+  def load():
+    if (undirected):
+      return gbbs_lib.readSymmetricFloatWeightedGraph(graphPath, binary)
+    else:
+      return gbbs_lib.readAsymmetricFloatWeightedGraph(graphPath, binary)
+  format = "binary" if binary else "adj"
+  return cachedGraph(graphPath, format, undirected, True, load)
 
 def loadSnap(graphPath="", undirected=True):
   if (graphPath == ""):
     print("Expect a non-empty path to the graph input file")
     exit(0)
   graphName = os.path.splitext(graphPath)[0]+'.adj'
-  if (undirected):
-    return gbbs_lib.loadSymmetricEdgeListAsGraph(graphPath, graphName)
-  else:
-    return gbbs_lib.loadAsymmetricEdgeListAsGraph(graphPath, graphName)
+  removeStaleArtifact(graphPath, graphName)
+  def load():
+    if (undirected):
+      return gbbs_lib.loadSymmetricEdgeListAsGraph(graphPath, graphName)
+    else:
+      return gbbs_lib.loadAsymmetricEdgeListAsGraph(graphPath, graphName)
+  return cachedGraph(graphPath, "snap", undirected, False, load)
   print("Unsupported options")
   exit(0)
 
@@ -42,28 +163,446 @@ def loadFloatSnap(graphPath="", undirected=True):
   if (graphPath == ""):
     print("Expect a non-empty path to the graph input file")
     exit(0)
-  if (undirected):
-    return gbbs_lib.loadSymmetricFloatEdgeListAsGraph(graphPath)
-  else:
-    return gbbs_lib.loadAsymmetricFloatEdgeListAsGraph(graphPath)
+  def load():
+    if (undirected):
+      return gbbs_lib.loadSymmetricFloatEdgeListAsGraph(graphPath)
+    else:
+      return gbbs_lib.loadAsymmetricFloatEdgeListAsGraph(graphPath)
+  return cachedGraph(graphPath, "snap", undirected, True, load)
   print("Unsupported options")
   exit(0)
 
-def loadFromEdgeList(edges, symmetric=True, weighted=False):
-  if (symmetric):
-    if (not weighted):
-      return gbbs_lib.numpyEdgeListToSymmetricUnweightedGraph(edges)
-    else:
-      if (edges.dtype == "float64" or edges.dtype == "float32"):
-        return gbbs_lib.numpyFloatEdgeListToSymmetricWeightedGraph(edges)
-      elif (edges.dtype == "uint64"):
-        return gbbs_lib.numpyUintEdgeListToSymmetricWeightedGraph(edges)
-      else:
-        print("unknown edge type")
-        print(edges.dtype)
-        exit(0)
-  else:
-    exit(0)
+# Out-of-core conversion of SNAP edge lists to the binary format (-b), or with
+# compressed=True to the compressed format (-c), for graphs too large to build
+# in memory.  The edge list is parsed in chunks into a binary spill file, which
+# is then split by source into ranges of vertices with at most chunkEdges
+# edges each; every range is sorted, deduplicated and written in turn.  Memory
+# holds one chunk and 8 bytes per vertex; the intermediate files, about 3x the
+# size of the binary graph, go in a directory under tmpDir (by default the
+# directory of outPath).  As in loadSnap, self-loops are dropped, undirected
+# graphs get both directions of every edge, and vertex ids range up to the
+# largest one of an edge.
+# Bytes of edge list text read at a time, per edge of chunkEdges.
+snapEdgeBytes = 8
+uintEMax = (1 << 32) - 1
+
+# Yields the edges of the SNAP edge list in graphPath as [k x 2] uint32 arrays
+# of about chunkBytes bytes of text each.
+def readSnapChunks(graphPath, chunkBytes):
+  rest = b""
+  with open(graphPath, "rb") as f:
+    while (True):
+      block = f.read(chunkBytes)
+      if (not block):
+        break
+      block = rest + block
+      end = block.rfind(b"\n") + 1
+      rest = block[end:]
+      if (end > 0):
+        yield parseSnapBlock(graphPath, block[:end])
+  if (rest):
+    yield parseSnapBlock(graphPath, rest)
+
+def parseSnapBlock(graphPath, block):
+  if (b"#" in block):
+    block = b"\n".join(line for line in block.split(b"\n")
+                       if not line.lstrip().startswith(b"#"))
+  # fromstring only warns, and stops parsing, at text that is not an integer.
+  try:
+    with warnings.catch_warnings():
+      warnings.simplefilter("error")
+      ids = np.fromstring(block, dtype=np.int64, sep=" ")
+  except (ValueError, DeprecationWarning):
+    raise ValueError("Malformed edge list: " + graphPath)
+  if (ids.size % 2 != 0):
+    raise ValueError("Odd number of vertex ids in edge list: " + graphPath)
+  if (ids.size and (ids.min() < 0 or ids.max() >= uintEMax)):
+    raise ValueError("Vertex ids must be in [0, %d): %s" %
+                     (uintEMax, graphPath))
+  return ids.astype(np.uint32).reshape(-1, 2)
+
+# Splits [0, n) into ranges of vertices whose degrees sum to at most maxEdges,
+# except for single vertices of larger degree.  Returns the first vertex of
+# each range, followed by n.
+def degreeRanges(degrees, maxEdges):
+  ends = np.cumsum(degrees)
+  starts = [0]
+  while (starts[-1] < len(degrees)):
+    start = starts[-1]
+    before = ends[start - 1] if start > 0 else 0
+    end = int(np.searchsorted(ends, before + maxEdges, side="right"))
+    starts.append(min(max(end, start + 1), len(degrees)))
+  return np.array(starts, dtype=np.int64)
+
+# Appends the edges to the range files of their first endpoints.
+def partitionEdges(edges, starts, files):
+  part = np.searchsorted(starts, edges[:, 0], side="right") - 1
+  order = np.argsort(part, kind="stable")
+  bounds = np.searchsorted(part[order], np.arange(len(files) + 1))
+  edges = edges[order]
+  for p in np.flatnonzero(bounds[1:] > bounds[:-1]):
+    edges[bounds[p]:bounds[p + 1]].tofile(files[p])
+
+# Writes the CSR section of the binary format at position start of out, from
+# the range files: the header (n, m, and the size of the section), the n + 1
+# offsets, and the m neighbors.  Returns the size of the section and m.
+def writeBinarySection(out, start, n, starts, paths):
+  offsetsStart = start + 3 * 8
+  edgesStart = offsetsStart + 8 * (n + 1)
+  m = 0
+  for p, path in enumerate(paths):
+    lo, hi = int(starts[p]), int(starts[p + 1])
+    edges = np.fromfile(path, dtype=np.uint32).reshape(-1, 2)
+    os.remove(path)
+    keys = ((edges[:, 0] - lo).astype(np.uint64) << np.uint64(32)) | edges[:, 1]
+    del edges
+    keys = np.unique(keys)
+    degrees = np.bincount((keys >> np.uint64(32)).astype(np.int64),
+                          minlength=hi - lo)
+    offsets = np.zeros(hi - lo, dtype=np.uint64)
+    offsets[1:] = np.cumsum(degrees[:-1])
+    offsets += np.uint64(m)
+    out.seek(offsetsStart + 8 * lo)
+    offsets.tofile(out)
+    out.seek(edgesStart + 4 * m)
+    (keys & np.uint64(uintEMax)).astype(np.uint32).tofile(out)
+    m += len(keys)
+  size = edgesStart - start + 4 * m
+  out.seek(offsetsStart + 8 * n)
+  np.array([m], dtype=np.uint64).tofile(out)
+  out.seek(start)
+  np.array([n, m, size], dtype=np.int64).tofile(out)
+  return size, m
+
+# Converts the SNAP edge list in graphPath to a graph in outPath, and returns
+# the statistics of the conversion: the number of edges read, n and m of the
+# graph, the time taken, edges read per second, and the peak resident set size
+# of this process in bytes.
+def convertSnap(graphPath, outPath, undirected=True, compressed=False,
+                chunkEdges=1 << 25, tmpDir=None):
+  begin = time.time()
+  if (tmpDir is None):
+    tmpDir = os.path.dirname(os.path.abspath(outPath))
+  with tempfile.TemporaryDirectory(prefix="gbbs-convert-", dir=tmpDir) as tmp:
+    # 1. Parse the edge list into a spill file, counting degrees.
+    spillPath = os.path.join(tmp, "edges")
+    degrees = [np.zeros(0, dtype=np.uint64)
+               for _ in range(1 if undirected else 2)]
+    read = 0
+    with open(spillPath, "wb") as spill:
+      for edges in readSnapChunks(graphPath, chunkEdges * snapEdgeBytes):
+        read += len(edges)
+        edges = edges[edges[:, 0] != edges[:, 1]]
+        if (len(edges) == 0):
+          continue
+        edges.tofile(spill)
+        ends = [edges.ravel()] if undirected else [edges[:, 0], edges[:, 1]]
+        for d, ids in enumerate(ends):
+          top = int(ids.max()) + 1
+          if (top > len(degrees[d])):
+            grown = np.zeros(max(top, 2 * len(degrees[d])), dtype=np.uint64)
+            grown[:len(degrees[d])] = degrees[d]
+            degrees[d] = grown
+          degrees[d] += np.bincount(
+              ids, minlength=len(degrees[d])).astype(np.uint64)
+    n = max([int(np.flatnonzero(d).max()) + 1 if d.any() else 0
+             for d in degrees])
+
+    # 2. Split the edges into ranges of vertices: by source for the
+    # out-neighbors, and by target for the in-neighbors of directed graphs.
+    sections = []
+    for d in range(len(degrees)):
+      counts = degrees[d][:n]
+      counts = np.pad(counts, (0, n - len(counts)))
+      starts = degreeRanges(counts, chunkEdges)
+      paths = [os.path.join(tmp, "part%d-%d" % (d, p))
+               for p in range(len(starts) - 1)]
+      sections.append((starts, paths))
+    del degrees
+    files = [[open(path, "wb") for path in paths] for _, paths in sections]
+    try:
+      with open(spillPath, "rb") as spill:
+        while (True):
+          edges = np.fromfile(spill, dtype=np.uint32, count=2 * chunkEdges)
+          if (edges.size == 0):
+            break
+          edges = edges.reshape(-1, 2)
+          if (undirected):
+            partitionEdges(np.concatenate([edges, edges[:, ::-1]]),
+                           sections[0][0], files[0])
+          else:
+            partitionEdges(edges, sections[0][0], files[0])
+            partitionEdges(np.ascontiguousarray(edges[:, ::-1]),
+                           sections[1][0], files[1])
+    finally:
+      for f in [f for fs in files for f in fs]:
+        f.close()
+    os.remove(spillPath)
+
+    # 3. Sort, deduplicate and write the ranges, in order.
+    binaryPath = os.path.join(tmp, "graph.bin")
+    with open(binaryPath, "wb") as out:
+      start = 0
+      for starts, paths in sections:
+        size, m = writeBinarySection(out, start, n, starts, paths)
+        start += size
+    if (compressed):
+      gbbs_lib.compressBinaryGraph(binaryPath, binaryPath + ".c")
+      binaryPath += ".c"
+    shutil.move(binaryPath, outPath)
+
+  seconds = time.time() - begin
+  stats = {
+      "edges": read,
+      "n": n,
+      "m": m,
+      "seconds": seconds,
+      "edgesPerSecond": read / seconds if seconds > 0 else 0.0,
+      "peakRSS": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,
+  }
+  print("# converted %d edges to n = %d, m = %d in %.3fs: %.0f edges/s, "
+        "peak RSS %.1f MiB" % (read, n, m, seconds, stats["edgesPerSecond"],
+                               stats["peakRSS"] / (1 << 20)))
+  return stats
+
+# edges is an [m x 2] integer array, or [m x 3] with weighted=True; weights,
+# if given, is an array of m float or integer weights.
+def loadFromEdgeList(edges, symmetric=True, weighted=False, weights=None,
+                     dedupe=True, removeSelfLoops=True):
+  return gbbs_lib.numpyEdgeListToGraph(edges, weights, weighted, symmetric,
+                                       dedupe, removeSelfLoops)
 
 #def test_numpy_array(np_arr):
 #  return gbbs_lib.testNumpyArray(np_arr)
+
+# Asynchronous calls.  gbbs_lib releases the GIL while GBBS computes, so
+# other threads and the event loop keep running; GBBS computations themselves
+# run one at a time, each on all cores.
+asyncExecutor = None
+
+# Returns an awaitable for f(*args, **kwargs), run on a worker thread.
+def runAsync(f, *args, **kwargs):
+  global asyncExecutor
+  if (asyncExecutor is None):
+    asyncExecutor = ThreadPoolExecutor(thread_name_prefix="gbbs")
+  loop = asyncio.get_running_loop()
+  return loop.run_in_executor(asyncExecutor,
+                              functools.partial(f, *args, **kwargs))
+
+# Wraps a graph so that its methods return awaitables, e.g.
+#   parents = await AsyncGraph(G).BFS(0)
+class AsyncGraph:
+  def __init__(self, graph):
+    self.graph = graph
+
+  def __getattr__(self, name):
+    method = getattr(self.graph, name)
+    return lambda *args, **kwargs: runAsync(method, *args, **kwargs)
+
+# Multi-process calls.  A GraphPool runs GBBS calls on one binary graph in
+# worker processes, each pinned to its own cores with a GBBS scheduler of that
+# width, so that many small queries run side by side instead of one at a time
+# on all cores.  Every worker maps the same file, so the graph is in memory
+# once, in the page cache.  Array results of at least sharedResultBytes bytes
+# come back through shared memory rather than the result queue.
+sharedResultBytes = 1 << 16
+
+# Returns result with its large arrays moved to shared memory, as
+# (name, shape, dtype) descriptors.
+def shareResult(result):
+  if (isinstance(result, (tuple, list))):
+    return type(result)(shareResult(r) for r in result)
+  if (not isinstance(result, np.ndarray) or result.nbytes < sharedResultBytes):
+    return result
+  shm = shared_memory.SharedMemory(create=True, size=result.nbytes)
+  try:
+    np.ndarray(result.shape, result.dtype, buffer=shm.buf)[...] = result
+  except BaseException:
+    shm.unlink()
+    raise
+  finally:
+    shm.close()
+  return SharedResult(shm.name, result.shape, result.dtype.str)
+
+class SharedResult:
+  def __init__(self, name, shape, dtype):
+    self.name = name
+    self.shape = shape
+    self.dtype = dtype
+
+# Returns result with the arrays in shared memory attached.  The shared memory
+# is unlinked at once, and unmapped when the array is freed.
+def attachResult(result):
+  if (isinstance(result, (tuple, list))):
+    return type(result)(attachResult(r) for r in result)
+  if (not isinstance(result, SharedResult)):
+    return result
+  shm = shared_memory.SharedMemory(name=result.name)
+  shm.unlink()
+  array = np.ndarray(result.shape, np.dtype(result.dtype), buffer=shm.buf)
+  weakref.finalize(array, shm.close)
+  return array
+
+# Removes the shared memory of a result that is not returned.
+def discardResult(result):
+  if (isinstance(result, (tuple, list))):
+    for r in result:
+      discardResult(r)
+  elif (isinstance(result, SharedResult)):
+    shm = shared_memory.SharedMemory(name=result.name)
+    shm.unlink()
+    shm.close()
+
+def graphPoolWorker(graphPath, undirected, weightType, cores, tasks, results):
+  # Before the GBBS scheduler starts, so that its threads inherit both.
+  os.sched_setaffinity(0, cores)
+  os.environ["PARLAY_NUM_THREADS"] = str(len(cores))
+  try:
+    graph = gbbs_lib.openGraph(graphPath, undirected, weightType).graph
+  except Exception as e:
+    results.put((None, None, e))
+    return
+  while (True):
+    task = tasks.get()
+    if (task is None):
+      return
+    id, name, args, kwargs = task
+    try:
+      results.put((id, shareResult(getattr(graph, name)(*args, **kwargs)),
+                   None))
+    except Exception as e:
+      try:
+        pickle.dumps(e)
+      except Exception:
+        e = RuntimeError("%s: %s" % (type(e).__name__, e))
+      results.put((id, None, e))
+
+# A pool of worker processes that call methods of the graph in graphPath,
+# which must be in the binary format (see convertSnap).  The workers share
+# the given cores (by default, those this process may run on), coresPerWorker
+# each.  Calls return futures, e.g.
+#   with GraphPool("graph.bin") as pool:
+#     parents = [f.result() for f in pool.map("BFS", sources)]
+class GraphPool:
+  def __init__(self, graphPath, workers=None, coresPerWorker=1,
+               undirected=None, weightType="float", cores=None):
+    if (gbbs_lib.graphFormat(graphPath) != "binary"):
+      raise ValueError("GraphPool needs a graph in the binary format: " +
+                       graphPath)
+    cores = sorted(os.sched_getaffinity(0) if cores is None else cores)
+    if (workers is None):
+      workers = max(len(cores) // coresPerWorker, 1)
+    if (coresPerWorker < 1 or workers * coresPerWorker > len(cores)):
+      raise ValueError("%d workers of %d cores need more than the %d cores "
+                       "given" % (workers, coresPerWorker, len(cores)))
+    context = multiprocessing.get_context("spawn")
+    self.tasks = context.Queue()
+    self.results = context.Queue()
+    self.futures = {}
+    self.ids = itertools.count()
+    self.lock = threading.Lock()
+    self.closed = False
+    self.workers = [
+        context.Process(
+            target=graphPoolWorker, daemon=True,
+            args=(os.path.abspath(graphPath), undirected, weightType,
+                  cores[i * coresPerWorker:(i + 1) * coresPerWorker],
+                  self.tasks, self.results))
+        for i in range(workers)]
+    for worker in self.workers:
+      worker.start()
+    self.collector = threading.Thread(target=self.collect, daemon=True)
+    self.collector.start()
+
+  # Returns a future for graph.name(*args, **kwargs), run by a worker.
+  def submit(self, name, *args, **kwargs):
+    future = Future()
+    with self.lock:
+      if (self.closed):
+        raise RuntimeError("GraphPool is closed")
+      id = next(self.ids)
+      self.futures[id] = future
+    self.tasks.put((id, name, args, kwargs))
+    return future
+
+  # Returns futures for graph.name(args) for each args in argsList; args that
+  # are not tuples are passed as the only argument.
+  def map(self, name, argsList):
+    return [self.submit(name, *(args if isinstance(args, tuple) else (args,)))
+            for args in argsList]
+
+  def __getattr__(self, name):
+    return lambda *args, **kwargs: self.submit(name, *args, **kwargs)
+
+  # Sets the futures from the results of the workers, and fails the pending
+  # futures if a worker dies or cannot open the graph.  The results of
+  # cancelled or failed futures are discarded, until the workers have exited.
+  def collect(self):
+    failed = False
+    while (True):
+      try:
+        item = self.results.get(timeout=1)
+      except queue.Empty:
+        alive = [worker.is_alive() for worker in self.workers]
+        if (all(alive)):
+          continue
+        if (not failed):
+          failed = True
+          self.fail(RuntimeError("A GraphPool worker exited"))
+        elif (not any(alive)):
+          return
+        continue
+      if (item is None):
+        return
+      id, result, error = item
+      if (id is None):
+        if (not failed):
+          failed = True
+          self.fail(RuntimeError(
+              "A GraphPool worker failed to open the graph: %s" % error))
+        continue
+      with self.lock:
+        future = self.futures.pop(id, None)
+      # Once running, the future can no longer be cancelled by the caller.
+      if (future is None or not future.set_running_or_notify_cancel()):
+        discardResult(result)
+      elif (error is not None):
+        future.set_exception(error)
+      else:
+        future.set_result(attachResult(result))
+
+  # Closes the pool, fails the pending futures with error, and stops the
+  # workers once their current calls are done.
+  def fail(self, error):
+    with self.lock:
+      self.closed = True
+      futures, self.futures = self.futures, {}
+    for future in futures.values():
+      if (future.set_running_or_notify_cancel()):
+        future.set_exception(error)
+    while (True):
+      try:
+        self.tasks.get_nowait()
+      except queue.Empty:
+        break
+    for _ in self.workers:
+      self.tasks.put(None)
+
+  # Stops the workers once the calls submitted so far are done.
+  def close(self):
+    with self.lock:
+      if (self.closed and not any(w.is_alive() for w in self.workers)):
+        return
+      self.closed = True
+    for _ in self.workers:
+      self.tasks.put(None)
+    for worker in self.workers:
+      worker.join()
+    self.results.put(None)
+    self.collector.join()
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, *exc):
+    self.close()
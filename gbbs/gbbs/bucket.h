@@ -436,7 +436,7 @@ inline const std::optional<std::tuple<uintE, uintE> > wrap(const uintE& l,
 }
 
 template <class ident_t, class bucket_t, class D>
-inline buckets<D, ident_t, bucket_t> make_buckets(size_t n, D d,
+inline buckets<D, ident_t, bucket_t> make_buckets(size_t n, D& d,
                                                   bucket_order order,
                                                   size_t total_buckets = 128) {
   return buckets<D, ident_t, bucket_t>(n, d, order, total_buckets);
@@ -86,6 +86,15 @@ parse_weighted_graph(const char* fname, bool mmap, bool binary,
 template <class weight_type>
 sequence<Edge<weight_type>> sort_and_dedupe(sequence<Edge<weight_type>> edges);
 
+// Output a list of sorted edges, removing duplicate edges if `dedupe` is set
+// and self-loop edges if `remove_self_loops` is set.  Edges whose source is
+// UINT_E_MAX are always removed.
+//
+// The argument is passed by value, so use `std::move` where appropriate.
+template <class weight_type>
+sequence<Edge<weight_type>> sort_edges(sequence<Edge<weight_type>> edges,
+                                       bool dedupe, bool remove_self_loops);
+
 }  // namespace internal
 
 /* Returns a tuple containing (n, m, offsets, edges) --- the number of
@@ -499,6 +508,113 @@ symmetric_graph<symmetric_vertex, weight_type> edge_list_to_symmetric_graph(
       edges_array};
 }
 
+// Converts the m edges returned by `get_edge(i)` for i in [0, m) into an
+// asymmetric graph, in parallel.  The edges are written directly into the
+// buffer that is sorted, so that no intermediate copy of the edge list is
+// made.
+//
+// Adjacency lists of the output graph are sorted by increasing neighbor vertex
+// ID.  Duplicate edges are removed if `dedupe` is set, and self-loop edges if
+// `remove_self_loops` is set.  If duplicate edges with different weights are
+// removed, an arbitrary one is kept.
+template <class weight_type, class F>
+asymmetric_graph<asymmetric_vertex, weight_type> edges_to_asymmetric_graph(
+    const size_t m, F get_edge, const bool dedupe = true,
+    const bool remove_self_loops = true) {
+  using edge_type = typename asymmetric_vertex<weight_type>::edge_type;
+
+  const sequence<Edge<weight_type>> out_edges = internal::sort_edges(
+      sequence<Edge<weight_type>>::from_function(m, get_edge), dedupe,
+      remove_self_loops);
+  if (out_edges.empty()) {
+    return asymmetric_graph<asymmetric_vertex, weight_type>{};
+  }
+  const size_t num_edges = out_edges.size();
+  const size_t num_vertices = internal::get_num_vertices_from_edges(out_edges);
+  vertex_data* vertex_out_data =
+      internal::sorted_edges_to_vertex_data_array(num_vertices, out_edges);
+
+  sequence<Edge<weight_type>> in_edges = parlay::map<Edge<weight_type>>(
+      out_edges, [&](const Edge<weight_type>& edge) {
+        return Edge<weight_type>{edge.to, edge.from, edge.weight};
+      });
+  constexpr auto compare_endpoints = [](const Edge<weight_type>& left,
+                                        const Edge<weight_type>& right) {
+    return std::tie(left.from, left.to) < std::tie(right.from, right.to);
+  };
+  parlay::sample_sort_inplace(make_slice(in_edges), compare_endpoints);
+  vertex_data* vertex_in_data =
+      internal::sorted_edges_to_vertex_data_array(num_vertices, in_edges);
+
+  edge_type* out_edges_array = gbbs::new_array_no_init<edge_type>(num_edges);
+  edge_type* in_edges_array = gbbs::new_array_no_init<edge_type>(num_edges);
+  parallel_for(0, num_edges, [&](const size_t i) {
+    const Edge<weight_type>& out_edge = out_edges[i];
+    out_edges_array[i] = std::make_tuple(out_edge.to, out_edge.weight);
+    const Edge<weight_type>& in_edge = in_edges[i];
+    in_edges_array[i] = std::make_tuple(in_edge.to, in_edge.weight);
+  });
+
+  return asymmetric_graph<asymmetric_vertex, weight_type>{
+      vertex_out_data, vertex_in_data, num_vertices, num_edges,
+      [=]() {
+        gbbs::free_array(vertex_out_data, num_vertices);
+        gbbs::free_array(vertex_in_data, num_vertices);
+        gbbs::free_array(out_edges_array, num_edges);
+        gbbs::free_array(in_edges_array, num_edges);
+      },
+      out_edges_array, in_edges_array};
+}
+
+// Converts the m undirected edges returned by `get_edge(i)` for i in [0, m)
+// into a symmetric graph, in parallel.  Both directions of each edge are
+// written directly into the buffer that is sorted, so that no intermediate
+// copy of the edge list is made.
+//
+// Adjacency lists of the output graph are sorted by increasing neighbor vertex
+// ID.  Duplicate edges are removed if `dedupe` is set, and self-loop edges if
+// `remove_self_loops` is set.  A self-loop edge that is kept appears once in
+// the adjacency list of its vertex.  If duplicate edges with different weights
+// are removed, an arbitrary one is kept.
+template <class weight_type, class F>
+symmetric_graph<symmetric_vertex, weight_type> edges_to_symmetric_graph(
+    const size_t m, F get_edge, const bool dedupe = true,
+    const bool remove_self_loops = true) {
+  using edge_type = typename symmetric_vertex<weight_type>::edge_type;
+
+  sequence<Edge<weight_type>> edges_both_directions(2 * m);
+  parallel_for(0, m, [&](const size_t i) {
+    const Edge<weight_type> edge = get_edge(i);
+    edges_both_directions[2 * i] = edge;
+    // The reverse of a self-loop is marked for removal.
+    edges_both_directions[2 * i + 1] = Edge<weight_type>{
+        edge.from == edge.to ? UINT_E_MAX : edge.to, edge.from, edge.weight};
+  });
+  const sequence<Edge<weight_type>> edges = internal::sort_edges(
+      std::move(edges_both_directions), dedupe, remove_self_loops);
+  if (edges.empty()) {
+    return symmetric_graph<symmetric_vertex, weight_type>{};
+  }
+  const size_t num_edges = edges.size();
+  const size_t num_vertices = internal::get_num_vertices_from_edges(edges);
+  vertex_data* vertex_data =
+      internal::sorted_edges_to_vertex_data_array(num_vertices, edges);
+
+  edge_type* edges_array = gbbs::new_array_no_init<edge_type>(num_edges);
+  parallel_for(0, num_edges, [&](const size_t i) {
+    const Edge<weight_type>& edge = edges[i];
+    edges_array[i] = std::make_tuple(edge.to, edge.weight);
+  });
+
+  return symmetric_graph<symmetric_vertex, weight_type>{
+      vertex_data, num_vertices, num_edges,
+      [=]() {
+        gbbs::free_array(vertex_data, num_vertices);
+        gbbs::free_array(edges_array, num_edges);
+      },
+      edges_array};
+}
+
 // Write graph in adjacency graph format to file.
 template <class Graph>
 void write_graph_to_file(const char* filename, Graph& graph) {
@@ -689,6 +805,14 @@ parse_weighted_graph(const char* fname, bool mmap, bool binary, char* bytes,
 
 template <class weight_type>
 sequence<Edge<weight_type>> sort_and_dedupe(sequence<Edge<weight_type>> edges) {
+  return sort_edges(std::move(edges), /* dedupe = */ true,
+                    /* remove_self_loops = */ true);
+}
+
+template <class weight_type>
+sequence<Edge<weight_type>> sort_edges(sequence<Edge<weight_type>> edges,
+                                       const bool dedupe,
+                                       const bool remove_self_loops) {
   constexpr auto compare_endpoints{
       [](const Edge<weight_type>& left, const Edge<weight_type>& right) {
         return std::tie(left.from, left.to) < std::tie(right.from, right.to);
@@ -702,8 +826,9 @@ sequence<Edge<weight_type>> sort_and_dedupe(sequence<Edge<weight_type>> edges) {
       edges, parlay::delayed_seq<bool>(edges.size(), [&](const size_t i) {
         const auto edge{edges[i]};
         const bool is_self_loop{edge.from == edge.to};
-        return !is_self_loop &&
-               (i == 0 || unequal_endpoints(edges[i - 1], edge));
+        return edge.from != UINT_E_MAX &&
+               !(remove_self_loops && is_self_loop) &&
+               (!dedupe || i == 0 || unequal_endpoints(edges[i - 1], edge));
       }));
 }
 
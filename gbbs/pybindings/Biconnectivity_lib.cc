@@ -0,0 +1,84 @@
+// This code is part of the project "Theoretically Efficient Parallel Graph
+// Algorithms Can Be Fast and Scalable", presented at Symposium on Parallelism
+// in Algorithms and Architectures, 2018.
+// Copyright (c) 2018 Laxman Dhulipala, Guy Blelloch, and Julian Shun
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all  copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include "Biconnectivity_lib.h"
+
+#include "benchmarks/Biconnectivity/TarjanVishkin/Biconnectivity.h"
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+namespace compiled {
+
+namespace {
+
+// Returns the parent of each vertex in the BFS forest used by the algorithm,
+// and the label of the biconnected component of the edge to its parent. The
+// algorithm removes edges from G.
+template <class Graph>
+std::tuple<sequence<uintE>, sequence<uintE>> BiconnectedComponents(Graph& G) {
+  sequence<uintE> parents, labels;
+  std::tie(parents, labels) = gbbs::Biconnectivity(G);
+  parallel_for(0, parents.size(),
+               [&](size_t i) { parents[i] &= gbbs::bc::VAL_MASK; });
+  return {std::move(parents), std::move(labels)};
+}
+
+}  // namespace
+
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_unweighted_graph& G) {
+  return BiconnectedComponents(G);
+}
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_uint32_graph& G) {
+  return BiconnectedComponents(G);
+}
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_float_graph& G) {
+  return BiconnectedComponents(G);
+}
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_double_graph& G) {
+  return BiconnectedComponents(G);
+}
+
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_unweighted_cgraph& G) {
+  return BiconnectedComponents(G);
+}
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_uint32_cgraph& G) {
+  return BiconnectedComponents(G);
+}
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_float_cgraph& G) {
+  return BiconnectedComponents(G);
+}
+std::tuple<sequence<uintE>, sequence<uintE>> Biconnectivity(
+    symmetric_double_cgraph& G) {
+  return BiconnectedComponents(G);
+}
+
+}  // namespace compiled
+}  // namespace gbbs
@@ -0,0 +1,309 @@
+// This code is part of the project "Theoretically Efficient Parallel Graph
+// Algorithms Can Be Fast and Scalable", presented at Symposium on Parallelism
+// in Algorithms and Architectures, 2018.
+// Copyright (c) 2018 Laxman Dhulipala, Guy Blelloch, and Julian Shun
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all  copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include "MultiSource_lib.h"
+
+#include "benchmarks/BFS/MultiSourceBFS/MultiBFS.h"
+#include "benchmarks/GeneralWeightSSSP/BellmanFord/MultiBellmanFord.h"
+#include "benchmarks/PositiveWeightSSSP/DeltaStepping/DeltaStepping.h"
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+namespace compiled {
+namespace {
+
+// Delta-stepping does not batch like BFS and Bellman-Ford, so this runs it
+// from one source at a time, writing each result into its row.
+template <class Graph, class Distance>
+sequence<Distance> MultiDeltaStepping(Graph& G, const sequence<uintE>& sources,
+                                      Distance delta, Distance max_distance) {
+  size_t n = G.n;
+  auto distances = sequence<Distance>::uninitialized(sources.size() * n);
+  for (size_t i = 0; i < sources.size(); i++) {
+    auto dists = gbbs::DeltaStepping(G, sources[i], delta);
+    parallel_for(0, n, [&](size_t v) {
+      distances[i * n + v] = (dists[v] <= max_distance)
+                                 ? dists[v]
+                                 : std::numeric_limits<Distance>::max();
+    });
+  }
+  return distances;
+}
+
+}  // namespace
+
+sequence<uintE> MultiBFS(symmetric_unweighted_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(symmetric_uint32_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(symmetric_float_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(symmetric_double_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+
+sequence<uintE> MultiBFS(symmetric_unweighted_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(symmetric_uint32_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(symmetric_float_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(symmetric_double_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+
+sequence<uintE> MultiBFS(asymmetric_unweighted_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(asymmetric_uint32_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(asymmetric_float_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(asymmetric_double_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+
+sequence<uintE> MultiBFS(asymmetric_unweighted_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(asymmetric_uint32_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(asymmetric_float_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+sequence<uintE> MultiBFS(asymmetric_double_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops) {
+  return gbbs::MultiBFS(G, sources, max_hops);
+}
+
+sequence<uintE> MultiBellmanFord(symmetric_unweighted_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<uintE> MultiBellmanFord(symmetric_uint32_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<float> MultiBellmanFord(symmetric_float_graph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<double> MultiBellmanFord(symmetric_double_graph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+
+sequence<uintE> MultiBellmanFord(symmetric_unweighted_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<uintE> MultiBellmanFord(symmetric_uint32_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<float> MultiBellmanFord(symmetric_float_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<double> MultiBellmanFord(symmetric_double_cgraph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+
+sequence<uintE> MultiBellmanFord(asymmetric_unweighted_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<uintE> MultiBellmanFord(asymmetric_uint32_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<float> MultiBellmanFord(asymmetric_float_graph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<double> MultiBellmanFord(asymmetric_double_graph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+
+sequence<uintE> MultiBellmanFord(asymmetric_unweighted_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<uintE> MultiBellmanFord(asymmetric_uint32_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<float> MultiBellmanFord(asymmetric_float_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+sequence<double> MultiBellmanFord(asymmetric_double_cgraph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance) {
+  return gbbs::MultiBellmanFord(G, sources, max_distance);
+}
+
+sequence<uintE> MultiDeltaStepping(symmetric_unweighted_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<symmetric_unweighted_graph, uintE>(
+      G, sources, delta, max_distance);
+}
+sequence<uintE> MultiDeltaStepping(symmetric_uint32_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<symmetric_uint32_graph, uintE>(G, sources, delta,
+                                                           max_distance);
+}
+sequence<float> MultiDeltaStepping(symmetric_float_graph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance) {
+  return MultiDeltaStepping<symmetric_float_graph, float>(G, sources, delta,
+                                                          max_distance);
+}
+sequence<double> MultiDeltaStepping(symmetric_double_graph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance) {
+  return MultiDeltaStepping<symmetric_double_graph, double>(G, sources, delta,
+                                                            max_distance);
+}
+
+sequence<uintE> MultiDeltaStepping(symmetric_unweighted_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<symmetric_unweighted_cgraph, uintE>(
+      G, sources, delta, max_distance);
+}
+sequence<uintE> MultiDeltaStepping(symmetric_uint32_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<symmetric_uint32_cgraph, uintE>(G, sources, delta,
+                                                            max_distance);
+}
+sequence<float> MultiDeltaStepping(symmetric_float_cgraph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance) {
+  return MultiDeltaStepping<symmetric_float_cgraph, float>(G, sources, delta,
+                                                           max_distance);
+}
+sequence<double> MultiDeltaStepping(symmetric_double_cgraph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance) {
+  return MultiDeltaStepping<symmetric_double_cgraph, double>(G, sources, delta,
+                                                             max_distance);
+}
+
+sequence<uintE> MultiDeltaStepping(asymmetric_unweighted_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<asymmetric_unweighted_graph, uintE>(
+      G, sources, delta, max_distance);
+}
+sequence<uintE> MultiDeltaStepping(asymmetric_uint32_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<asymmetric_uint32_graph, uintE>(G, sources, delta,
+                                                            max_distance);
+}
+sequence<float> MultiDeltaStepping(asymmetric_float_graph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance) {
+  return MultiDeltaStepping<asymmetric_float_graph, float>(G, sources, delta,
+                                                           max_distance);
+}
+sequence<double> MultiDeltaStepping(asymmetric_double_graph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance) {
+  return MultiDeltaStepping<asymmetric_double_graph, double>(G, sources, delta,
+                                                             max_distance);
+}
+
+sequence<uintE> MultiDeltaStepping(asymmetric_unweighted_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<asymmetric_unweighted_cgraph, uintE>(
+      G, sources, delta, max_distance);
+}
+sequence<uintE> MultiDeltaStepping(asymmetric_uint32_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance) {
+  return MultiDeltaStepping<asymmetric_uint32_cgraph, uintE>(G, sources, delta,
+                                                             max_distance);
+}
+sequence<float> MultiDeltaStepping(asymmetric_float_cgraph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance) {
+  return MultiDeltaStepping<asymmetric_float_cgraph, float>(G, sources, delta,
+                                                            max_distance);
+}
+sequence<double> MultiDeltaStepping(asymmetric_double_cgraph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance) {
+  return MultiDeltaStepping<asymmetric_double_cgraph, double>(G, sources, delta,
+                                                              max_distance);
+}
+
+}  // namespace compiled
+}  // namespace gbbs
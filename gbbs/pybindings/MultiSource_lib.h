@@ -0,0 +1,174 @@
+#pragma once
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+namespace compiled {
+
+using symmetric_unweighted_graph =
+    symmetric_graph<symmetric_vertex, gbbs::empty>;
+using symmetric_uint32_graph = symmetric_graph<symmetric_vertex, uint32_t>;
+using symmetric_float_graph = symmetric_graph<symmetric_vertex, float>;
+using symmetric_double_graph = symmetric_graph<symmetric_vertex, double>;
+
+using symmetric_unweighted_cgraph =
+    symmetric_graph<csv_bytepd_amortized, gbbs::empty>;
+using symmetric_uint32_cgraph = symmetric_graph<csv_bytepd_amortized, uint32_t>;
+using symmetric_float_cgraph = symmetric_graph<csv_bytepd_amortized, float>;
+using symmetric_double_cgraph = symmetric_graph<csv_bytepd_amortized, double>;
+
+using asymmetric_unweighted_graph =
+    asymmetric_graph<asymmetric_vertex, gbbs::empty>;
+using asymmetric_uint32_graph = asymmetric_graph<asymmetric_vertex, uint32_t>;
+using asymmetric_float_graph = asymmetric_graph<asymmetric_vertex, float>;
+using asymmetric_double_graph = asymmetric_graph<asymmetric_vertex, double>;
+
+using asymmetric_unweighted_cgraph =
+    asymmetric_graph<cav_bytepd_amortized, gbbs::empty>;
+using asymmetric_uint32_cgraph =
+    asymmetric_graph<cav_bytepd_amortized, uint32_t>;
+using asymmetric_float_cgraph = asymmetric_graph<cav_bytepd_amortized, float>;
+using asymmetric_double_cgraph = asymmetric_graph<cav_bytepd_amortized, double>;
+
+sequence<uintE> MultiBFS(symmetric_unweighted_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(symmetric_uint32_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(symmetric_float_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(symmetric_double_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+
+sequence<uintE> MultiBFS(symmetric_unweighted_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(symmetric_uint32_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(symmetric_float_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(symmetric_double_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+
+sequence<uintE> MultiBFS(asymmetric_unweighted_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(asymmetric_uint32_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(asymmetric_float_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(asymmetric_double_graph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+
+sequence<uintE> MultiBFS(asymmetric_unweighted_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(asymmetric_uint32_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(asymmetric_float_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+sequence<uintE> MultiBFS(asymmetric_double_cgraph& G,
+                         const sequence<uintE>& sources, uintE max_hops);
+
+sequence<uintE> MultiBellmanFord(symmetric_unweighted_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<uintE> MultiBellmanFord(symmetric_uint32_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<float> MultiBellmanFord(symmetric_float_graph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance);
+sequence<double> MultiBellmanFord(symmetric_double_graph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance);
+
+sequence<uintE> MultiBellmanFord(symmetric_unweighted_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<uintE> MultiBellmanFord(symmetric_uint32_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<float> MultiBellmanFord(symmetric_float_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance);
+sequence<double> MultiBellmanFord(symmetric_double_cgraph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance);
+
+sequence<uintE> MultiBellmanFord(asymmetric_unweighted_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<uintE> MultiBellmanFord(asymmetric_uint32_graph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<float> MultiBellmanFord(asymmetric_float_graph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance);
+sequence<double> MultiBellmanFord(asymmetric_double_graph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance);
+
+sequence<uintE> MultiBellmanFord(asymmetric_unweighted_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<uintE> MultiBellmanFord(asymmetric_uint32_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 uintE max_distance);
+sequence<float> MultiBellmanFord(asymmetric_float_cgraph& G,
+                                 const sequence<uintE>& sources,
+                                 float max_distance);
+sequence<double> MultiBellmanFord(asymmetric_double_cgraph& G,
+                                  const sequence<uintE>& sources,
+                                  double max_distance);
+
+sequence<uintE> MultiDeltaStepping(symmetric_unweighted_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<uintE> MultiDeltaStepping(symmetric_uint32_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<float> MultiDeltaStepping(symmetric_float_graph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance);
+sequence<double> MultiDeltaStepping(symmetric_double_graph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance);
+
+sequence<uintE> MultiDeltaStepping(symmetric_unweighted_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<uintE> MultiDeltaStepping(symmetric_uint32_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<float> MultiDeltaStepping(symmetric_float_cgraph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance);
+sequence<double> MultiDeltaStepping(symmetric_double_cgraph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance);
+
+sequence<uintE> MultiDeltaStepping(asymmetric_unweighted_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<uintE> MultiDeltaStepping(asymmetric_uint32_graph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<float> MultiDeltaStepping(asymmetric_float_graph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance);
+sequence<double> MultiDeltaStepping(asymmetric_double_graph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance);
+
+sequence<uintE> MultiDeltaStepping(asymmetric_unweighted_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<uintE> MultiDeltaStepping(asymmetric_uint32_cgraph& G,
+                                   const sequence<uintE>& sources, uintE delta,
+                                   uintE max_distance);
+sequence<float> MultiDeltaStepping(asymmetric_float_cgraph& G,
+                                   const sequence<uintE>& sources, float delta,
+                                   float max_distance);
+sequence<double> MultiDeltaStepping(asymmetric_double_cgraph& G,
+                                    const sequence<uintE>& sources,
+                                    double delta, double max_distance);
+
+}  // namespace compiled
+}  // namespace gbbs
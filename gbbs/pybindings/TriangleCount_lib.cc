@@ -0,0 +1,98 @@
+// This code is part of the project "Theoretically Efficient Parallel Graph
+// Algorithms Can Be Fast and Scalable", presented at Symposium on Parallelism
+// in Algorithms and Architectures, 2018.
+// Copyright (c) 2018 Laxman Dhulipala, Guy Blelloch, and Julian Shun
+//
+// Permission is hereby granted, free of charge, to any person obtaining a copy
+// of this software and associated documentation files (the "Software"), to deal
+// in the Software without restriction, including without limitation the rights
+// to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+// copies of the Software, and to permit persons to whom the Software is
+// furnished to do so, subject to the following conditions:
+//
+// The above copyright notice and this permission notice shall be included in
+// all  copies or substantial portions of the Software.
+//
+// THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+// IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+// FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+// AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+// LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+// OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
+// SOFTWARE.
+
+#include "TriangleCount_lib.h"
+
+#include "benchmarks/TriangleCounting/ShunTangwongsan15/Triangle.h"
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+namespace compiled {
+
+namespace {
+
+// Triangle() reads the parameters of some orderings from the command line, so
+// this passes it an empty one, which selects their defaults.
+template <class Graph, class F>
+size_t CountTriangles(Graph& G, const std::string& ordering, const F& f) {
+  commandLine P(0, nullptr);
+  return gbbs::Triangle(G, f, ordering, P);
+}
+
+template <class Graph>
+sequence<size_t> CountVertexTriangles(Graph& G, const std::string& ordering) {
+  auto counts = sequence<size_t>(G.n, 0);
+  CountTriangles(G, ordering, [&](uintE u, uintE v, uintE w) {
+    gbbs::write_add(&counts[u], 1);
+    gbbs::write_add(&counts[v], 1);
+    gbbs::write_add(&counts[w], 1);
+  });
+  return counts;
+}
+
+}  // namespace
+
+size_t TriangleCount(symmetric_unweighted_graph& G,
+                     const std::string& ordering) {
+  return CountTriangles(G, ordering, [](uintE u, uintE v, uintE w) {});
+}
+size_t TriangleCount(symmetric_uint32_graph& G, const std::string& ordering) {
+  return CountTriangles(G, ordering, [](uintE u, uintE v, uintE w) {});
+}
+size_t TriangleCount(symmetric_float_graph& G, const std::string& ordering) {
+  return CountTriangles(G, ordering, [](uintE u, uintE v, uintE w) {});
+}
+size_t TriangleCount(symmetric_double_graph& G, const std::string& ordering) {
+  return CountTriangles(G, ordering, [](uintE u, uintE v, uintE w) {});
+}
+
+size_t TriangleCount(symmetric_unweighted_cgraph& G,
+                     const std::string& ordering) {
+  return CountTriangles(G, ordering, [](uintE u, uintE v, uintE w) {});
+}
+
+sequence<size_t> VertexTriangleCounts(symmetric_unweighted_graph& G,
+                                      const std::string& ordering) {
+  return CountVertexTriangles(G, ordering);
+}
+sequence<size_t> VertexTriangleCounts(symmetric_uint32_graph& G,
+                                      const std::string& ordering) {
+  return CountVertexTriangles(G, ordering);
+}
+sequence<size_t> VertexTriangleCounts(symmetric_float_graph& G,
+                                      const std::string& ordering) {
+  return CountVertexTriangles(G, ordering);
+}
+sequence<size_t> VertexTriangleCounts(symmetric_double_graph& G,
+                                      const std::string& ordering) {
+  return CountVertexTriangles(G, ordering);
+}
+
+sequence<size_t> VertexTriangleCounts(symmetric_unweighted_cgraph& G,
+                                      const std::string& ordering) {
+  return CountVertexTriangles(G, ordering);
+}
+
+}  // namespace compiled
+}  // namespace gbbs
@@ -8,12 +8,25 @@
 #include "ApproximateSetCover_lib.h"
 #include "BFS_lib.h"
 #include "BellmanFord_lib.h"
+#include "Biconnectivity_lib.h"
 #include "CC_lib.h"
 #include "DeltaStepping_lib.h"
+#include "GraphColoring_lib.h"
 #include "HAC_lib.h"
 #include "KCore_lib.h"
+#include "KTruss_lib.h"
+#include "LowDiameterDecomposition_lib.h"
+#include "MaximalIndependentSet_lib.h"
+#include "MaximalMatching_lib.h"
 #include "MinimumSpanningForest_lib.h"
+#include "MultiSource_lib.h"
 #include "PageRank_lib.h"
+#include "SCAN_lib.h"
+#include "SSBetweennessCentrality_lib.h"
+#include "SpanningForest_lib.h"
+#include "StronglyConnectedComponents_lib.h"
+#include "TriangleCount_lib.h"
+#include "utils/converter.h"
 
 //#include "benchmarks/Biconnectivity/TarjanVishkin/Biconnectivity.h"
 //#include "benchmarks/Clustering/SeqHAC/HAC_api.h"
@@ -30,11 +43,47 @@
 #include "pybind11/pybind11.h"
 
 #include <sys/stat.h>
+#include <cmath>
+#include <fstream>
+#include <memory>
+#include <mutex>
+#include <stdexcept>
 
 namespace gbbs {
 namespace gbbs_lib {
 namespace py = ::pybind11;
 
+// Serializes calls into GBBS.  The scheduler runs a parallel computation with
+// the calling thread as its first worker, so computations started by several
+// Python threads at once would share that worker's state.  The mutex is only
+// ever waited on without holding the GIL, so the two cannot deadlock.
+std::recursive_mutex gbbs_mutex;
+
+// Releases the GIL, so that other Python threads run while GBBS computes, and
+// then holds the GBBS mutex.  Used as a py::call_guard for bindings that do not
+// touch Python objects.
+struct gbbs_guard {
+  py::gil_scoped_release release;
+  std::lock_guard<std::recursive_mutex> lock{gbbs_mutex};
+};
+
+// Runs f under a gbbs_guard.  f must not touch Python objects.
+template <class F>
+auto without_gil(F f) {
+  gbbs_guard guard;
+  return f();
+}
+
+// Holds the GBBS mutex, acquired with the GIL released, for code that uses
+// both GBBS and Python objects.
+struct gbbs_lock {
+  gbbs_lock() {
+    py::gil_scoped_release release;
+    gbbs_mutex.lock();
+  }
+  ~gbbs_lock() { gbbs_mutex.unlock(); }
+};
+
 // Basic example of handling np arrays
 py::array_t<uint32_t> test_array(py::array_t<uint32_t> input) {
   py::buffer_info buf1 = input.request();
@@ -43,10 +92,12 @@ py::array_t<uint32_t> test_array(py::array_t<uint32_t> input) {
   uint32_t *ptr1 = (uint32_t *)buf1.ptr, *ptr2 = (uint32_t *)buf2.ptr;
   size_t X = buf1.shape[0];
   size_t Y = buf1.shape[1];
-  parallel_for(0, X, [&](size_t i) {
-    for (size_t j = 0; j < Y; j++) {
-      ptr2[i * Y + j] = ptr1[i * Y + j] + 1;
-    }
+  without_gil([&] {
+    parallel_for(0, X, [&](size_t i) {
+      for (size_t j = 0; j < Y; j++) {
+        ptr2[i * Y + j] = ptr1[i * Y + j] + 1;
+      }
+    });
   });
   result.resize({X, Y});
   return result;
@@ -69,6 +120,7 @@ auto edgeListToSymmetricWeightedGraph(py::array_t<W> input) {
   std::vector<edge> edges;
   edges.resize(m);
 
+  gbbs_lock lock;
   parallel_for(0, m, [&](size_t i) {
     //  for (size_t i=0; i<m; i++) {
     uint32_t u = uint32_t(ptr[i * 3]);
@@ -84,6 +136,158 @@ auto edgeListToSymmetricWeightedGraph(py::array_t<W> input) {
   return graph;
 }
 
+// Calls f with a value of the C++ type of the elements of `array`, which must
+// be 32- or 64-bit integers or floating-point numbers.
+template <class F>
+void dispatch_dtype(const py::array& array, F f) {
+  const char kind = array.dtype().kind();
+  const size_t size = array.itemsize();
+  if (kind == 'i' && size == 4) {
+    f(int32_t{});
+  } else if (kind == 'i' && size == 8) {
+    f(int64_t{});
+  } else if (kind == 'u' && size == 4) {
+    f(uint32_t{});
+  } else if (kind == 'u' && size == 8) {
+    f(uint64_t{});
+  } else if (kind == 'f' && size == 4) {
+    f(float{});
+  } else if (kind == 'f' && size == 8) {
+    f(double{});
+  } else {
+    throw std::invalid_argument("Unsupported array dtype: " +
+                                std::string(py::str(array.dtype())));
+  }
+}
+
+// Returns true if v is a valid vertex ID.
+template <class V>
+bool is_vertex_id(const V v) {
+  if constexpr (std::is_floating_point<V>::value) {
+    return v >= 0 && v < static_cast<V>(UINT_E_MAX) && v == std::floor(v);
+  } else if constexpr (std::is_signed<V>::value) {
+    return v >= 0 && static_cast<uint64_t>(v) < UINT_E_MAX;
+  } else {
+    return static_cast<uint64_t>(v) < UINT_E_MAX;
+  }
+}
+
+// Returns true if x can be stored as a weight of type W.
+template <class W, class X>
+bool is_weight(const X x) {
+  if constexpr (std::is_floating_point<W>::value) {
+    return true;
+  } else if constexpr (std::is_floating_point<X>::value) {
+    return x >= 0 && x <= static_cast<X>(std::numeric_limits<W>::max()) &&
+           x == std::floor(x);
+  } else if constexpr (std::is_signed<X>::value) {
+    return x >= 0 &&
+           static_cast<uint64_t>(x) <= std::numeric_limits<W>::max();
+  } else {
+    return static_cast<uint64_t>(x) <= std::numeric_limits<W>::max();
+  }
+}
+
+// Builds a graph with weights of type W from the edges whose endpoints are
+// the first two columns of `ends`, an [m x k] array of V with any strides, and
+// whose weights are returned by `weight(i)`.  The array is read in place and
+// in parallel, directly into the edge buffer that the graph is built from.
+template <class W, class V, class WeightFn>
+py::object numpy_edges_to_graph(const py::array& ends, WeightFn weight,
+                                bool symmetric, bool dedupe,
+                                bool remove_self_loops) {
+  using edge = gbbs::gbbs_io::Edge<W>;
+  auto E = ends.unchecked<V, 2>();
+  size_t m = E.shape(0);
+
+  auto invalid_ids = parlay::delayed_seq<size_t>(m, [&](size_t i) -> size_t {
+    return !is_vertex_id(E(i, 0)) || !is_vertex_id(E(i, 1));
+  });
+  if (parlay::reduce(invalid_ids) > 0) {
+    throw std::invalid_argument(
+        "Edge endpoints must be integers in [0, " +
+        std::to_string(UINT_E_MAX) + ").");
+  }
+  if constexpr (!std::is_same<W, gbbs::empty>::value) {
+    auto invalid_weights = parlay::delayed_seq<size_t>(
+        m, [&](size_t i) -> size_t { return !is_weight<W>(weight(i)); });
+    if (parlay::reduce(invalid_weights) > 0) {
+      throw std::invalid_argument(
+          "Integer edge weights must be integers in [0, 2^32).");
+    }
+  }
+
+  auto get_edge = [&](size_t i) {
+    if constexpr (std::is_same<W, gbbs::empty>::value) {
+      return edge(uintE(E(i, 0)), uintE(E(i, 1)));
+    } else {
+      return edge(uintE(E(i, 0)), uintE(E(i, 1)), W(weight(i)));
+    }
+  };
+  if (symmetric) {
+    return py::cast(gbbs_io::edges_to_symmetric_graph<W>(m, get_edge, dedupe,
+                                                         remove_self_loops));
+  }
+  return py::cast(gbbs_io::edges_to_asymmetric_graph<W>(m, get_edge, dedupe,
+                                                        remove_self_loops));
+}
+
+// Builds a graph from a NumPy array of edges.  `edges` is an [m x 2] array of
+// 32- or 64-bit integer (or integral floating-point) endpoints, with any
+// strides.  If `weights` is an array of m weights, or if `weighted` is set and
+// `edges` has a third column of weights, the graph is weighted: by float
+// weights if the weights are floating-point, and by uint32 weights otherwise.
+py::object numpy_edge_list_to_graph(const py::array& edges,
+                                    const py::object& weights, bool weighted,
+                                    bool symmetric, bool dedupe,
+                                    bool remove_self_loops) {
+  gbbs_lock lock;
+  if (edges.ndim() != 2 || edges.shape(1) < 2) {
+    throw std::invalid_argument("Expected an [m x 2]-dim array of edges.");
+  }
+  size_t m = edges.shape(0);
+  py::array weight_array;
+  if (!weights.is_none()) {
+    weight_array = weights.cast<py::array>();
+    if (weight_array.ndim() != 1 || size_t(weight_array.shape(0)) != m) {
+      throw std::invalid_argument(
+          "Expected a 1-dim array of weights with one weight per edge.");
+    }
+    weighted = true;
+  } else if (weighted && edges.shape(1) < 3) {
+    throw std::invalid_argument(
+        "Expected an [m x 3]-dim array of weighted edges.");
+  }
+
+  py::object graph;
+  dispatch_dtype(edges, [&](auto v) {
+    using V = decltype(v);
+    if (!weighted) {
+      graph = numpy_edges_to_graph<gbbs::empty, V>(
+          edges, [](size_t) { return gbbs::empty(); }, symmetric, dedupe,
+          remove_self_loops);
+      return;
+    }
+    auto build = [&](auto x, auto weight) {
+      using W = typename std::conditional<
+          std::is_floating_point<decltype(x)>::value, float, uint32_t>::type;
+      graph = numpy_edges_to_graph<W, V>(edges, weight, symmetric, dedupe,
+                                         remove_self_loops);
+    };
+    if (weights.is_none()) {
+      auto E = edges.unchecked<V, 2>();
+      build(V{}, [E](size_t i) { return E(i, 2); });
+    } else {
+      dispatch_dtype(weight_array, [&](auto x) {
+        using X = decltype(x);
+        auto weight_view = weight_array.unchecked<X, 1>();
+        build(X{}, [weight_view](size_t i) { return weight_view(i); });
+      });
+    }
+  });
+  return graph;
+}
+
 /* Defines symmetric vertex functions */
 template <template <class W> class vertex_type, class W>
 void SymVertexRegister(py::module& m, std::string vertex_name) {
@@ -109,9 +313,11 @@ auto build_dendrogram(const sequence<std::pair<uintE, W>>& S) {
   using par_type = parent_ptr<W>;
   auto arr = (par_type*)(malloc(n * sizeof(par_type)));
 
-  parallel_for(0, n, [&](size_t i) {
-    arr[i].parent = S[i].first;
-    arr[i].wgh = S[i].second;
+  without_gil([&] {
+    parallel_for(0, n, [&](size_t i) {
+      arr[i].parent = S[i].first;
+      arr[i].wgh = S[i].second;
+    });
   });
 
   py::capsule free_when_done(arr, [](void* f) { free(f); });
@@ -139,10 +345,12 @@ auto build_wgh_edgelist(const Seq& S) {
   size_t n = S.size();
   auto arr = (EdgeType*)(malloc(n * sizeof(EdgeType)));
 
-  parallel_for(0, n, [&](size_t i) {
-    arr[i].u = std::get<0>(S[i]);
-    arr[i].v = std::get<1>(S[i]);
-    arr[i].wgh = std::get<2>(S[i]);
+  without_gil([&] {
+    parallel_for(0, n, [&](size_t i) {
+      arr[i].u = std::get<0>(S[i]);
+      arr[i].v = std::get<1>(S[i]);
+      arr[i].wgh = std::get<2>(S[i]);
+    });
   });
 
   py::capsule free_when_done(arr, [](void* f) { free(f); });
@@ -164,9 +372,11 @@ auto build_edgelist(const Seq& S) {
     constexpr(std::is_same<W, gbbs::empty>()) {
       py::array_t<uint32_t> result = py::array_t<uint32_t>(2 * n);
       auto buf = (uint32_t*)result.request().ptr;
-      parallel_for(0, n, [&](size_t i) {
-        buf[2 * i] = S[i].first;
-        buf[2 * i + 1] = S[i].second;
+      without_gil([&] {
+        parallel_for(0, n, [&](size_t i) {
+          buf[2 * i] = S[i].first;
+          buf[2 * i + 1] = S[i].second;
+        });
       });
       return result;
     }
@@ -191,8 +401,11 @@ auto wrap_array(const Seq& S) {
   // memory when destroyed:
   size_t n = S.size();
   auto arr = (E*)(malloc(n * sizeof(E)));
-  parallel_for(0, n,
-               [&](size_t i) { parlay::assign_uninitialized(arr[i], S[i]); });
+  without_gil([&] {
+    parallel_for(0, n, [&](size_t i) {
+      parlay::assign_uninitialized(arr[i], S[i]);
+    });
+  });
 
   py::capsule free_when_done(arr, [](void* f) { free(f); });
 
@@ -202,6 +415,133 @@ auto wrap_array(const Seq& S) {
                         free_when_done);  // numpy array references this parent
 }
 
+// Moves S into a NumPy array of elements of type T with the given shape,
+// without copying it. The array owns S and frees it when it is destroyed.
+template <class T, class Seq>
+py::array_t<T> move_to_array(Seq&& S, const std::vector<py::ssize_t>& shape) {
+  static_assert(!std::is_lvalue_reference<Seq>::value,
+                "move_to_array takes ownership of its sequence");
+  auto owner = new Seq(std::move(S));
+  py::capsule free_when_done(owner,
+                             [](void* f) { delete reinterpret_cast<Seq*>(f); });
+  return py::array_t<T>(shape, reinterpret_cast<T*>(owner->data()),
+                        free_when_done);
+}
+
+// Moves a sequence of edges (u, v) into an [m x 2] NumPy array.
+inline py::array_t<uintE> move_edges_to_array(
+    sequence<std::pair<uintE, uintE>>&& edges) {
+  static_assert(sizeof(std::pair<uintE, uintE>) == 2 * sizeof(uintE));
+  py::ssize_t m = edges.size();
+  return move_to_array<uintE>(std::move(edges), {m, 2});
+}
+
+// Throws std::invalid_argument unless v is a vertex of G.
+template <class Graph>
+void check_vertex(const Graph& G, size_t v) {
+  if (v >= G.n) {
+    throw std::invalid_argument("Vertex " + std::to_string(v) +
+                                " is not in [0, " + std::to_string(G.n) + ").");
+  }
+}
+
+// Throws std::invalid_argument unless ordering is a vertex ordering that
+// Triangle() supports.
+inline void check_triangle_ordering(const std::string& ordering) {
+  if (ordering != "degree" && ordering != "goodrich" && ordering != "kcore" &&
+      ordering != "barenboimelkin") {
+    throw std::invalid_argument("Unknown triangle counting ordering: " +
+                                ordering);
+  }
+}
+
+// Reads `sources`, a 1-dim NumPy array of integer vertex IDs of a graph with n
+// vertices.
+sequence<uintE> source_vertices(const py::array& sources, size_t n) {
+  if (sources.ndim() != 1) {
+    throw std::invalid_argument("Expected a 1-dim array of source vertices.");
+  }
+  if (sources.dtype().kind() != 'i' && sources.dtype().kind() != 'u') {
+    throw std::invalid_argument("Source vertices must be integers.");
+  }
+  sequence<uintE> result;
+  dispatch_dtype(sources, [&](auto v) {
+    using V = decltype(v);
+    auto S = sources.unchecked<V, 1>();
+    without_gil([&] {
+      auto invalid = parlay::delayed_seq<size_t>(
+          S.shape(0), [&](size_t i) -> size_t {
+            return !is_vertex_id(S(i)) || static_cast<uint64_t>(S(i)) >= n;
+          });
+      if (parlay::reduce(invalid) > 0) {
+        throw std::invalid_argument("Source vertices must be in [0, " +
+                                    std::to_string(n) + ").");
+      }
+      result = sequence<uintE>::from_function(
+          S.shape(0), [&](size_t i) { return uintE(S(i)); });
+    });
+  });
+  return result;
+}
+
+// Runs `query` on the sources in batches of 64 and returns its results: the
+// distance from each source to every vertex of a graph with n vertices, where
+// `unreached` marks unreached vertices.  `query(batch)` returns the batch's
+// distances as batch.size() rows of n entries.  The result is a [k x n] array
+// for k sources, or, if `sparse` is set, a tuple (offsets, vertices,
+// distances) listing the vertices that the i-th source reaches and their
+// distances in [offsets[i], offsets[i + 1]).
+template <class Distance, class Query>
+py::object multi_source_distances(const sequence<uintE>& sources, size_t n,
+                                  Distance unreached, bool sparse,
+                                  Query query) {
+  constexpr size_t kBatchSize = 64;
+  size_t k = sources.size();
+  if (!sparse) {
+    std::vector<py::ssize_t> shape = {py::ssize_t(k), py::ssize_t(n)};
+    py::array_t<Distance> result(shape);
+    Distance* out = result.mutable_data();
+    without_gil([&] {
+      for (size_t b = 0; b < k; b += kBatchSize) {
+        auto batch =
+            parlay::to_sequence(sources.cut(b, std::min(k, b + kBatchSize)));
+        auto dists = query(batch);
+        parallel_for(0, dists.size(),
+                     [&](size_t i) { out[b * n + i] = dists[i]; });
+      }
+    });
+    return result;
+  }
+
+  auto offsets = sequence<size_t>(k + 1, 0);
+  sequence<uintE> vertices;
+  sequence<Distance> dists;
+  without_gil([&] {
+    auto reached = sequence<sequence<uintE>>(k);
+    auto reached_dists = sequence<sequence<Distance>>(k);
+    for (size_t b = 0; b < k; b += kBatchSize) {
+      auto batch =
+          parlay::to_sequence(sources.cut(b, std::min(k, b + kBatchSize)));
+      auto dists = query(batch);
+      parallel_for(0, batch.size(), [&](size_t i) {
+        auto row = dists.cut(i * n, (i + 1) * n);
+        auto is_reached = parlay::delayed_seq<bool>(
+            n, [&](size_t v) { return row[v] != unreached; });
+        reached[b + i] = parlay::pack_index<uintE>(is_reached);
+        reached_dists[b + i] = parlay::map(
+            reached[b + i], [&](uintE v) { return row[v]; });
+      }, 1);
+    }
+    auto counts = parlay::map(reached, [](const auto& R) { return R.size(); });
+    parlay::copy(counts, offsets.cut(1, k + 1));
+    parlay::scan_inclusive_inplace(offsets);
+    vertices = parlay::flatten(reached);
+    dists = parlay::flatten(reached_dists);
+  });
+  return py::make_tuple(wrap_array(offsets), wrap_array(vertices),
+                        wrap_array(dists));
+}
+
 /* Defines symmetric graph functions */
 template <template <class W> class vertex_type, class W>
 void SymGraphRegister(py::module& m, std::string graph_name) {
@@ -217,55 +557,213 @@ void SymGraphRegister(py::module& m, std::string graph_name) {
       .def("numEdges", [](const graph& G) -> size_t { return G.m; })
       .def("writeGraph",
            [](graph& G, std::string& filename) -> void {
-             gbbs_io::write_graph_to_file(filename.c_str(), G);
+             without_gil(
+                 [&] { gbbs_io::write_graph_to_file(filename.c_str(), G); });
            })
       .def("BFS",
            [&](graph& G, const size_t src) {
-             auto parents = compiled::BFS(G, src);
+             auto parents = without_gil([&] { return compiled::BFS(G, src); });
              return wrap_array(parents);
            },
            py::arg("src"))
       .def("Connectivity",
            [&](graph& G) {
-             auto ccs = compiled::Connectivity(G);
+             auto ccs = without_gil([&] { return compiled::Connectivity(G); });
              return wrap_array(ccs);
            })
       .def("ApproximateSetCover",
            [&](graph& G, size_t num_buckets) {
-             auto ccs = compiled::ApproximateSetCover(G, num_buckets);
+             auto ccs = without_gil([&] {
+               return compiled::ApproximateSetCover(G, num_buckets);
+             });
              return wrap_array(ccs);
            })
       .def("KCore",
            [&](graph& G) {
-             auto cores = compiled::KCore(G);
+             auto cores = without_gil([&] { return compiled::KCore(G); });
              return wrap_array(cores);
            })
       .def("PageRank",
            [&](graph& G) {
-             auto ranks = compiled::PageRank(G);
+             auto ranks = without_gil([&] { return compiled::PageRank(G); });
              return wrap_array(ranks);
            })
       .def("MinimumSpanningForest",
            [&](graph& G) {
-             auto G_copy = G;
-             auto edges = compiled::MinimumSpanningForest(G_copy);
+             auto edges = without_gil([&] {
+               auto G_copy = G;
+               return compiled::MinimumSpanningForest(G_copy);
+             });
              return build_edgelist<W>(edges);
            })
       .def("BellmanFord",
            [&](graph& G, uintE source) {
-             auto distances = compiled::BellmanFord(G, source);
+             auto distances =
+                 without_gil([&] { return compiled::BellmanFord(G, source); });
              return wrap_array(distances);
            })
       .def("DeltaStepping",
            [&](graph& G, uintE source, Distance delta) {
-             auto distances = compiled::DeltaStepping(G, source, delta);
+             auto distances = without_gil([&] {
+               return compiled::DeltaStepping(G, source, delta);
+             });
              return wrap_array(distances);
            })
+      .def("MultiBFS",
+           [&](graph& G, const py::array& sources,
+               const py::object& max_hops, bool sparse) {
+             uintE hops = max_hops.is_none() ? UINT_E_MAX
+                                             : max_hops.cast<uintE>();
+             return multi_source_distances<uintE>(
+                 source_vertices(sources, G.n), G.n, UINT_E_MAX, sparse,
+                 [&](const sequence<uintE>& batch) {
+                   return compiled::MultiBFS(G, batch, hops);
+                 });
+           },
+           py::arg("sources"), py::arg("max_hops") = py::none(),
+           py::arg("sparse") = false)
+      .def("MultiBellmanFord",
+           [&](graph& G, const py::array& sources,
+               const py::object& max_distance, bool sparse) {
+             constexpr Distance kMax = std::numeric_limits<Distance>::max();
+             Distance limit = max_distance.is_none()
+                                  ? kMax
+                                  : max_distance.cast<Distance>();
+             return multi_source_distances<Distance>(
+                 source_vertices(sources, G.n), G.n, kMax, sparse,
+                 [&](const sequence<uintE>& batch) {
+                   return compiled::MultiBellmanFord(G, batch, limit);
+                 });
+           },
+           py::arg("sources"), py::arg("max_distance") = py::none(),
+           py::arg("sparse") = false)
+      .def("MultiDeltaStepping",
+           [&](graph& G, const py::array& sources, Distance delta,
+               const py::object& max_distance, bool sparse) {
+             constexpr Distance kMax = std::numeric_limits<Distance>::max();
+             Distance limit = max_distance.is_none()
+                                  ? kMax
+                                  : max_distance.cast<Distance>();
+             return multi_source_distances<Distance>(
+                 source_vertices(sources, G.n), G.n, kMax, sparse,
+                 [&](const sequence<uintE>& batch) {
+                   return compiled::MultiDeltaStepping(G, batch, delta,
+                                                       limit);
+                 });
+           },
+           py::arg("sources"), py::arg("delta"),
+           py::arg("max_distance") = py::none(), py::arg("sparse") = false)
+      .def("TriangleCount",
+           [&](graph& G, const std::string& ordering) {
+             check_triangle_ordering(ordering);
+             return without_gil(
+                 [&] { return compiled::TriangleCount(G, ordering); });
+           },
+           py::arg("ordering") = "degree")
+      .def("VertexTriangleCounts",
+           [&](graph& G, const std::string& ordering) {
+             check_triangle_ordering(ordering);
+             auto counts = without_gil(
+                 [&] { return compiled::VertexTriangleCounts(G, ordering); });
+             py::ssize_t n = counts.size();
+             return move_to_array<size_t>(std::move(counts), {n});
+           },
+           py::arg("ordering") = "degree")
+      .def("MaximalIndependentSet",
+           [&](graph& G) {
+             auto in_mis = without_gil(
+                 [&] { return compiled::MaximalIndependentSet(G); });
+             py::ssize_t n = in_mis.size();
+             return move_to_array<bool>(std::move(in_mis), {n});
+           })
+      .def("SpanningForest",
+           [&](graph& G) {
+             auto edges =
+                 without_gil([&] { return compiled::SpanningForest(G); });
+             return move_edges_to_array(std::move(edges));
+           })
+      .def("Biconnectivity",
+           [&](graph& G) {
+             auto [parents, labels] = without_gil([&] {
+               auto G_copy = G;
+               return compiled::Biconnectivity(G_copy);
+             });
+             py::ssize_t n = parents.size();
+             return py::make_tuple(
+                 move_to_array<uintE>(std::move(parents), {n}),
+                 move_to_array<uintE>(std::move(labels), {n}));
+           })
+      .def("KTruss",
+           [&](graph& G, size_t num_buckets) {
+             if (num_buckets == 0 || (num_buckets & (num_buckets - 1)) != 0) {
+               throw std::invalid_argument(
+                   "num_buckets must be a power of two.");
+             }
+             auto trussness = without_gil([&] {
+               auto G_copy = G;
+               return compiled::KTruss(G_copy, num_buckets);
+             });
+             std::vector<py::ssize_t> shape = {
+                 py::ssize_t(trussness.size()), 3};
+             py::array_t<uintE> result(shape);
+             uintE* out = result.mutable_data();
+             without_gil([&] {
+               parallel_for(0, trussness.size(), [&](size_t i) {
+                 std::tie(out[3 * i], out[3 * i + 1], out[3 * i + 2]) =
+                     trussness[i];
+               });
+             });
+             return result;
+           },
+           py::arg("num_buckets") = 16)
+      .def("SCAN",
+           [&](graph& G, uint64_t mu, float epsilon) {
+             auto clustering =
+                 without_gil([&] { return compiled::SCAN(G, mu, epsilon); });
+             py::ssize_t n = clustering.size();
+             return move_to_array<uintE>(std::move(clustering), {n});
+           },
+           py::arg("mu") = 5, py::arg("epsilon") = 0.6)
+      .def("LowDiameterDecomposition",
+           [&](graph& G, double beta, bool permute) {
+             auto clusters = without_gil([&] {
+               return compiled::LowDiameterDecomposition(G, beta, permute);
+             });
+             py::ssize_t n = clusters.size();
+             return move_to_array<uintE>(std::move(clusters), {n});
+           },
+           py::arg("beta") = 0.2, py::arg("permute") = false)
+      .def("GraphColoring",
+           [&](graph& G, bool lf) {
+             auto colors =
+                 without_gil([&] { return compiled::GraphColoring(G, lf); });
+             py::ssize_t n = colors.size();
+             return move_to_array<uintE>(std::move(colors), {n});
+           },
+           py::arg("lf") = false)
+      .def("MaximalMatching",
+           [&](graph& G) {
+             auto matching = without_gil([&] {
+               auto G_copy = G;
+               return compiled::MaximalMatching(G_copy);
+             });
+             return move_edges_to_array(std::move(matching));
+           })
+      .def("SSBetweennessCentrality",
+           [&](graph& G, size_t src) {
+             check_vertex(G, src);
+             auto scores = without_gil(
+                 [&] { return compiled::SSBetweennessCentrality(G, src); });
+             py::ssize_t n = scores.size();
+             return move_to_array<double>(std::move(scores), {n});
+           },
+           py::arg("src"))
       .def("HierarchicalAgglomerativeClustering",
            [&](graph& G, std::string& linkage, bool similarity = true) {
              if
                constexpr(!std::is_same<W, gbbs::empty>()) {
-                 auto dendrogram = compiled::HAC(G, linkage, similarity);
+                 auto dendrogram = without_gil(
+                     [&] { return compiled::HAC(G, linkage, similarity); });
                  return build_dendrogram<W>(dendrogram);
                }
              else {
@@ -303,12 +801,397 @@ void AsymGraphRegister(py::module& m, std::string graph_name) {
       .def("numEdges", [](const graph& G) -> size_t { return G.m; })
       .def("BFS",
            [&](graph& G, const size_t src) {
-             auto parents = compiled::BFS(G, src);
+             without_gil([&] { compiled::BFS(G, src); });
              return 1.0;
            },
+           py::arg("src"))
+      .def("MultiBFS",
+           [&](graph& G, const py::array& sources,
+               const py::object& max_hops, bool sparse) {
+             uintE hops = max_hops.is_none() ? UINT_E_MAX
+                                             : max_hops.cast<uintE>();
+             return multi_source_distances<uintE>(
+                 source_vertices(sources, G.n), G.n, UINT_E_MAX, sparse,
+                 [&](const sequence<uintE>& batch) {
+                   return compiled::MultiBFS(G, batch, hops);
+                 });
+           },
+           py::arg("sources"), py::arg("max_hops") = py::none(),
+           py::arg("sparse") = false)
+      .def("StronglyConnectedComponents",
+           [&](graph& G, double beta) {
+             auto labels = without_gil([&] {
+               return compiled::StronglyConnectedComponents(G, beta);
+             });
+             py::ssize_t n = labels.size();
+             return move_to_array<size_t>(std::move(labels), {n});
+           },
+           py::arg("beta") = 1.1)
+      .def("SSBetweennessCentrality",
+           [&](graph& G, size_t src) {
+             check_vertex(G, src);
+             auto scores = without_gil(
+                 [&] { return compiled::SSBetweennessCentrality(G, src); });
+             py::ssize_t n = scores.size();
+             return move_to_array<double>(std::move(scores), {n});
+           },
            py::arg("src"));
 }
 
+/* ============================ Graph handles ============================ */
+
+// The on-disk formats of a graph: "adj" for the (Weighted)AdjacencyGraph text
+// format, "binary" for the -b format, and "compressed" for the -c format.
+struct GraphFormat {
+  std::string format;
+  bool symmetric;
+  bool weighted;
+};
+
+// Detect the format of the graph in path.  Binary graphs consist of one
+// (symmetric) or two (asymmetric) sections whose size is recorded in the third
+// word of the header; compressed graphs record only the size of their edges.
+// Text graphs do not record whether they are symmetric, and compressed graphs
+// whether they are weighted, so these default to symmetric and unweighted.
+GraphFormat detect_graph_format(const std::string& path) {
+  std::ifstream file(path, std::ios::binary | std::ios::ate);
+  if (!file.is_open()) {
+    throw std::invalid_argument("Unable to open graph file: " + path);
+  }
+  size_t file_size = file.tellg();
+  file.seekg(0);
+  char header[3 * sizeof(long)] = {};
+  file.read(header, std::min(sizeof(header), file_size));
+  std::string text(header, std::min(sizeof(header), file_size));
+  if (text.rfind("WeightedAdjacencyGraph", 0) == 0) {
+    return {"adj", true, true};
+  }
+  if (text.rfind("AdjacencyGraph", 0) == 0) {
+    return {"adj", true, false};
+  }
+  if (file_size >= sizeof(header)) {
+    const long* sizes = reinterpret_cast<const long*>(header);
+    size_t n = sizes[0], m = sizes[1], space = sizes[2];
+    size_t csr_space = sizeof(header) + sizeof(uintT) * (n + 1);
+    if (space >= csr_space && (space == file_size || 2 * space == file_size)) {
+      bool weighted = m > 0 && (space - csr_space) / m > sizeof(uintE);
+      return {"binary", space == file_size, weighted};
+    }
+    size_t compressed_space = csr_space + sizeof(uintE) * n + space;
+    if (compressed_space == file_size) {
+      return {"compressed", true, false};
+    }
+    if (compressed_space < file_size) {
+      return {"compressed", false, false};
+    }
+  }
+  throw std::invalid_argument("Unrecognized graph format: " + path);
+}
+
+// A graph together with read-only NumPy views of its CSR arrays: the offsets
+// of the (out-)neighbors of each vertex, the neighbor ids, and, if weighted,
+// the weights; and for asymmetric graphs the same arrays for the in-neighbors.
+// For the binary format the graph and the views share one read-only mapping
+// of the file, so processes that open the same graph share its pages.
+struct GraphHandle {
+  std::string path;
+  GraphFormat format;
+  size_t n;
+  size_t m;
+  py::object graph;
+  py::object offsets, neighbors, weights;
+  py::object in_offsets, in_neighbors, in_weights;
+};
+
+// A read-only mapping of a file, unmapped once the last graph or view that
+// references it is gone.
+struct MappedFile {
+  char* bytes;
+  size_t size;
+  ~MappedFile() { gbbs_io::unmmap(bytes, size); }
+};
+
+// Returns a read-only view of count values of type T that are stride bytes
+// apart, starting at ptr.  The view keeps base alive.
+template <class T>
+py::object readonly_view(const char* ptr, size_t count, size_t stride,
+                         py::handle base) {
+  std::vector<py::ssize_t> shape{(py::ssize_t)count};
+  std::vector<py::ssize_t> strides{(py::ssize_t)stride};
+  py::array view(py::dtype::of<T>(), shape, strides, ptr, base);
+  view.attr("setflags")(py::arg("write") = false);
+  return std::move(view);
+}
+
+// Returns a capsule that keeps the mapping alive while a view references it.
+py::capsule mapping_owner(const std::shared_ptr<MappedFile>& mapping) {
+  return py::capsule(new std::shared_ptr<MappedFile>(mapping), [](void* p) {
+    delete static_cast<std::shared_ptr<MappedFile>*>(p);
+  });
+}
+
+// Sets the views of the neighbor ids and weights of the m edges at edges.
+template <class W>
+void set_edge_views(const std::tuple<uintE, W>* edges, size_t m,
+                    py::handle base, py::object& neighbors,
+                    py::object& weights) {
+  using edge = std::tuple<uintE, W>;
+  const edge probe{};
+  auto field_offset = [&](const void* field) {
+    return static_cast<const char*>(field) -
+           reinterpret_cast<const char*>(&probe);
+  };
+  const char* bytes = reinterpret_cast<const char*>(edges);
+  neighbors = readonly_view<uintE>(bytes + field_offset(&std::get<0>(probe)),
+                                   m, sizeof(edge), base);
+  if constexpr (std::is_same<W, gbbs::empty>::value) {
+    weights = py::none();
+  } else {
+    weights = readonly_view<W>(bytes + field_offset(&std::get<1>(probe)), m,
+                               sizeof(edge), base);
+  }
+}
+
+// Returns the vertex data of the n vertices whose offsets are given.
+vertex_data* offsets_to_vertex_data(const uintT* offsets, size_t n) {
+  auto v_data = gbbs::new_array_no_init<vertex_data>(n);
+  parallel_for(0, n, [&](size_t i) {
+    v_data[i].offset = offsets[i];
+    v_data[i].degree = offsets[i + 1] - offsets[i];
+  });
+  return v_data;
+}
+
+// Map a binary graph, and build the graph and the views over the mapping
+// without copying the edges.
+template <class W>
+void map_binary_graph(GraphHandle& H) {
+  using edge = std::tuple<uintE, W>;
+  char* bytes;
+  size_t bytes_size;
+  std::tie(bytes, bytes_size) = gbbs_io::mmapStringFromFile(H.path.c_str());
+  auto mapping = std::shared_ptr<MappedFile>(new MappedFile{bytes, bytes_size});
+  const long* sizes = reinterpret_cast<const long*>(bytes);
+  size_t n = sizes[0], m = sizes[1];
+  size_t csr_space = 3 * sizeof(long) + sizeof(uintT) * (n + 1);
+  if (m > 0 && (size_t)sizes[2] != csr_space + sizeof(edge) * m) {
+    throw std::invalid_argument(
+        "Edges of " + H.path + " are " +
+        std::to_string((sizes[2] - csr_space) / m) + " bytes, not " +
+        std::to_string(sizeof(edge)) + "; check weight_type.");
+  }
+  H.n = n;
+  H.m = m;
+  py::capsule owner = mapping_owner(mapping);
+
+  uintT* out_offsets = (uintT*)(bytes + 3 * sizeof(long));
+  edge* out_edges = (edge*)(bytes + csr_space);
+  H.offsets = readonly_view<uintT>((const char*)out_offsets, n + 1,
+                                   sizeof(uintT), owner);
+  set_edge_views<W>(out_edges, m, owner, H.neighbors, H.weights);
+  auto v_out_data = offsets_to_vertex_data(out_offsets, n);
+
+  if (H.format.symmetric) {
+    H.graph = py::cast(symmetric_graph<symmetric_vertex, W>(
+        v_out_data, n, m,
+        [=]() {
+          gbbs::free_array(v_out_data, n);
+          (void)mapping;
+        },
+        out_edges));
+    H.in_offsets = H.in_neighbors = H.in_weights = py::none();
+    return;
+  }
+  char* in_section = bytes + sizes[2];
+  uintT* in_offsets = (uintT*)(in_section + 3 * sizeof(long));
+  edge* in_edges = (edge*)(in_section + csr_space);
+  H.in_offsets = readonly_view<uintT>((const char*)in_offsets, n + 1,
+                                      sizeof(uintT), owner);
+  set_edge_views<W>(in_edges, m, owner, H.in_neighbors, H.in_weights);
+  auto v_in_data = offsets_to_vertex_data(in_offsets, n);
+  H.graph = py::cast(asymmetric_graph<asymmetric_vertex, W>(
+      v_out_data, v_in_data, n, m,
+      [=]() {
+        gbbs::free_array(v_out_data, n);
+        gbbs::free_array(v_in_data, n);
+        (void)mapping;
+      },
+      out_edges, in_edges));
+}
+
+// Sets the views of one direction of the edges of a graph that is already in
+// memory.  Uncompressed edges are viewed in place, and keep the graph alive;
+// compressed edges are decoded into new arrays.
+template <class W, class VertexData, class Edges, class Neighbors>
+void set_loaded_views(size_t n, size_t m, const VertexData* v_data,
+                      Edges* edges, Neighbors get_neighbors, py::handle graph,
+                      py::object& offsets, py::object& neighbors,
+                      py::object& weights) {
+  using edge = std::tuple<uintE, W>;
+  auto offs = sequence<uintT>::from_function(
+      n + 1, [&](size_t i) { return i < n ? v_data[i].degree : 0; });
+  parlay::scan_inplace(make_slice(offs));
+  auto offsets_array = wrap_array(offs);
+  offsets_array.attr("setflags")(py::arg("write") = false);
+  offsets = std::move(offsets_array);
+  if constexpr (std::is_same<Edges, edge>::value) {
+    set_edge_views<W>(edges, m, graph, neighbors, weights);
+  } else {
+    auto decoded = (edge*)malloc(m * sizeof(edge));
+    parallel_for(0, n, [&](size_t i) {
+      auto map_f = [&](const uintE& u, const uintE& v, const W& wgh) {
+        return wgh;
+      };
+      auto write_f = [&](const uintE& ngh, const uintT& offset,
+                         const W& wgh) { decoded[offset] = {ngh, wgh}; };
+      get_neighbors(i).copy(offs[i], map_f, write_f);
+    }, 1);
+    py::capsule owner(decoded, [](void* p) { free(p); });
+    set_edge_views<W>(decoded, m, owner, neighbors, weights);
+  }
+}
+
+// Load a graph in the adj or compressed format, and set the views over it.
+template <template <class W> class vertex_type, class W, class Graph>
+void load_graph(GraphHandle& H, Graph G) {
+  H.n = G.n;
+  H.m = G.m;
+  H.graph = py::cast(std::move(G));
+  Graph& graph = H.graph.cast<Graph&>();
+  if constexpr (std::is_same<Graph, symmetric_graph<vertex_type, W>>::value) {
+    set_loaded_views<W>(
+        graph.n, graph.m, graph.v_data, graph.e0,
+        [&](size_t i) { return graph.get_vertex(i).out_neighbors(); },
+        H.graph, H.offsets, H.neighbors, H.weights);
+    H.in_offsets = H.in_neighbors = H.in_weights = py::none();
+  } else {
+    set_loaded_views<W>(
+        graph.n, graph.m, graph.v_out_data, graph.out_edges,
+        [&](size_t i) { return graph.get_vertex(i).out_neighbors(); },
+        H.graph, H.offsets, H.neighbors, H.weights);
+    set_loaded_views<W>(
+        graph.n, graph.m, graph.v_in_data, graph.in_edges,
+        [&](size_t i) { return graph.get_vertex(i).in_neighbors(); },
+        H.graph, H.in_offsets, H.in_neighbors, H.in_weights);
+  }
+}
+
+template <class W>
+void open_graph_with_weights(GraphHandle& H) {
+  const char* path = H.path.c_str();
+  bool symmetric = H.format.symmetric;
+  if (H.format.format == "binary") {
+    map_binary_graph<W>(H);
+  } else if (H.format.format == "compressed") {
+    if constexpr (!std::is_same<W, gbbs::empty>::value) {
+      throw std::invalid_argument(
+          "Only unweighted compressed graphs are supported: " + H.path);
+    } else if (symmetric) {
+      load_graph<csv_bytepd_amortized, W>(
+          H, gbbs_io::read_compressed_symmetric_graph<W>(path, true));
+    } else {
+      load_graph<cav_bytepd_amortized, W>(
+          H, gbbs_io::read_compressed_asymmetric_graph<W>(path, true));
+    }
+  } else if constexpr (std::is_same<W, gbbs::empty>::value) {
+    if (symmetric) {
+      load_graph<symmetric_vertex, W>(
+          H, gbbs_io::read_unweighted_symmetric_graph(path, true, false));
+    } else {
+      load_graph<asymmetric_vertex, W>(
+          H, gbbs_io::read_unweighted_asymmetric_graph(path, true, false));
+    }
+  } else {
+    if (symmetric) {
+      load_graph<symmetric_vertex, W>(
+          H, gbbs_io::read_weighted_symmetric_graph<W>(path, true, false));
+    } else {
+      load_graph<asymmetric_vertex, W>(
+          H, gbbs_io::read_weighted_asymmetric_graph<W>(path, true, false));
+    }
+  }
+}
+
+// Open the graph in path, detecting its format.  symmetric overrides the
+// detected symmetry (which text graphs do not record), and weight_type, one of
+// "float" or "int", gives the type of the weights of weighted graphs.
+GraphHandle open_graph(const std::string& path, py::object symmetric,
+                       const std::string& weight_type) {
+  gbbs_lock lock;
+  GraphHandle H;
+  H.path = path;
+  H.format = detect_graph_format(path);
+  if (!symmetric.is_none()) {
+    if (H.format.format != "adj" &&
+        symmetric.cast<bool>() != H.format.symmetric) {
+      throw std::invalid_argument(
+          path + " is " + (H.format.symmetric ? "" : "not ") + "symmetric.");
+    }
+    H.format.symmetric = symmetric.cast<bool>();
+  }
+  if (!H.format.weighted) {
+    open_graph_with_weights<gbbs::empty>(H);
+  } else if (weight_type == "float") {
+    open_graph_with_weights<float>(H);
+  } else if (weight_type == "int") {
+    open_graph_with_weights<uint32_t>(H);
+  } else {
+    throw std::invalid_argument("Unknown weight type: " + weight_type);
+  }
+  return H;
+}
+
+// Compress the unweighted binary graph in inpath into the bytepd-amortized
+// format (the -c format), written to outpath.  The binary graph is mapped
+// rather than read; the compressed edges of symmetric graphs are built and
+// written in n_batches batches of vertices.
+void compress_binary_graph(const std::string& inpath,
+                           const std::string& outpath, size_t n_batches) {
+  GraphFormat format = detect_graph_format(inpath);
+  if (format.format != "binary" || format.weighted) {
+    throw std::invalid_argument("Expected an unweighted binary graph: " +
+                                inpath);
+  }
+  std::ofstream out(outpath, std::ofstream::out | std::ios::binary);
+  if (!out.is_open()) {
+    throw std::invalid_argument("Unable to open output file: " + outpath);
+  }
+  using edge = std::tuple<uintE, gbbs::empty>;
+  char* bytes;
+  size_t bytes_size;
+  std::tie(bytes, bytes_size) = gbbs_io::mmapStringFromFile(inpath.c_str());
+  MappedFile mapping{bytes, bytes_size};
+  const long* sizes = reinterpret_cast<const long*>(bytes);
+  size_t n = sizes[0], m = sizes[1];
+  size_t csr_space = 3 * sizeof(long) + sizeof(uintT) * (n + 1);
+  uintT* out_offsets = (uintT*)(bytes + 3 * sizeof(long));
+  edge* out_edges = (edge*)(bytes + csr_space);
+  auto v_out_data = offsets_to_vertex_data(out_offsets, n);
+
+  // The decoder reads blocks of PARALLEL_DEGREE edges.
+  PAR_DEGREE_TWO = PARALLEL_DEGREE;
+  if (format.symmetric) {
+    auto G = symmetric_graph<symmetric_vertex, gbbs::empty>(
+        v_out_data, n, m, [=]() { gbbs::free_array(v_out_data, n); },
+        out_edges);
+    bytepd_amortized::write_graph_bytepd_amortized_format(G, out, true,
+                                                          n_batches);
+  } else {
+    char* in_section = bytes + sizes[2];
+    uintT* in_offsets = (uintT*)(in_section + 3 * sizeof(long));
+    edge* in_edges = (edge*)(in_section + csr_space);
+    auto v_in_data = offsets_to_vertex_data(in_offsets, n);
+    auto G = asymmetric_graph<asymmetric_vertex, gbbs::empty>(
+        v_out_data, v_in_data, n, m,
+        [=]() {
+          gbbs::free_array(v_out_data, n);
+          gbbs::free_array(v_in_data, n);
+        },
+        out_edges, in_edges);
+    bytepd_amortized::write_graph_bytepd_amortized_format(G, out, false);
+  }
+}
+
 PYBIND11_MODULE(gbbs_lib, m) {
   m.doc() = "Python module exporting core gbbs types and core data structures.";
 
@@ -355,6 +1238,23 @@ PYBIND11_MODULE(gbbs_lib, m) {
   AsymGraphRegister<cav_bytepd_amortized, gbbs::empty>(
       m, "CompressedAsymmetricGraphEmpty");
 
+  py::class_<GraphHandle>(m, "GraphHandle")
+      .def("numVertices", [](const GraphHandle& H) { return H.n; })
+      .def("numEdges", [](const GraphHandle& H) { return H.m; })
+      .def_property_readonly(
+          "format", [](const GraphHandle& H) { return H.format.format; })
+      .def_property_readonly(
+          "symmetric", [](const GraphHandle& H) { return H.format.symmetric; })
+      .def_property_readonly(
+          "weighted", [](const GraphHandle& H) { return H.format.weighted; })
+      .def_readonly("graph", &GraphHandle::graph)
+      .def_readonly("offsets", &GraphHandle::offsets)
+      .def_readonly("neighbors", &GraphHandle::neighbors)
+      .def_readonly("weights", &GraphHandle::weights)
+      .def_readonly("inOffsets", &GraphHandle::in_offsets)
+      .def_readonly("inNeighbors", &GraphHandle::in_neighbors)
+      .def_readonly("inWeights", &GraphHandle::in_weights);
+
   /* ============================== Graph IO ============================= */
   m.def("readSymmetricUnweightedGraph",
         [&](std::string& path, bool binary = false) {
@@ -362,7 +1262,8 @@ PYBIND11_MODULE(gbbs_lib, m) {
                                                             /* mmap = */ true,
                                                             binary);
           return G;
-        });
+        },
+        py::call_guard<gbbs_guard>());
 
   m.def("readSymmetricFloatWeightedGraph",
         [&](std::string& path, bool binary = false) {
@@ -370,7 +1271,8 @@ PYBIND11_MODULE(gbbs_lib, m) {
               path.c_str(),
               /* mmap = */ true, binary);
           return G;
-        });
+        },
+        py::call_guard<gbbs_guard>());
 
   m.def("readAsymmetricUnweightedGraph",
         [&](std::string& path, bool binary = false) {
@@ -378,7 +1280,8 @@ PYBIND11_MODULE(gbbs_lib, m) {
                                                              /* mmap = */ true,
                                                              binary);
           return G;
-        });
+        },
+        py::call_guard<gbbs_guard>());
 
   m.def("readAsymmetricFloatWeightedGraph",
         [&](std::string& path, bool binary = false) {
@@ -386,21 +1289,29 @@ PYBIND11_MODULE(gbbs_lib, m) {
               path.c_str(),
               /* mmap = */ true, binary);
           return G;
-        });
+        },
+        py::call_guard<gbbs_guard>());
+
+  m.def("graphFormat", [](const std::string& path) {
+    return detect_graph_format(path).format;
+  });
+
+  m.def("openGraph", &open_graph, py::arg("path"),
+        py::arg("symmetric") = py::none(), py::arg("weight_type") = "float");
 
   m.def("readCompressedSymmetricUnweightedGraph", [&](std::string& path) {
     auto G = gbbs_io::read_compressed_symmetric_graph<gbbs::empty>(
         path.c_str(),
         /* mmap = */ true);
     return G;
-  });
+  }, py::call_guard<gbbs_guard>());
 
   m.def("readCompressedAsymmetricUnweightedGraph", [&](std::string& path) {
     auto G = gbbs_io::read_compressed_asymmetric_graph<gbbs::empty>(
         path.c_str(),
         /* mmap = */ true);
     return G;
-  });
+  }, py::call_guard<gbbs_guard>());
 
   m.def("testNumpyArray", &test_array, "testing numpy array");
 
@@ -408,6 +1319,7 @@ PYBIND11_MODULE(gbbs_lib, m) {
                                                            input) {
     py::buffer_info buf = input.request();
     uint32_t* ptr = (uint32_t*)buf.ptr;
+    gbbs_lock lock;
 
     size_t m = buf.shape[0], cols = buf.shape[1];
     if (cols != 2) {
@@ -433,6 +1345,11 @@ PYBIND11_MODULE(gbbs_lib, m) {
     return graph;
   });
 
+  m.def("numpyEdgeListToGraph", &numpy_edge_list_to_graph, py::arg("edges"),
+        py::arg("weights") = py::none(), py::arg("weighted") = false,
+        py::arg("symmetric") = true, py::arg("dedupe") = true,
+        py::arg("remove_self_loops") = true);
+
   // Uint weighted graph.
   m.def("numpyUintEdgeListToSymmetricWeightedGraph",
         [&](py::array_t<uint32_t> input) {
@@ -449,6 +1366,10 @@ PYBIND11_MODULE(gbbs_lib, m) {
           return G;
         });
 
+  m.def("compressBinaryGraph", &compress_binary_graph, py::arg("inpath"),
+        py::arg("outpath"), py::arg("n_batches") = 6,
+        py::call_guard<gbbs_guard>());
+
   m.def("loadSymmetricEdgeListAsGraph", [&](std::string& inpath,
                                             std::string& outpath) {
     struct stat buffer;
@@ -464,7 +1385,7 @@ PYBIND11_MODULE(gbbs_lib, m) {
         /* mmap = */ true,
         /* binary = */ false); /* TODO: use binary */
     return G;
-  });
+  }, py::call_guard<gbbs_guard>());
 
   m.def("loadAsymmetricEdgeListAsGraph", [&](std::string& inpath,
                                              std::string& outpath) {
@@ -481,21 +1402,21 @@ PYBIND11_MODULE(gbbs_lib, m) {
         /* mmap = */ true,
         /* binary = */ false); /* TODO: use binary */
     return G;
-  });
+  }, py::call_guard<gbbs_guard>());
 
   m.def("loadSymmetricFloatEdgeListAsGraph", [&](std::string& inpath) {
     const auto edge_list{
         gbbs_io::read_weighted_edge_list<float>(inpath.c_str())};
     auto graph{gbbs_io::edge_list_to_symmetric_graph(edge_list)};
     return graph;
-  });
+  }, py::call_guard<gbbs_guard>());
 
   m.def("loadAsymmetricFloatEdgeListAsGraph", [&](std::string& inpath) {
     const auto edge_list{
         gbbs_io::read_weighted_edge_list<float>(inpath.c_str())};
     auto graph{gbbs_io::edge_list_to_asymmetric_graph(edge_list)};
     return graph;
-  });
+  }, py::call_guard<gbbs_guard>());
 }
 
 }  // namespace gbbs_lib
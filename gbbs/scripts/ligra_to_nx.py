@@ -1,118 +1,255 @@
+import os
 import sys
 import functools
 import itertools
+import tempfile
 import time
+import warnings
+import zipfile
 import networkx as nx
+import numpy as np
 from numpy import array
 
 
 
 
+# Returns the inner products of the columns left[j] and right[j] of X, a few
+# rows at a time so that the gathered columns stay small.
+def column_dots(X, left, right, rows=1 << 14):
+  dots = np.zeros(len(left))
+  for r in range(0, X.shape[0], rows):
+    dots += np.einsum("ij,ij->j", X[r:r + rows, left], X[r:r + rows, right])
+  return dots
+
+# Returns the CoSimRank similarities of the (u, v) pairs of vertices of the
+# graph with the (weighted) adjacency matrix A, a SciPy sparse matrix whose
+# rows are sources.  As in the power iteration of PageRank with damping 1, the
+# vectors x_u = e_u and x_v = e_v take steps along the row-stochastic form of
+# A, with the mass on dangling vertices spread over all vertices, and each
+# step t adds alpha^t * <x_u, x_v> to the similarity, until both vectors
+# change by less than n * tol (in l1 norm) or after max_iter steps.  Pairs are
+# handled in blocks of block_size, each iterating one vector per distinct
+# vertex at once; blocks are smaller if the two n x (2 * block_size) matrices
+# of a step would take more than max_bytes.
+def cosimrank_pairs(A, pairs, alpha=0.9, max_iter=100, tol=1.0e-6,
+                    block_size=256, max_bytes=1 << 30):
+  import scipy.sparse  # Only needed here.
+  A = scipy.sparse.csr_matrix(A, dtype=np.float64)
+  n = A.shape[0]
+  pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+  sims = np.zeros(len(pairs))
+  if n == 0:
+    return sims
+  block_size = max(1, min(block_size, max_bytes // (2 * 2 * 8 * n)))
+  out_weights = np.asarray(A.sum(axis=1)).ravel()
+  dangling = np.flatnonzero(out_weights == 0)
+  scale = np.divide(1.0, out_weights, out=np.zeros(n), where=out_weights != 0)
+  # x_{t+1} = P^T x_t + sum(x_t[dangling]) / n for the stochastic matrix P.
+  PT = (scipy.sparse.diags(scale) @ A).T.tocsr()
+  for b in range(0, len(pairs), block_size):
+    block = pairs[b:b + block_size]
+    vertices, index = np.unique(block, return_inverse=True)
+    index = index.reshape(-1, 2)
+    X = np.zeros((n, len(vertices)))
+    X[vertices, np.arange(len(vertices))] = 1.0
+    active = np.arange(len(block))
+    for iter in range(max_iter):
+      Y = PT @ X
+      Y += X[dangling].sum(axis=0) / n
+      # The l1 change of each vector, computed in the buffer of X.
+      X -= Y
+      np.abs(X, out=X)
+      err = X.sum(axis=0)
+      X = Y
+      del Y
+      ends = index[active]
+      sims[b + active] += (alpha ** (iter + 1)) * column_dots(
+          X, ends[:, 0], ends[:, 1])
+      converged = (err[ends[:, 0]] < n * tol) & (err[ends[:, 1]] < n * tol)
+      active = active[~converged]
+      if len(active) == 0:
+        break
+      # Keep only the vectors of the pairs that have not converged.
+      used = np.unique(index[active])
+      if len(used) < X.shape[1]:
+        position = np.full(X.shape[1], -1)
+        position[used] = np.arange(len(used))
+        X = X[:, used]
+        index = position[index]
+  return sims
+
 def cosimrank(G, u, v, alpha=0.9, 
              max_iter=100, tol=1.0e-6, weight='weight'):
-  c = alpha
-  alpha = 1
   if len(G) == 0:
     return {}
-
-  if not G.is_directed():
-    D = G.to_directed()
+  nodes = list(G)
+  index = {node: i for i, node in enumerate(nodes)}
+  A = nx.to_scipy_sparse_array(G, nodelist=nodes, weight=weight, format="csr")
+  return float(cosimrank_pairs(A, [(index[u], index[v])], alpha=alpha,
+                               max_iter=max_iter, tol=tol)[0])
+
+# Bytes of text parsed at a time.
+CHUNK_BYTES = 64 << 20
+
+# Yields the whitespace-separated integers of reader as NumPy arrays, a
+# chunk at a time.  Raises ValueError at text that is not an integer.
+def parse_ints(reader):
+  def parse(block):
+    # fromstring only warns, and stops parsing, at text that is not an integer.
+    try:
+      with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        return np.fromstring(block, dtype=np.int64, sep=" ")
+    except (ValueError, DeprecationWarning):
+      raise ValueError("Malformed AdjacencyGraph: " + reader.name)
+  rest = b""
+  while True:
+    block = reader.read(CHUNK_BYTES)
+    if not block:
+      break
+    block = rest + block
+    end = max(block.rfind(b"\n"), block.rfind(b" "), block.rfind(b"\t")) + 1
+    rest = block[end:]
+    if end > 0:
+      yield parse(block[:end])
+  if rest.strip():
+    yield parse(rest)
+
+# Returns the offsets and edges of a graph in the AdjacencyGraph text format.
+def read_ligra_text(input_file):
+  with open(input_file, 'rb') as reader:
+    header = reader.readline().strip()
+    if header != b"AdjacencyGraph":
+      raise ValueError("Expected an unweighted AdjacencyGraph: " + input_file)
+    n = m = None
+    head = np.empty(0, dtype=np.int64)
+    filled = 0
+    # The values are n and m, then the n offsets, then the m edges.
+    for values in parse_ints(reader):
+      if n is None:
+        head = np.concatenate([head, values])
+        if len(head) < 2:
+          continue
+        n, m = int(head[0]), int(head[1])
+        values = head[2:]
+        offsets = np.empty(n + 1, dtype=np.uint64)
+        offsets[n] = m
+        edges = np.empty(m, dtype=np.uint32)
+      if filled + len(values) > n + m:
+        raise ValueError("Too many values in AdjacencyGraph: " + input_file)
+      take = min(len(values), max(n - filled, 0))
+      offsets[filled:filled + take] = values[:take]
+      if take < len(values):
+        start = filled + take - n
+        edges[start:start + len(values) - take] = values[take:]
+      filled += len(values)
+    if n is None or filled != n + m:
+      raise ValueError("Truncated AdjacencyGraph: " + input_file)
+  return offsets, edges
+
+# Returns the offsets and (out-)edges of an unweighted graph in the binary
+# format: the header n, m and the size of the section, the n + 1 offsets and
+# the m edges.  Directed graphs are followed by a section for the in-edges,
+# which is not read.  Graphs in the byte-compressed format (-c), which the GBBS
+# inputs use, are told apart by their sizes, as gbbs_lib does, and decoded by
+# read_ligra_compressed.
+def read_ligra_binary(input_file):
+  file_size = os.path.getsize(input_file)
+  with open(input_file, 'rb') as reader:
+    header = np.fromfile(reader, dtype=np.int64, count=3)
+    if len(header) < 3 or header.min() < 0:
+      raise ValueError("Unrecognized graph format: " + input_file)
+    n, m, size = (int(x) for x in header)
+    csr_size = 3 * 8 + 8 * (n + 1)
+    if size >= csr_size and file_size in (size, 2 * size):
+      if size != csr_size + 4 * m:
+        raise ValueError("Expected an unweighted binary graph: " + input_file)
+      offsets = np.fromfile(reader, dtype=np.uint64, count=n + 1)
+      edges = np.fromfile(reader, dtype=np.uint32, count=m)
+      return offsets, edges
+  if csr_size + 4 * n + size <= file_size:
+    return read_ligra_compressed(input_file)
+  raise ValueError("Unrecognized graph format: " + input_file)
+
+# Returns the offsets and (out-)edges of a graph in the byte-compressed format,
+# decoded by gbbs_lib.
+def read_ligra_compressed(input_file):
+  try:
+    import gbbs_lib  # Only needed here.
+  except ImportError:
+    raise ValueError("Reading a byte-compressed graph needs gbbs_lib: " +
+                     input_file)
+  handle = gbbs_lib.openGraph(input_file)
+  return (np.asarray(handle.offsets, dtype=np.uint64),
+          np.asarray(handle.neighbors, dtype=np.uint32))
+
+# Returns the CSR offsets and edges of the graph in input_file, in the text,
+# binary or byte-compressed format.  The arrays are cached in input_file.npz, which is used
+# while it is newer than input_file; a cache that fails to load is rewritten.
+def read_ligra_arrays(input_file):
+  cache_file = input_file + ".npz"
+  if (os.path.exists(cache_file) and
+      os.path.getmtime(cache_file) >= os.path.getmtime(input_file)):
+    try:
+      with np.load(cache_file) as cache:
+        return cache["offsets"], cache["edges"]
+    except (OSError, ValueError, KeyError, EOFError, zipfile.BadZipFile):
+      pass
+  with open(input_file, 'rb') as reader:
+    header = reader.read(len(b"WeightedAdjacencyGraph"))
+  if header.startswith(b"WeightedAdjacencyGraph"):
+    raise ValueError("Expected an unweighted AdjacencyGraph: " + input_file)
+  if header.startswith(b"AdjacencyGraph"):
+    offsets, edges = read_ligra_text(input_file)
   else:
-    D = G
-
-  # Create a copy in (right) stochastic form
-  W = nx.stochastic_graph(D, weight=weight)
-  N = W.number_of_nodes()
-
-  W_v = nx.stochastic_graph(D, weight=weight)
-  N_v = W.number_of_nodes()
-
-  x = dict.fromkeys(W, 0)
-  x[u] = 1
-  x_v = dict.fromkeys(W, 0)
-  x_v[v] = 1
-
-  p = dict.fromkeys(W, 1.0 / N)
-
-  p_v = dict.fromkeys(W, 1.0 / N)
-
-  dangling_weights = p
-  dangling_weights_v = p_v
-  dangling_nodes = [n for n in W if W.out_degree(n, weight=weight) == 0.0]
-  dangling_nodes_v = [n for n in W if W.out_degree(n, weight=weight) == 0.0]
-
-  sim = 0
-
-  # power iteration: make up to max_iter iterations
-  for iter in range(max_iter):
-    xlast = x
-    x = dict.fromkeys(xlast.keys(), 0)
-    danglesum = alpha * sum(xlast[n] for n in dangling_nodes)
-    for n in x:
-      for nbr in W[n]:
-        x[nbr] += alpha * xlast[n] * W[n][nbr][weight]
-      x[n] += danglesum * dangling_weights.get(n, 0) + (1.0 - alpha) * p.get(n, 0)
-    # check convergence, l1 norm
-    err = sum([abs(x[n] - xlast[n]) for n in x])
-    xlast_v = x_v
-    x_v = dict.fromkeys(xlast_v.keys(), 0)
-    danglesum_v = alpha * sum(xlast_v[n] for n in dangling_nodes_v)
-    for n in x_v:
-      # this matrix multiply looks odd because it is
-      # doing a left multiply x^T=xlast^T*W
-      for nbr in W_v[n]:
-        x_v[nbr] += alpha * xlast_v[n] * W_v[n][nbr][weight]
-      x_v[n] += danglesum_v * dangling_weights_v.get(n, 0) + (1.0 - alpha) * p_v.get(n, 0)
-    # check convergence, l1 norm
-    err_v = sum([abs(x_v[n] - xlast_v[n]) for n in x_v])
-    sim += (c ** (iter+1)) * sum(x_v[key]*x.get(key, 0) for key in x_v)
-    if err < N * tol and err_v < N_v * tol:
-      return sim
-  return sim
-
-
-
-
+    offsets, edges = read_ligra_binary(input_file)
+  # Write to a file of its own, so that concurrent runs do not collide.
+  try:
+    fd, tmp_file = tempfile.mkstemp(suffix=".npz",
+                                    dir=os.path.dirname(cache_file) or ".")
+  except OSError:
+    return offsets, edges
+  try:
+    with os.fdopen(fd, 'wb') as writer:
+      np.savez(writer, offsets=offsets, edges=edges)
+    os.replace(tmp_file, cache_file)
+  except OSError:
+    os.unlink(tmp_file)
+  return offsets, edges
+
+# Returns the source vertex of each edge.
+def edge_sources(offsets):
+  n = len(offsets) - 1
+  return np.repeat(np.arange(n, dtype=np.uint32),
+                   np.diff(offsets.astype(np.int64)))
+
+# Returns the adjacency matrix of the graph in input_file as a SciPy CSR
+# matrix with unit entries.
+def read_ligra_csr(input_file, dtype=np.float64):
+  import scipy.sparse  # Only needed here.
+  offsets, edges = read_ligra_arrays(input_file)
+  n, m = len(offsets) - 1, len(edges)
+  index_type = np.int32 if max(n, m) < 2**31 else np.int64
+  return scipy.sparse.csr_matrix(
+      (np.ones(m, dtype=dtype), edges.astype(index_type),
+       offsets.astype(index_type)), shape=(n, n))
+
+def ligra_arrays_to_nx(offsets, edges, G):
+  n = len(offsets) - 1
+  sources = edge_sources(offsets)
+  if not G.is_directed():
+    # Each undirected edge is stored in both directions; add it once.
+    keep = sources <= edges
+    sources, edges = sources[keep], edges[keep]
+  G.add_nodes_from(range(n))
+  G.add_edges_from(zip(sources.tolist(), edges.tolist()))
+  return G
 
 def read_ligra_symmetric_graph(input_file):
-  G = nx.Graph()
-  with open(input_file, 'r') as reader:
-    reader.readline() # Discard AdjacencyGraph
-    n = int(reader.readline())
-    m = int(reader.readline())
-    offsets = [None] * (n+1)
-    offsets[n] = m
-    edges = [(0, 0)] * m
-    G.add_nodes_from(range(n))
-    for i in range(n):
-      offsets[i] = int(reader.readline())
-    offsets_idx = 0
-    for i in range(m):
-      if offsets[offsets_idx + 1] == i:
-        offsets_idx+=1
-      edges[i] = (offsets_idx, int(reader.readline()))
-    G.add_edges_from(edges)
-  return G
+  return ligra_arrays_to_nx(*read_ligra_arrays(input_file), nx.Graph())
 
 def read_ligra_directed_graph(input_file):
-  G = nx.DiGraph()
-  with open(input_file, 'r') as reader:
-    reader.readline() # Discard AdjacencyGraph
-    n = int(reader.readline())
-    m = int(reader.readline())
-    offsets = [None] * (n+1)
-    offsets[n] = m
-    edges = [(0, 0)] * m
-    G.add_nodes_from(range(n))
-    for i in range(n):
-      offsets[i] = int(reader.readline())
-    offsets_idx = 0
-    for i in range(m):
-      if offsets[offsets_idx + 1] == i:
-        offsets_idx+=1
-      edges[i] = (offsets_idx, int(reader.readline()))
-    G.add_edges_from(edges)
-  return G
+  return ligra_arrays_to_nx(*read_ligra_arrays(input_file), nx.DiGraph())
 
 def TriangleCounting(G):
   print("Start TriangleCounting")
@@ -193,6 +330,15 @@ def ActualCoSimRank(G, u=0, v=1, importance_factor=0.85, max_iterations=100, tol
   print("Time: ", t1-t0)
   print("Similarity: ", similarity)
 
+def BatchCoSimRank(A, pairs, importance_factor=0.85, max_iterations=100, tolerance=0.000001):
+  print("Start BatchCoSimRank")
+  t0 = time.time()
+  similarities = cosimrank_pairs(A, pairs, alpha=importance_factor, max_iter=max_iterations, tol=tolerance)
+  t1 = time.time()
+  print("Time: ", t1-t0)
+  for (u, v), similarity in zip(pairs, similarities):
+    print("Similarity ", u, v, ": ", similarity)
+
 def CoSimRank(G, src=0, ngh=1, importance_factor=0.85, max_iterations=100, tolerance=0.000001):
   print("Start SimRank")
   t0 = time.time()
@@ -259,10 +405,16 @@ def main():
   argv_len = len(sys.argv)
   input_file = sys.argv[1] # First arg should be file name (ligra)
   symmetric = (sys.argv[2] == "s") # Second arg should be s or w/e for symmetric or not
-  all_programs = ["ActualCoSimRank","CoSimRank","CoSimRankNumpy","BFS", "MaximalMatching", "KCore", "PageRank", "CliqueCounting", "TriangleCounting", "GeneralWeightSSSP", "GraphColoring"]
+  all_programs = ["BatchCoSimRank","ActualCoSimRank","CoSimRank","CoSimRankNumpy","BFS", "MaximalMatching", "KCore", "PageRank", "CliqueCounting", "TriangleCounting", "GeneralWeightSSSP", "GraphColoring"]
+  program_str = sys.argv[3] # Third arg should be name of benchmark
+  if program_str == "BatchCoSimRank":
+    # Runs on the adjacency matrix, without building a NetworkX graph; the
+    # remaining args are the pairs, as u v u v ...
+    ids = [int(x) for x in sys.argv[4:]] or [0, 1]
+    BatchCoSimRank(read_ligra_csr(input_file), list(zip(ids[::2], ids[1::2])))
+    return
   # use read edge list for snap format (TODO)
   G = read_ligra_symmetric_graph(input_file) if symmetric else read_ligra_directed_graph(input_file)
-  program_str = sys.argv[3] # Third arg should be name of benchmark
   program_parser(G, program_str)
 
 
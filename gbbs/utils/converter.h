@@ -312,7 +312,7 @@ void write_graph_bytepd_format(Graph& GA, std::ofstream& out, bool symmetric,
   // 2. Create compressed format in-memory
   size_t bs = parlay::num_blocks(n, n_batches);
 
-  for (size_t i = 0; i < bs; i++) {
+  for (size_t i = 0; i < n_batches; i++) {
     size_t start = i * bs;
     size_t end = std::min(start + bs, n);
     if (start >= end) break;
@@ -460,7 +460,7 @@ void degree_reorder(Graph& GA, std::ofstream& out, bool symmetric,
 
   size_t bs = parlay::num_blocks(n, n_batches);
 
-  for (size_t i = 0; i < bs; i++) {
+  for (size_t i = 0; i < n_batches; i++) {
     size_t start = i * bs;
     size_t end = std::min(start + bs, n);
     if (start >= end) break;
@@ -734,7 +734,7 @@ void write_graph_bytepd_amortized_format(Graph& GA, std::ofstream& out,
   // 2. Create compressed format in-memory
   size_t bs = parlay::num_blocks(n, n_batches);
 
-  for (size_t i = 0; i < bs; i++) {
+  for (size_t i = 0; i < n_batches; i++) {
     size_t start = i * bs;
     size_t end = std::min(start + bs, n);
     if (start >= end) break;
@@ -886,7 +886,7 @@ void degree_reorder(Graph& GA, std::ofstream& out, bool symmetric,
 
   size_t bs = parlay::num_blocks(n, n_batches);
 
-  for (size_t i = 0; i < bs; i++) {
+  for (size_t i = 0; i < n_batches; i++) {
     size_t start = i * bs;
     size_t end = std::min(start + bs, n);
     if (start >= end) break;
@@ -0,0 +1,235 @@
+// Relabels the vertices of a graph to change its memory locality, and writes
+// the relabeled graph in the adjacency graph format.
+//
+// Usage: ./reorder [-s] [-c] [-m] -order <order> -of <output file> <input file>
+//
+// Orders:
+//   random: a uniformly random permutation of the vertices.
+//   degree: vertices sorted by decreasing degree.
+//   bfs: the order in which a breadth-first search visits the vertices,
+//     starting each connected component at its vertex of highest degree.
+//   rcm: the reverse Cuthill-McKee order, which visits the vertices of each
+//     connected component breadth-first from a vertex of lowest degree,
+//     visiting the neighbors of each vertex in order of increasing degree, and
+//     reverses the result.
+//   community: vertices grouped by the communities found by label
+//     propagation, in the order in which a breadth-first search reaches each
+//     community, and in breadth-first order within each community, so that
+//     vertices that share many neighbors get nearby labels.
+#include <stdlib.h>
+#include <algorithm>
+#include <fstream>
+#include <iostream>
+#include <vector>
+
+#include "gbbs/gbbs.h"
+
+namespace gbbs {
+namespace reorder {
+
+// Get the neighbors of vertex v.
+template <class Graph>
+std::vector<uintE> neighbors(Graph& GA, uintE v) {
+  using W = typename Graph::weight_type;
+  std::vector<uintE> nghs;
+  nghs.reserve(GA.get_vertex(v).out_degree());
+  auto map_f = [&](const uintE& src, const uintE& ngh, const W& wgh) {
+    nghs.push_back(ngh);
+  };
+  GA.get_vertex(v).out_neighbors().map(map_f, false);
+  return nghs;
+}
+
+// Visit the vertices breadth-first, starting each connected component at
+// the unvisited vertex that comes first in `starts`.  If `by_degree` is set,
+// the neighbors of each vertex are visited in order of increasing degree.
+// Returns the vertices in the order visited.
+template <class Graph>
+std::vector<uintE> bfs_order(Graph& GA, const std::vector<uintE>& starts,
+                             bool by_degree) {
+  size_t n = GA.n;
+  std::vector<uintE> order;
+  order.reserve(n);
+  std::vector<bool> visited(n, false);
+  for (uintE s : starts) {
+    if (visited[s]) continue;
+    visited[s] = true;
+    size_t head = order.size();
+    order.push_back(s);
+    while (head < order.size()) {
+      uintE v = order[head++];
+      auto nghs = neighbors(GA, v);
+      if (by_degree) {
+        std::stable_sort(nghs.begin(), nghs.end(), [&](uintE a, uintE b) {
+          return GA.get_vertex(a).out_degree() < GA.get_vertex(b).out_degree();
+        });
+      }
+      for (uintE u : nghs) {
+        if (!visited[u]) {
+          visited[u] = true;
+          order.push_back(u);
+        }
+      }
+    }
+  }
+  return order;
+}
+
+// Get the vertices sorted by degree, in decreasing order if `decreasing` is
+// set and in increasing order otherwise.  Ties are broken by vertex id.
+template <class Graph>
+std::vector<uintE> degree_order(Graph& GA, bool decreasing) {
+  std::vector<uintE> order(GA.n);
+  for (size_t i = 0; i < GA.n; i++) order[i] = i;
+  std::stable_sort(order.begin(), order.end(), [&](uintE a, uintE b) {
+    size_t da = GA.get_vertex(a).out_degree();
+    size_t db = GA.get_vertex(b).out_degree();
+    return decreasing ? da > db : da < db;
+  });
+  return order;
+}
+
+// Find communities by label propagation: each vertex repeatedly adopts the
+// most frequent label among its neighbors, for the given number of rounds.
+// Returns the label of each vertex.
+template <class Graph>
+std::vector<uintE> label_propagation(Graph& GA, const std::vector<uintE>& order,
+                                     size_t rounds) {
+  size_t n = GA.n;
+  std::vector<uintE> label(n);
+  for (size_t i = 0; i < n; i++) label[i] = i;
+  std::vector<uintE> count(n, 0);
+  for (size_t r = 0; r < rounds; r++) {
+    size_t changed = 0;
+    for (uintE v : order) {
+      auto nghs = neighbors(GA, v);
+      if (nghs.empty()) continue;
+      uintE best = label[v];
+      uintE best_count = 0;
+      for (uintE u : nghs) {
+        uintE c = ++count[label[u]];
+        if (c > best_count || (c == best_count && label[u] < best)) {
+          best = label[u];
+          best_count = c;
+        }
+      }
+      for (uintE u : nghs) count[label[u]] = 0;
+      if (best != label[v]) {
+        label[v] = best;
+        changed++;
+      }
+    }
+    std::cout << "# label propagation round " << r << ": " << changed
+              << " labels changed" << std::endl;
+    if (changed == 0) break;
+  }
+  return label;
+}
+
+// Get the vertices grouped by community, with the communities in the order in
+// which the breadth-first order `bfs` reaches them, and the vertices of each
+// community in breadth-first order.
+template <class Graph>
+std::vector<uintE> community_order(Graph& GA, const std::vector<uintE>& bfs,
+                                   size_t rounds) {
+  size_t n = GA.n;
+  auto label = label_propagation(GA, bfs, rounds);
+  std::vector<uintE> rank(n, UINT_E_MAX);
+  uintE next_rank = 0;
+  for (uintE v : bfs) {
+    if (rank[label[v]] == UINT_E_MAX) rank[label[v]] = next_rank++;
+  }
+  std::vector<uintE> order(bfs);
+  std::stable_sort(order.begin(), order.end(), [&](uintE a, uintE b) {
+    return rank[label[a]] < rank[label[b]];
+  });
+  return order;
+}
+
+// Write GA to outfile in the adjacency graph format, relabeling each vertex v
+// as perm[v].
+template <class Graph>
+void write_permuted_graph(Graph& GA, const sequence<uintE>& perm,
+                          std::string& outfile) {
+  using W = typename Graph::weight_type;
+  size_t n = GA.n;
+  size_t m = GA.m;
+
+  auto edges = sequence<uintE>(m);
+  auto offs = sequence<uintT>(n);
+  parallel_for(
+      0, n, [&](size_t i) { offs[perm[i]] = GA.get_vertex(i).out_degree(); });
+  size_t tot = parlay::scan_inplace(make_slice(offs));
+  std::cout << "# m = " << m << " tot = " << tot << std::endl;
+
+  parallel_for(0, n, [&](size_t i) {
+    size_t off = offs[perm[i]];
+    size_t next_off = (perm[i] == (n - 1)) ? m : offs[perm[i] + 1];
+    auto map_f = [&](const uintE& src, const uintE& ngh, const W& wgh) {
+      edges[off++] = perm[ngh];
+    };
+    GA.get_vertex(i).out_neighbors().map(map_f, false);
+    std::sort(edges.begin() + offs[perm[i]], edges.begin() + next_off,
+              std::less<uintE>());
+  });
+
+  std::ofstream file(outfile, std::ios::out | std::ios::binary);
+  if (!file.is_open()) {
+    std::cout << "Unable to open file: " << outfile << std::endl;
+    exit(1);
+  }
+  file << "AdjacencyGraph" << std::endl;
+  file << n << std::endl;
+  file << m << std::endl;
+  auto off_chars = parlay::sequence_to_string(offs);
+  auto edges_chars = parlay::sequence_to_string(edges);
+  file.write(off_chars.begin(), off_chars.size());
+  file.write(edges_chars.begin(), edges_chars.size());
+
+  file.close();
+  std::cout << "# Done" << std::endl;
+}
+
+}  // namespace reorder
+
+template <class Graph>
+double Reorderer(Graph& GA, commandLine P) {
+  auto outfile = P.getOptionValue("-of", "");
+  auto order_name = P.getOptionValue("-order", "random");
+  size_t rounds = P.getOptionLongValue("-lp_rounds", 10);
+  if (outfile == "") {
+    std::cout << "# specify a valid outfile using -of" << std::endl;
+    exit(1);
+  }
+
+  size_t n = GA.n;
+  sequence<uintE> perm;
+  if (order_name == "random") {
+    perm = parlay::random_permutation<uintE>(n);
+  } else {
+    std::vector<uintE> order;
+    if (order_name == "degree") {
+      order = reorder::degree_order(GA, true);
+    } else if (order_name == "bfs") {
+      order = reorder::bfs_order(GA, reorder::degree_order(GA, true), false);
+    } else if (order_name == "rcm") {
+      order = reorder::bfs_order(GA, reorder::degree_order(GA, false), true);
+      std::reverse(order.begin(), order.end());
+    } else if (order_name == "community") {
+      auto bfs = reorder::bfs_order(GA, reorder::degree_order(GA, true), false);
+      order = reorder::community_order(GA, bfs, rounds);
+    } else {
+      std::cout << "# Unknown order: " << order_name << std::endl;
+      exit(1);
+    }
+    // order lists the vertices by their new labels; invert it.
+    perm = sequence<uintE>(n);
+    parallel_for(0, n, [&](size_t i) { perm[order[i]] = i; });
+  }
+  reorder::write_permuted_graph(GA, perm, outfile);
+  exit(0);
+  return 1.0;
+}
+}  // namespace gbbs
+
+generate_main(gbbs::Reorderer, false);
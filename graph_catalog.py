@@ -0,0 +1,380 @@
+###########################################################################
+### graph_catalog.py: Methods for naming and preparing the graph inputs
+### of the GBBS benchmarks.
+###
+### A graph in the catalog is one of:
+###
+### - one of the named graphs that are distributed, compressed, in
+###   gbbs/inputs;
+###
+### - a synthetic graph generated locally by the generators in
+###   gbbs/utils/generators:
+###
+###   - 'rmat<S>' - An RMAT graph with 2^S vertices and 16 * 2^S edges.
+###     Use 'rmat<S>e<F>' for an edge factor of F instead of 16.
+###
+###   - 'ba<N>m<M>' - A Barabasi-Albert graph with N vertices, in which
+###     each vertex attaches M edges; or
+###
+### - a graph file, registered as '<name>=<path>', which is either an
+###   edge list, e.g., from SNAP, or a Ligra adjacency graph; or
+###
+### - a reordered graph, '<graph>.<order>', whose vertices are those of
+###   another graph in the catalog relabeled by gbbs/utils/reorder in
+###   one of graph_orders, to study the effect of locality.
+###
+### Each graph can be prepared in three formats: the text adjacency
+### graph ('text'), the binary CSR graph ('binary'), and the
+### byte-compressed graph ('compressed').  Edge lists are converted into
+### symmetric adjacency graphs with snap_converter, adjacency graphs
+### into binary graphs with converter, and into compressed graphs with
+### compressor.  The results are cached in catalog_dir, in files named
+### by a hash of the parameters of a synthetic graph or of the contents
+### of the file the graph is converted from, so that each graph is only
+### converted once.  The cache can be kept within a disk budget by
+### evicting the least recently used files.
+###########################################################################
+
+import hashlib
+import json
+import logging
+import os
+import re
+import subprocess
+
+from runner import run_command
+
+logger = logging.getLogger(__name__)
+
+gbbs_dir = "gbbs"
+catalog_dir = os.path.join(gbbs_dir, "inputs", "catalog")
+# Index of the content hashes of the files converted into the catalog,
+# to avoid rehashing files that have not changed.
+hash_index = os.path.join(catalog_dir, "hashes.json")
+
+# Graphs distributed in gbbs/inputs, mapped to the path of the graph
+# without its extension.  Their compressed graph is distributed, and
+# their text graph must be placed next to it to be used.
+named_graphs = {'orkut': os.path.join(gbbs_dir, "inputs", "com-orkut"),
+                'livejournal': os.path.join(gbbs_dir, "inputs", "soc-LiveJournal1")}
+
+# Graph files registered by name, mapped to their paths.
+graph_files = dict()
+
+# Default number of edges per vertex of an RMAT graph, as in Graph500.
+rmat_edge_factor = 16
+
+# Formats in which graphs are prepared, mapped to their extensions.
+graph_formats = {'text': ".adj", 'binary': ".csr", 'compressed': ".bin"}
+
+# Bazel targets of the tools used to generate and convert graphs,
+# relative to gbbs_dir.
+graph_tools = {'RMAT': "utils/generators:RMAT",
+               'BarabasiAlbert': "utils/generators:BarabasiAlbert",
+               'snap_converter': "utils:snap_converter",
+               'converter': "utils:converter",
+               'compressor': "utils:compressor",
+               'reorder': "utils:reorder"}
+
+# Orders in which the vertices of a graph can be relabeled.  The
+# 'original' order keeps the labels of the graph.
+graph_orders = ['original', 'random', 'degree', 'bfs', 'rcm', 'community']
+
+# Get the path of the binary of the given graph tool.
+def graph_tool_exe(tool):
+    return os.path.join(gbbs_dir, "bazel-bin", re.sub(':','/',graph_tools[tool]))
+
+# Get the name of the given graph with its vertices relabeled in the
+# given order.
+def reordered_graph_name(name, order):
+    if order == 'original':
+        return name
+    return name+"."+order
+
+# Split the name of a graph into the name of the graph it is reordered
+# from and its order.
+def split_graph_name(name):
+    base, sep, order = name.partition('.')
+    if not sep:
+        return (name, 'original')
+    return (base, order)
+
+# Parse the name of a graph in the catalog.  Returns a dictionary of
+# the parameters of the graph, whose 'generator' entry is None for
+# named graphs and graph files, and 'reorder' for reordered graphs.
+# Raises ValueError if the name is not the name of a graph in the
+# catalog.
+def parse_graph_name(name):
+    base, order = split_graph_name(name)
+    if base != name:
+        if order not in graph_orders[1:]:
+            raise ValueError("unknown order '"+order+"' of graph '"+name+"'")
+        parse_graph_name(base)
+        return {'generator': 'reorder', 'graph': base, 'order': order}
+    if name in named_graphs or name in graph_files:
+        return {'generator': None}
+    m = re.fullmatch(r"rmat(\d+)(?:e(\d+))?", name)
+    if m:
+        scale = int(m.group(1))
+        edge_factor = rmat_edge_factor if m.group(2) is None else int(m.group(2))
+        if scale < 1 or scale > 40 or edge_factor < 1:
+            raise ValueError("invalid RMAT graph '"+name+"'")
+        return {'generator': 'RMAT', 'n': 1 << scale, 'm': edge_factor << scale,
+                'a': 0.5, 'b': 0.1, 'c': 0.1}
+    m = re.fullmatch(r"ba(\d+)m(\d+)", name)
+    if m:
+        if int(m.group(1)) < 1 or int(m.group(2)) < 1:
+            raise ValueError("invalid Barabasi-Albert graph '"+name+"'")
+        return {'generator': 'BarabasiAlbert', 'n': int(m.group(1)),
+                'edges_per_vertex': int(m.group(2))}
+    raise ValueError("unknown graph '"+name+"'")
+
+# Register the graph file at path under the given name.
+def register_graph_file(name, path):
+    if not re.fullmatch(r"[A-Za-z0-9_]+", name):
+        raise ValueError("invalid graph name '"+name+"': use only letters, digits, and underscores")
+    if name in named_graphs:
+        raise ValueError("graph name '"+name+"' is already used")
+    if not os.path.isfile(path):
+        raise ValueError("graph file '"+path+"' not found")
+    graph_files[name] = path
+
+# Expand a comma-separated list of graph names into a list of names.
+# A range of RMAT scales can be given as 'rmat<S1>:<S2>', and a graph
+# file can be registered as '<name>=<path>'.
+def expand_graph_names(spec):
+    names = []
+    for name in spec.split(','):
+        m = re.fullmatch(r"rmat(\d+):(\d+)((?:e\d+)?)", name)
+        if m:
+            names += ["rmat"+str(s)+m.group(3) for s in range(int(m.group(1)), int(m.group(2))+1)]
+        elif '=' in name:
+            name, path = name.split('=', 1)
+            register_graph_file(name, path)
+            names.append(name)
+        else:
+            parse_graph_name(name)
+            names.append(name)
+    return names
+
+# Get a hash of the parameters of a graph, to name its cached files.
+def graph_hash(params):
+    return hashlib.sha256(json.dumps(params, sort_keys=True).encode()).hexdigest()[:16]
+
+# Get a hash of the contents of the file at path, to name the files
+# converted from it.  Hashes are saved in hash_index, and recomputed
+# only if the size or modification time of the file changes.
+def file_hash(path):
+    index = dict()
+    if os.path.exists(hash_index):
+        with open(hash_index, "r") as f:
+            index = json.load(f)
+    key = os.path.abspath(path)
+    st = os.stat(path)
+    entry = index.get(key)
+    if entry is not None and entry["size"] == st.st_size and entry["mtime_ns"] == st.st_mtime_ns:
+        return entry["hash"]
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    index[key] = {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "hash": h.hexdigest()[:16]}
+    if not os.path.exists(catalog_dir):
+        os.makedirs(catalog_dir)
+    with open(hash_index, "w") as f:
+        json.dump(index, f, indent=1)
+    return index[key]["hash"]
+
+# Returns True if the graph file at path is a Ligra adjacency graph,
+# False if it is an edge list.
+def is_adjacency_graph(path):
+    with open(path, "rb") as f:
+        return f.readline().strip() in (b"AdjacencyGraph", b"WeightedAdjacencyGraph")
+
+# Get the path of the file from which the given graph is converted,
+# or None if the graph is generated.
+def get_graph_source(name):
+    if name in named_graphs:
+        return named_graphs[name]+graph_formats['compressed']
+    return graph_files.get(name)
+
+# Get the key that names the cached files of the given graph: a hash
+# of the file it is converted from, or of its parameters.  A named
+# graph is hashed from its compressed graph, or its text graph if only
+# that is present.  A reordered graph is keyed by the key of the graph
+# it is reordered from and its order.
+def graph_key(name):
+    params = parse_graph_name(name)
+    if params['generator'] == 'reorder':
+        return graph_hash({'graph': graph_key(params['graph']), 'order': params['order']})
+    source = get_graph_source(name)
+    if name in named_graphs and not os.path.exists(source):
+        source = named_graphs[name]+graph_formats['text']
+        if not os.path.exists(source):
+            return graph_hash({'name': name})
+    if source is None:
+        return graph_hash(params)
+    return file_hash(source)
+
+# Get the path of the given graph in the given format.
+def get_graph_path(name, fmt):
+    source = get_graph_source(name)
+    if name in named_graphs and (fmt != 'binary' or not os.path.exists(source)):
+        return named_graphs[name]+graph_formats[fmt]
+    if name in graph_files and fmt == 'text' and is_adjacency_graph(source):
+        return source
+    return os.path.join(catalog_dir, name+"-"+graph_key(name)+graph_formats[fmt])
+
+# Returns True if the given graph is missing in any of the given
+# formats.
+def graph_missing(name, fmts):
+    return not all([os.path.exists(get_graph_path(name, fmt)) for fmt in fmts])
+
+# Run the given command, and raise CalledProcessError if it does not
+# create the file out_path.
+def run_graph_tool(cmd, out_path):
+    logger.info(cmd)
+    out,err = run_command(cmd)
+    if not os.path.exists(out_path):
+        raise subprocess.CalledProcessError(1, cmd, out, err)
+
+# Build the graph tools with bazel, using the given bazel
+# configuration.
+def build_graph_tools(bazel_config):
+    cmd = "cd "+gbbs_dir+" && bazel build "+bazel_config+" "+ \
+        " ".join(["//"+target for target in graph_tools.values()])
+    logger.info(cmd)
+    out,err = run_command(cmd)
+    for tool in graph_tools:
+        if not os.path.exists(graph_tool_exe(tool)):
+            raise subprocess.CalledProcessError(1, cmd, out, err)
+
+# Convert a graph into out_path with the given command, which writes
+# the file given to it.  The file is written under a temporary name
+# and renamed once it is complete, so that incomplete files are never
+# cached.
+def convert_graph(cmd, out_path):
+    tmp_path = out_path+".tmp"
+    run_graph_tool(cmd.format(out=tmp_path), tmp_path)
+    os.rename(tmp_path, out_path)
+
+# Prepare the text graph of the given reordered graph by relabeling
+# the vertices of the graph it is reordered from, which is prepared
+# first if needed.  Named graphs are relabeled from their compressed
+# graph if it is present.
+def prepare_reordered_graph(name, adj, bazel_config):
+    params = parse_graph_name(name)
+    base = params['graph']
+    fmt = 'text'
+    if base in named_graphs and os.path.exists(get_graph_source(base)):
+        fmt = 'compressed'
+    prepare_graph(base, [fmt], bazel_config)
+    logger.info("Reordering graph '"+base+"' in "+params['order']+" order.")
+    convert_graph(graph_tool_exe('reorder')+" -s"+(" -c" if fmt == 'compressed' else "")+
+                  " -rounds 1 -order "+params['order']+" -of {out} "+get_graph_path(base, fmt), adj)
+
+# Prepare the text graph of the given graph, which is not a named
+# graph, by generating it, converting its edge list, or reordering
+# another graph.
+def prepare_text_graph(name, adj, bazel_config):
+    source = get_graph_source(name)
+    params = parse_graph_name(name)
+    if params['generator'] == 'reorder':
+        prepare_reordered_graph(name, adj, bazel_config)
+    elif source is None:
+        logger.info("Generating graph '"+name+"'.")
+        source = os.path.splitext(adj)[0]+".edges"
+        if params['generator'] == 'RMAT':
+            run_graph_tool(graph_tool_exe('RMAT')+" -n "+str(params['n'])+" -m "+str(params['m'])+
+                           " -a "+str(params['a'])+" -b "+str(params['b'])+" -c "+str(params['c'])+
+                           " -outfile "+source, source)
+        else:
+            run_graph_tool(graph_tool_exe('BarabasiAlbert')+" -n "+str(params['n'])+
+                           " -edges_per_vertex "+str(params['edges_per_vertex'])+
+                           " -outfile "+source, source)
+    if params['generator'] != 'reorder':
+        convert_graph(graph_tool_exe('snap_converter')+" -s -i "+source+" -o {out}", adj)
+        if get_graph_source(name) is None:
+            os.remove(source)
+    with open(os.path.splitext(adj)[0]+".json", "w") as f:
+        json.dump(dict(params, name=name, source=get_graph_source(name)), f, indent=1)
+
+# Prepare the given graph in each of the given formats, unless it is
+# cached.  The graph tools are built, if needed, with the given bazel
+# configuration.  Raises CalledProcessError if a tool fails.
+def prepare_graph(name, fmts, bazel_config):
+    if not graph_missing(name, fmts):
+        return
+    if not all([os.path.exists(graph_tool_exe(tool)) for tool in graph_tools]):
+        build_graph_tools(bazel_config)
+    if not os.path.exists(catalog_dir):
+        os.makedirs(catalog_dir)
+
+    # Named graphs are distributed compressed, and are converted into
+    # binary graphs from the compressed graph.
+    if name in named_graphs:
+        for fmt in fmts:
+            path = get_graph_path(name, fmt)
+            if os.path.exists(path):
+                continue
+            if fmt == 'binary' and os.path.exists(get_graph_source(name)):
+                logger.info("Converting graph '"+name+"' into "+path+".")
+                convert_graph(graph_tool_exe('converter')+" -s -c -rounds 1 -enc binary -o {out} "+
+                              get_graph_source(name), path)
+            else:
+                logger.warning("Graph '"+name+"' has no "+fmt+" form: "+path+" not found.")
+        return
+
+    # Other graphs are converted from their text graph.
+    adj = get_graph_path(name, 'text')
+    if not os.path.exists(adj):
+        prepare_text_graph(name, adj, bazel_config)
+    for fmt in fmts:
+        path = get_graph_path(name, fmt)
+        if os.path.exists(path):
+            continue
+        logger.info("Converting graph '"+name+"' into "+path+".")
+        if fmt == 'binary':
+            convert_graph(graph_tool_exe('converter')+" -s -rounds 1 -enc binary -o {out} "+adj, path)
+        else:
+            convert_graph(graph_tool_exe('compressor')+" -s -rounds 1 -o {out} "+adj, path)
+
+# Mark the given files in the catalog as used, for eviction.
+def touch_graph_files(paths):
+    for path in paths:
+        if os.path.exists(path):
+            os.utime(path)
+
+# Evict the least recently used graph files from the catalog until the
+# catalog uses at most budget bytes.  Files in keep are not evicted.
+# Returns the list of evicted files.
+def evict_graphs(budget, keep=[]):
+    if not os.path.isdir(catalog_dir):
+        return []
+    keep = set([os.path.abspath(p) for p in keep])
+    files = []
+    for f in os.listdir(catalog_dir):
+        path = os.path.join(catalog_dir, f)
+        if os.path.splitext(f)[1] in graph_formats.values() and os.path.isfile(path):
+            st = os.stat(path)
+            files.append((st.st_mtime, st.st_size, path))
+    total = sum([size for (mtime, size, path) in files])
+    evicted = []
+    for (mtime, size, path) in sorted(files):
+        if total <= budget:
+            break
+        if os.path.abspath(path) in keep:
+            continue
+        logger.info("Evicting "+path+" from the graph catalog.")
+        os.remove(path)
+        evicted.append(path)
+        total -= size
+        # Remove the description of the graph with its last file.
+        stem = os.path.splitext(path)[0]
+        if not any([os.path.exists(stem+ext) for ext in graph_formats.values()]) and \
+           os.path.exists(stem+".json"):
+            os.remove(stem+".json")
+    if total > budget:
+        logger.warning("The graph catalog uses {:0.2f} GB, over its budget of {:0.2f} GB.".format(
+            total / 1e9, budget / 1e9))
+    return evicted
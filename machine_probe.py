@@ -0,0 +1,210 @@
+###########################################################################
+### machine_probe.py: Methods for characterizing the host that runs the
+### tests, in order to normalize performance results.
+###
+### The probe, in the probe/ directory, measures:
+###
+### - the bandwidth of a STREAM triad on each CPU count, using the same
+###   CPUs, in the same order, as the tests;
+###
+### - the latency of dependent loads with working sets that fit in
+###   each level of the cache hierarchy, and in main memory; and
+###
+### - the peak rate of fused multiply-add operations of one core, in
+###   double and in single precision.
+###
+### Results are cached in a JSON file named by the fingerprint of the
+### host, so that each host is only probed once.
+###########################################################################
+
+import json
+import logging
+import os
+import subprocess
+
+from runner import run_command, run_on_p_workers, get_host_fingerprint
+
+logger = logging.getLogger(__name__)
+
+probe_dir = "probe"
+probe_exe = os.path.join(probe_dir, "probe")
+
+# Working-set size used to measure the latency of main memory, relative
+# to the size of the last-level cache.
+memory_latency_factor = 4
+# Largest fraction of physical memory that the probe may use.
+max_memory_fraction = 0.25
+# Smallest size of each array used to measure the bandwidth of main
+# memory, in MiB.
+min_stream_mib = 64
+# Number of times to repeat the STREAM triad.  The fastest repetition
+# is reported.
+stream_reps = 10
+# Number of iterations of the FMA loop.
+fma_iterations = 200000000
+
+# Build the probe with the given C compiler.
+def build_probe(cc):
+    out,err = run_command("make -C "+probe_dir+" clean; make -C "+probe_dir+" CC="+cc)
+    if not os.path.exists(probe_exe):
+        raise subprocess.CalledProcessError(1, "make -C "+probe_dir, out, err)
+
+# Parse a size from sysfs, such as "48K", into a number of bytes.
+def parse_cache_size(size):
+    size = size.strip()
+    units = {'K': 1024, 'M': 1024*1024, 'G': 1024*1024*1024}
+    if size and size[-1] in units:
+        return int(size[:-1]) * units[size[-1]]
+    return int(size)
+
+# Get the sizes, in bytes, of the data caches of CPU 0.  Returns a
+# list of tuples (level, bytes), sorted by level.  Returns a typical
+# cache hierarchy if the sizes cannot be read.
+def get_cache_sizes():
+    caches = []
+    cache_dir = "/sys/devices/system/cpu/cpu0/cache"
+    if os.path.isdir(cache_dir):
+        for index in sorted(os.listdir(cache_dir)):
+            path = os.path.join(cache_dir, index)
+            try:
+                with open(os.path.join(path, "type"), "r") as f:
+                    cache_type = f.read().strip()
+                with open(os.path.join(path, "level"), "r") as f:
+                    level = int(f.read())
+                with open(os.path.join(path, "size"), "r") as f:
+                    size = parse_cache_size(f.read())
+            except (OSError, ValueError):
+                continue
+            if cache_type != "Instruction":
+                caches.append((level, size))
+    if not caches:
+        caches = [(1, 32*1024), (2, 1024*1024), (3, 32*1024*1024)]
+    return sorted(caches)
+
+# Get the number of bytes of physical memory the probe may use.
+def get_memory_limit():
+    try:
+        return int(os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') * max_memory_fraction)
+    except (ValueError, OSError):
+        return 1024*1024*1024
+
+# Get the working-set sizes at which to measure load latency.  Returns
+# a list of tuples (name, bytes).  Each cache level is measured with
+# a working set half its size, and main memory with a working set
+# much larger than the last-level cache.
+def get_latency_working_sets():
+    caches = get_cache_sizes()
+    sets = [("L"+str(level), size // 2) for (level, size) in caches]
+    sets.append(("memory", min(caches[-1][1] * memory_latency_factor, get_memory_limit())))
+    return sets
+
+# Get the size of each array of the STREAM triad, in MiB, such that
+# each array is at least 4 times the size of the last-level caches of
+# all sockets, if memory permits.
+def get_stream_mib(nsockets):
+    llc = get_cache_sizes()[-1][1]
+    mib = max(min_stream_mib, 4 * llc * nsockets // (1024*1024))
+    return min(mib, get_memory_limit() // (3*1024*1024))
+
+# Parse the lines of output of the probe that start with key.  Returns
+# a list of the remaining fields of those lines.
+def parse_probe_output(out, key):
+    fields = []
+    for l in str(out, 'utf-8').splitlines():
+        items = l.split()
+        if items and items[0] == key:
+            fields.append(items[1:])
+    return fields
+
+# Measure the bandwidth of the STREAM triad, in GB/s, on P CPUs.
+def probe_bandwidth(P, nsockets):
+    cmd = probe_exe+" stream "+str(P)+" "+str(get_stream_mib(nsockets))+" "+str(stream_reps)
+    out,err = run_on_p_workers(P, 1, cmd)
+    fields = parse_probe_output(bytes(out, 'utf-8'), "stream")
+    if not fields:
+        raise RuntimeError("Failed to measure bandwidth on "+str(P)+" cpus: "+err)
+    return float(fields[0][1])
+
+# Measure the load latency, in ns, for each level of the memory
+# hierarchy on one CPU.  Returns a list of dictionaries.
+def probe_latency():
+    sets = get_latency_working_sets()
+    cmd = probe_exe+" latency "+" ".join([str(size) for (name, size) in sets])
+    out,err = run_on_p_workers(1, 1, cmd)
+    fields = parse_probe_output(bytes(out, 'utf-8'), "latency")
+    if len(fields) != len(sets):
+        raise RuntimeError("Failed to measure load latency: "+err)
+    return [{"level": name, "bytes": size, "ns": float(f[1])}
+            for ((name, size), f) in zip(sets, fields)]
+
+# Measure the peak FMA rate of one core, in GFLOP/s.  Returns a
+# dictionary mapping each precision, 'double' and 'single', to its rate.
+def probe_fma():
+    out,err = run_on_p_workers(1, 1, probe_exe+" fma "+str(fma_iterations))
+    fields = parse_probe_output(bytes(out, 'utf-8'), "fma")
+    rates = dict([(f[0], float(f[1])) for f in fields if len(f) == 2])
+    if 'double' not in rates or 'single' not in rates:
+        raise RuntimeError("Failed to measure the FMA peak: "+err)
+    return rates
+
+# Get the name of the file caching the probe results for this host.
+def probe_cache_name(cache_dir, host=None):
+    if host is None:
+        host = get_host_fingerprint()
+    return os.path.join(cache_dir, "probe-"+host["hash"]+".json")
+
+# Load cached probe results from the given path, or None if there are
+# none.  CPU counts are converted back into integers.
+def load_probe(path):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        result = json.load(f)
+    result["bandwidth"] = dict([(int(P), bw) for (P, bw) in result["bandwidth"].items()])
+    return result
+
+# Get the probe results for this host, measuring the bandwidth on each
+# CPU count in cpu_counts that is not already cached in cache_dir.
+# The probe is built with the C compiler cc if needed.
+def get_host_probe(cache_dir, cpu_counts, cc="clang"):
+    host = get_host_fingerprint()
+    path = probe_cache_name(cache_dir, host)
+    result = load_probe(path)
+    if result is None:
+        result = {"host": host, "bandwidth": dict()}
+    missing = [P for P in cpu_counts if P not in result["bandwidth"]]
+    # Probes before the single-precision peak was measured cached only
+    # the double-precision peak.
+    if not isinstance(result.get("fma"), dict):
+        result.pop("fma", None)
+    if not missing and "latency" in result and "fma" in result:
+        return result
+
+    if not os.path.exists(probe_exe):
+        build_probe(cc)
+    logger.info("Probing host "+host["hash"]+".")
+    nsockets = len(host["cores per socket"])
+    if "fma" not in result:
+        result["fma"] = probe_fma()
+    if "latency" not in result:
+        result["latency"] = probe_latency()
+    for P in missing:
+        result["bandwidth"][P] = probe_bandwidth(P, nsockets)
+        logger.info("\tbandwidth on "+str(P)+" cpus: {:0.2f} GB/s".format(result["bandwidth"][P]))
+
+    with open(path, "w") as f:
+        json.dump(result, f, indent=1)
+    return result
+
+# Get the peak performance of the host from the probe results, in the
+# form of the host_peaks dictionary of run_tests.py.  Results from
+# before the single-precision peak was measured hold only the
+# double-precision peak.
+def get_probe_peaks(result):
+    fma = result["fma"]
+    if not isinstance(fma, dict):
+        fma = {'double': fma}
+    peaks = {'gflops': fma['double'], 'bandwidth': dict(result["bandwidth"])}
+    if 'single' in fma:
+        peaks['gflops_single'] = fma['single']
+    return peaks
@@ -682,6 +682,50 @@ void operator()(MatrixType& A,
 }
 };
 
+//ELL matrices store num_cols_per_row entries for every row, padding
+//short rows with zero coefficients, so every row has the same length.
+template<typename Scalar,
+         typename LocalOrdinal,
+         typename GlobalOrdinal,
+         typename VectorType>
+struct matvec_std<ELLMatrix<Scalar,LocalOrdinal,GlobalOrdinal>,VectorType> {
+void operator()(ELLMatrix<Scalar,LocalOrdinal,GlobalOrdinal>& A,
+            VectorType& x,
+            VectorType& y)
+{
+  exchange_externals(A, x);
+
+  int n = A.rows.size();
+  const LocalOrdinal row_len = A.num_cols_per_row;
+  const GlobalOrdinal* Acols = &A.cols[0];
+  const Scalar* Acoefs       = &A.coefs[0];
+  const Scalar* xcoefs = &x.coefs[0];
+        Scalar* ycoefs = &y.coefs[0];
+
+#ifdef OMPTASK
+#pragma omp parallel
+  {
+    #pragma omp single
+    {
+#endif
+  cilk_for(int row=0; row<n; row++) {
+    	Scalar sum = 0;
+
+    	const GlobalOrdinal* row_cols = &Acols[row*row_len];
+    	const Scalar* row_coefs = &Acoefs[row*row_len];
+    	for(LocalOrdinal i = 0; i < row_len; ++i) {
+      		sum += row_coefs[i]*xcoefs[row_cols[i]];
+    	}
+
+    	ycoefs[row] = sum;
+  }
+#ifdef OMPTASK
+    }
+  }
+#endif
+}
+};
+
 template<typename MatrixType,
          typename VectorType>
 void matvec(MatrixType& A, VectorType& x, VectorType& y)
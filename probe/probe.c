@@ -0,0 +1,280 @@
+// Microbenchmarks to characterize the host that runs the tests.
+//
+// Usage:
+//   probe stream <threads> <MiB per array> <reps>
+//     Measure the bandwidth of a STREAM triad, a[i] = b[i] + s * c[i],
+//     using the given number of threads, each pinned to a distinct CPU
+//     the process may run on.  Prints "stream <threads> <GB/s>".
+//   probe latency <bytes> [<bytes> ...]
+//     Measure the latency of dependent loads that chase pointers
+//     through a random cycle of cache lines spanning each working-set
+//     size.  Prints "latency <bytes> <ns>" for each size.
+//   probe fma <iterations>
+//     Measure the peak rate of fused multiply-add operations of one
+//     core, in double and in single precision.  Prints
+//     "fma double <GFLOP/s>" and "fma single <GFLOP/s>".
+//
+// The tests run the probe under taskset, so the threads of the stream
+// probe run on the CPUs that the tests would use.
+
+#define _GNU_SOURCE
+#include <pthread.h>
+#include <sched.h>
+#include <stdint.h>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+#include <time.h>
+
+static double now(void) {
+  struct timespec ts;
+  clock_gettime(CLOCK_MONOTONIC, &ts);
+  return (double)ts.tv_sec + 1e-9 * (double)ts.tv_nsec;
+}
+
+static void usage(const char *prog) {
+  fprintf(stderr,
+          "Usage: %s stream <threads> <MiB per array> <reps>\n"
+          "       %s latency <bytes> [<bytes> ...]\n"
+          "       %s fma <iterations>\n",
+          prog, prog, prog);
+  exit(1);
+}
+
+///////////////////////////////////////////////////////////////////////////
+// STREAM triad
+
+typedef struct {
+  int id;
+  int nthreads;
+  int cpu;
+  size_t n;
+  int reps;
+  double *a, *b, *c;
+  pthread_barrier_t *barrier;
+  double best;
+} stream_arg_t;
+
+static void *stream_worker(void *varg) {
+  stream_arg_t *arg = (stream_arg_t *)varg;
+  if (arg->cpu >= 0) {
+    cpu_set_t set;
+    CPU_ZERO(&set);
+    CPU_SET(arg->cpu, &set);
+    pthread_setaffinity_np(pthread_self(), sizeof(set), &set);
+  }
+  size_t lo = arg->n * arg->id / arg->nthreads;
+  size_t hi = arg->n * (arg->id + 1) / arg->nthreads;
+  double *a = arg->a, *b = arg->b, *c = arg->c;
+  const double s = 3.0;
+
+  // Initialize this thread's part of the arrays from this thread, so
+  // that the pages are placed near the CPU that uses them.
+  for (size_t i = lo; i < hi; ++i) {
+    a[i] = 0.0;
+    b[i] = 1.0;
+    c[i] = 2.0;
+  }
+
+  arg->best = 0.0;
+  for (int r = 0; r < arg->reps; ++r) {
+    pthread_barrier_wait(arg->barrier);
+    double start = now();
+    for (size_t i = lo; i < hi; ++i)
+      a[i] = b[i] + s * c[i];
+    pthread_barrier_wait(arg->barrier);
+    double elapsed = now() - start;
+    if (arg->id == 0 && (arg->best == 0.0 || elapsed < arg->best))
+      arg->best = elapsed;
+  }
+  return NULL;
+}
+
+static int run_stream(int nthreads, size_t mib, int reps) {
+  size_t n = mib * 1024 * 1024 / sizeof(double);
+  double *a = malloc(n * sizeof(double));
+  double *b = malloc(n * sizeof(double));
+  double *c = malloc(n * sizeof(double));
+  if (!a || !b || !c) {
+    fprintf(stderr, "stream: failed to allocate arrays\n");
+    return 1;
+  }
+
+  // Pin thread i to the i-th CPU this process may run on.
+  cpu_set_t allowed;
+  CPU_ZERO(&allowed);
+  sched_getaffinity(0, sizeof(allowed), &allowed);
+  int cpus[CPU_SETSIZE];
+  int ncpus = 0;
+  for (int cpu = 0; cpu < CPU_SETSIZE; ++cpu)
+    if (CPU_ISSET(cpu, &allowed))
+      cpus[ncpus++] = cpu;
+
+  pthread_barrier_t barrier;
+  pthread_barrier_init(&barrier, NULL, nthreads);
+  pthread_t *threads = malloc(nthreads * sizeof(pthread_t));
+  stream_arg_t *args = malloc(nthreads * sizeof(stream_arg_t));
+  for (int i = 0; i < nthreads; ++i) {
+    args[i] = (stream_arg_t){i, nthreads, i < ncpus ? cpus[i] : -1,
+                             n, reps, a, b, c, &barrier, 0.0};
+    pthread_create(&threads[i], NULL, stream_worker, &args[i]);
+  }
+  for (int i = 0; i < nthreads; ++i)
+    pthread_join(threads[i], NULL);
+
+  // The triad reads b and c and writes a.
+  double bytes = 3.0 * (double)n * sizeof(double);
+  printf("stream %d %f\n", nthreads, bytes / args[0].best * 1e-9);
+
+  pthread_barrier_destroy(&barrier);
+  free(args);
+  free(threads);
+  free(a);
+  free(b);
+  free(c);
+  return 0;
+}
+
+///////////////////////////////////////////////////////////////////////////
+// Pointer-chase latency
+
+#define LINE_SIZE 64
+
+typedef struct line {
+  struct line *next;
+  char pad[LINE_SIZE - sizeof(struct line *)];
+} line_t;
+
+static uint64_t rng_state = 0x9e3779b97f4a7c15ULL;
+
+static uint64_t rng_next(void) {
+  rng_state ^= rng_state << 13;
+  rng_state ^= rng_state >> 7;
+  rng_state ^= rng_state << 17;
+  return rng_state;
+}
+
+static int run_latency(size_t bytes) {
+  size_t n = bytes / sizeof(line_t);
+  if (n < 2)
+    n = 2;
+  line_t *lines = aligned_alloc(LINE_SIZE, n * sizeof(line_t));
+  size_t *order = malloc(n * sizeof(size_t));
+  if (!lines || !order) {
+    fprintf(stderr, "latency: failed to allocate %zu bytes\n", bytes);
+    return 1;
+  }
+
+  // Link the lines into a single cycle in a random order, to defeat
+  // hardware prefetching.
+  for (size_t i = 0; i < n; ++i)
+    order[i] = i;
+  for (size_t i = n - 1; i > 0; --i) {
+    size_t j = rng_next() % (i + 1);
+    size_t tmp = order[i];
+    order[i] = order[j];
+    order[j] = tmp;
+  }
+  for (size_t i = 0; i < n; ++i)
+    lines[order[i]].next = &lines[order[(i + 1) % n]];
+
+  // Warm up the caches, then time enough loads to amortize the timer.
+  line_t *p = &lines[order[0]];
+  for (size_t i = 0; i < n; ++i)
+    p = p->next;
+  size_t steps = 1 << 20;
+  double elapsed;
+  do {
+    steps *= 2;
+    double start = now();
+    for (size_t i = 0; i < steps; ++i)
+      p = p->next;
+    elapsed = now() - start;
+  } while (elapsed < 0.2);
+
+  // Print the final pointer to keep the loads from being optimized away.
+  printf("latency %zu %f\n", bytes, elapsed / (double)steps * 1e9);
+  fprintf(stderr, "%p\n", (void *)p);
+
+  free(order);
+  free(lines);
+  return 0;
+}
+
+///////////////////////////////////////////////////////////////////////////
+// FMA peak
+
+#if defined(__AVX512F__)
+#define VEC_BYTES 64
+#elif defined(__AVX__)
+#define VEC_BYTES 32
+#else
+#define VEC_BYTES 16
+#endif
+
+// Define run_fma_<name>, which measures the peak FMA rate on vectors of
+// the given element type and prints "fma <name> <GFLOP/s>".
+#define DEFINE_RUN_FMA(real, name)                                      \
+  typedef real name##_vec_t __attribute__((vector_size(VEC_BYTES)));    \
+  static void run_fma_##name(long iters, real m, real s) {              \
+    const size_t lanes = VEC_BYTES / sizeof(real);                      \
+    name##_vec_t acc[NACC];                                             \
+    name##_vec_t vm, vs;                                                \
+    for (size_t l = 0; l < lanes; ++l) {                                \
+      vm[l] = m;                                                        \
+      vs[l] = s;                                                        \
+    }                                                                   \
+    for (int k = 0; k < NACC; ++k)                                      \
+      for (size_t l = 0; l < lanes; ++l)                                \
+        acc[k][l] = (real)(k + l);                                      \
+                                                                        \
+    double start = now();                                               \
+    for (long i = 0; i < iters; ++i)                                    \
+      for (int k = 0; k < NACC; ++k)                                    \
+        acc[k] = acc[k] * vm + vs;                                      \
+    double elapsed = now() - start;                                     \
+                                                                        \
+    double sum = 0.0;                                                   \
+    for (int k = 0; k < NACC; ++k)                                      \
+      for (size_t l = 0; l < lanes; ++l)                                \
+        sum += acc[k][l];                                               \
+                                                                        \
+    double flops = 2.0 * lanes * NACC * (double)iters;                  \
+    printf("fma " #name " %f\n", flops / elapsed * 1e-9);               \
+    fprintf(stderr, "%f\n", sum);                                       \
+  }
+
+// Number of independent accumulators, enough to cover the latency of
+// the FMA units.
+#define NACC 12
+
+DEFINE_RUN_FMA(double, double)
+DEFINE_RUN_FMA(float, single)
+
+int main(int argc, char *argv[]) {
+  if (argc < 2)
+    usage(argv[0]);
+
+  if (strcmp(argv[1], "stream") == 0) {
+    if (argc != 5)
+      usage(argv[0]);
+    return run_stream(atoi(argv[2]), strtoull(argv[3], NULL, 10), atoi(argv[4]));
+  } else if (strcmp(argv[1], "latency") == 0) {
+    if (argc < 3)
+      usage(argv[0]);
+    for (int i = 2; i < argc; ++i)
+      if (run_latency(strtoull(argv[i], NULL, 10)))
+        return 1;
+    return 0;
+  } else if (strcmp(argv[1], "fma") == 0) {
+    if (argc != 3)
+      usage(argv[0]);
+    // Pass the operands at run time, so the compiler cannot fold the
+    // loop.
+    run_fma_double(atol(argv[2]), 0.999999, 1e-6 * argc);
+    run_fma_single(atol(argv[2]), 0.999999f, 1e-6f * argc);
+    return 0;
+  }
+  usage(argv[0]);
+  return 1;
+}
@@ -0,0 +1,108 @@
+#include <algorithm>
+#include <cmath>
+#include <cstdio>
+#include <cstdlib>
+#include <chrono>
+#include <iostream>
+
+#include <cilk/cilk.h>
+#include <cilk/cilk_api.h>
+#ifdef CILKPLUS
+#include <cilk/reducer_opadd.h>
+#else
+#include <cilk/opadd_reducer.h>
+#endif
+
+#include "cilkpub/dotmix.h"
+
+cilkpub::DotMixPrime dprng;
+
+// Parameters of the arithmetic-average Asian call option to price: the
+// initial and strike prices, the risk-free rate, the volatility, the
+// time to expiry in years, and the number of time steps of each path.
+// The number of steps must be even.
+const double spot = 100.0;
+const double strike = 100.0;
+const double rate = 0.05;
+const double volatility = 0.2;
+const double expiry = 1.0;
+const int64_t steps = 64;
+
+// Convert a random 64-bit integer into a uniform double in (0, 1).
+double to_uniform(uint64_t x) {
+  return (static_cast<double>(x >> 11) + 0.5) * 0x1p-53;
+}
+
+// Price the option by simulating the given number of paths of
+// geometric Brownian motion, drawing the normal increments of each path
+// from rng by the Box-Muller transform.
+template <typename RNG>
+double price_option(int64_t paths, RNG rng) {
+#ifdef CILKPLUS
+  cilk::reducer_opadd<double> payoff(0);
+#else
+  cilk::opadd_reducer<double> payoff(0);
+#endif
+  const double dt = expiry / steps;
+  const double drift = (rate - 0.5 * volatility * volatility) * dt;
+  const double diffusion = volatility * std::sqrt(dt);
+  cilk_for (int64_t p = 0; p < paths; ++p) {
+    __cilkrts_bump_worker_rank();
+    double price = spot;
+    double sum = 0.0;
+    for (int64_t k = 0; k < steps; k += 2) {
+      double r = std::sqrt(-2.0 * std::log(to_uniform(rng())));
+      double theta = 2.0 * M_PI * to_uniform(rng());
+      price *= std::exp(drift + diffusion * r * std::cos(theta));
+      sum += price;
+      price *= std::exp(drift + diffusion * r * std::sin(theta));
+      sum += price;
+    }
+    payoff += std::max(sum / steps - strike, 0.0);
+  }
+#ifdef CILKPLUS
+  return std::exp(-rate * expiry) * payoff.get_value() / paths;
+#else
+  return std::exp(-rate * expiry) * payoff / paths;
+#endif
+}
+
+int main(int argc, char *argv[]) {
+  uint64_t seed = 0x8c679c168e6bf733ul;
+  int num_trials = 20;
+  int64_t paths = 1000000;
+
+  if (argc > 1) {
+    paths = atol(argv[1]);
+
+    if (argc > 2)
+      num_trials = atoi(argv[2]);
+
+    if (argc > 3)
+      seed = atol(argv[3]);
+  }
+
+  dprng.init_seed(seed);
+#ifdef OPENCILK
+  __cilkrts_dprand_set_seed(seed);
+  __cilkrts_init_dprng();
+
+  for (int t = 0; t < num_trials; ++t) {
+    auto start = std::chrono::steady_clock::now();
+    double res = price_option(paths, [] { return __cilkrts_get_dprand(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "option_dprand(" << paths << ") = " << res << ", time " << elapsed.count() << "s\n";
+  }
+#endif
+
+  for (int t = 0; t < num_trials; ++t) {
+    auto start = std::chrono::steady_clock::now();
+    double res = price_option(paths, [] { return dprng.get(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "option_pedigree(" << paths << ") = " << res << ", time " << elapsed.count() << "s\n";
+  }
+
+  return 0;
+}
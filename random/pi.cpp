@@ -15,6 +15,54 @@
 
 cilkpub::DotMixPrime dprng;
 
+#ifdef UNBALANCED
+// Number of iterations below which the unbalanced loop runs serially.
+const int64_t grain = 2048;
+
+// Count the samples in [lo, hi) that fall inside the unit circle.  The
+// range is split unevenly, spawning the last 7/8 of it, so the spawn
+// tree is a long spine and the pedigrees of the iterations are several
+// times longer than those of a cilk_for.
+template <typename RNG>
+int64_t count_inside(int64_t lo, int64_t hi, RNG rng) {
+  if (hi - lo <= grain) {
+    int64_t inside = 0;
+    for (int64_t i = lo; i < hi; ++i) {
+      __cilkrts_bump_worker_rank();
+      // Get two samples
+      uint64_t x_sample = rng();
+      uint64_t y_sample = rng();
+
+      double x = static_cast<double>(x_sample)/static_cast<double>(std::numeric_limits<uint64_t>::max());
+      double y = static_cast<double>(y_sample)/static_cast<double>(std::numeric_limits<uint64_t>::max());
+      double m = (x*x) + (y*y);
+
+      // Check if sample is inside of the circle
+      if (m <= 1)
+        ++inside;
+    }
+    return inside;
+  }
+  int64_t split = lo + (hi - lo) / 8;
+  int64_t x = cilk_spawn count_inside(split, hi, rng);
+  int64_t y = count_inside(lo, split, rng);
+  cilk_sync;
+  return x + y;
+}
+
+double pi_pedigree(int64_t N) {
+  int64_t inside = count_inside(0, N, [] { return dprng.get(); });
+  return 4.0 * static_cast<double>(inside) / static_cast<double>(N);
+}
+
+#ifdef OPENCILK
+double pi_dprand(int64_t N) {
+  int64_t inside = count_inside(0, N, [] { return __cilkrts_get_dprand(); });
+  return 4.0 * static_cast<double>(inside) / static_cast<double>(N);
+}
+#endif // OPENCILK
+
+#else // UNBALANCED
 double pi_pedigree(int64_t N) {
 #ifdef CILKPLUS
   cilk::reducer_opadd<int64_t> inside(0);
@@ -66,6 +114,7 @@ double pi_dprand(int64_t N) {
   return 4.0 * static_cast<double>(inside) / static_cast<double>(N);
 }
 #endif // OPENCILK
+#endif // UNBALANCED
 
 int main(int argc, char *argv[]) {
   uint64_t seed = 0x8c679c168e6bf733ul;
@@ -0,0 +1,94 @@
+#include <algorithm>
+#include <cstdio>
+#include <cstdlib>
+#include <chrono>
+#include <iostream>
+#include <vector>
+
+#include <cilk/cilk.h>
+#include <cilk/cilk_api.h>
+
+#include "cilkpub/dotmix.h"
+
+cilkpub::DotMixPrime dprng;
+
+// Number of elements below which quicksort sorts serially.
+const int64_t cutoff = 256;
+
+// Hash i into a 64-bit key, to generate the same input for every DPRNG.
+uint64_t splitmix64(uint64_t i) {
+  uint64_t z = i + 0x9e3779b97f4a7c15ul;
+  z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ul;
+  z = (z ^ (z >> 27)) * 0x94d049bb133111ebul;
+  return z ^ (z >> 31);
+}
+
+// Sort [lo, hi) by randomized quicksort, choosing each pivot uniformly
+// at random with rng and sorting both partitions in parallel.
+template <typename RNG>
+void quicksort(uint64_t *lo, uint64_t *hi, RNG rng) {
+  if (hi - lo <= cutoff) {
+    std::sort(lo, hi);
+    return;
+  }
+  uint64_t pivot = lo[rng() % (hi - lo)];
+  uint64_t *mid1 = std::partition(lo, hi, [=](uint64_t x) { return x < pivot; });
+  uint64_t *mid2 = std::partition(mid1, hi, [=](uint64_t x) { return x == pivot; });
+  cilk_spawn quicksort(lo, mid1, rng);
+  quicksort(mid2, hi, rng);
+  cilk_sync;
+}
+
+void init_keys(std::vector<uint64_t> &keys) {
+  int64_t n = keys.size();
+  cilk_for (int64_t i = 0; i < n; ++i)
+    keys[i] = splitmix64(i);
+}
+
+const char *check_sorted(const std::vector<uint64_t> &keys) {
+  return std::is_sorted(keys.begin(), keys.end()) ? "sorted" : "unsorted";
+}
+
+int main(int argc, char *argv[]) {
+  uint64_t seed = 0x8c679c168e6bf733ul;
+  int num_trials = 20;
+  int64_t n = 10000000;
+
+  if (argc > 1) {
+    n = atol(argv[1]);
+
+    if (argc > 2)
+      num_trials = atoi(argv[2]);
+
+    if (argc > 3)
+      seed = atol(argv[3]);
+  }
+
+  std::vector<uint64_t> keys(n);
+
+  dprng.init_seed(seed);
+#ifdef OPENCILK
+  __cilkrts_dprand_set_seed(seed);
+  __cilkrts_init_dprng();
+
+  for (int t = 0; t < num_trials; ++t) {
+    init_keys(keys);
+    auto start = std::chrono::steady_clock::now();
+    quicksort(keys.data(), keys.data() + n, [] { return __cilkrts_get_dprand(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "quicksort_dprand(" << n << ") = " << check_sorted(keys) << ", time " << elapsed.count() << "s\n";
+  }
+#endif
+
+  for (int t = 0; t < num_trials; ++t) {
+    init_keys(keys);
+    auto start = std::chrono::steady_clock::now();
+    quicksort(keys.data(), keys.data() + n, [] { return dprng.get(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "quicksort_pedigree(" << n << ") = " << check_sorted(keys) << ", time " << elapsed.count() << "s\n";
+  }
+
+  return 0;
+}
@@ -0,0 +1,126 @@
+#include <cstdio>
+#include <cstdlib>
+#include <chrono>
+#include <iostream>
+#include <vector>
+
+#include <cilk/cilk.h>
+#include <cilk/cilk_api.h>
+#ifdef CILKPLUS
+#include <cilk/reducer_opadd.h>
+#else
+#include <cilk/opadd_reducer.h>
+#endif
+
+#include "cilkpub/dotmix.h"
+
+cilkpub::DotMixPrime dprng;
+
+// Number of steps of each random walk.
+const int64_t walk_length = 32;
+// Maximum out-degree of a vertex of the graph.
+const uint64_t max_degree = 32;
+
+// Hash i into a 64-bit value, to generate the same graph for every
+// DPRNG.
+uint64_t splitmix64(uint64_t i) {
+  uint64_t z = i + 0x9e3779b97f4a7c15ul;
+  z = (z ^ (z >> 30)) * 0xbf58476d1ce4e5b9ul;
+  z = (z ^ (z >> 27)) * 0x94d049bb133111ebul;
+  return z ^ (z >> 31);
+}
+
+// A graph in compressed sparse row (CSR) format, as GBBS stores it:
+// the out-neighbors of vertex v are edges[offsets[v]..offsets[v+1]).
+struct Graph {
+  int64_t n;
+  std::vector<int64_t> offsets;
+  std::vector<int64_t> edges;
+};
+
+// Generate a graph with 2^scale vertices.  Each vertex has between 1
+// and max_degree out-neighbors, which are skewed towards low vertex
+// ids, so that a few hubs have high in-degree.
+Graph make_graph(int scale) {
+  Graph G;
+  G.n = 1l << scale;
+  G.offsets.resize(G.n + 1);
+  G.offsets[0] = 0;
+  for (int64_t v = 0; v < G.n; ++v)
+    G.offsets[v+1] = G.offsets[v] + 1 + splitmix64(v) % max_degree;
+  G.edges.resize(G.offsets[G.n]);
+  int64_t m = G.offsets[G.n];
+  cilk_for (int64_t e = 0; e < m; ++e) {
+    double x = static_cast<double>(splitmix64(m + e) >> 11) * 0x1p-53;
+    G.edges[e] = static_cast<int64_t>(x * x * G.n);
+  }
+  return G;
+}
+
+// Walk walk_length steps from every vertex of G, choosing each step
+// uniformly at random among the out-neighbors of the current vertex
+// with rng.  Returns the sum of the vertices at which the walks end.
+template <typename RNG>
+int64_t random_walks(const Graph &G, RNG rng) {
+#ifdef CILKPLUS
+  cilk::reducer_opadd<int64_t> sum(0);
+#else
+  cilk::opadd_reducer<int64_t> sum(0);
+#endif
+  cilk_for (int64_t s = 0; s < G.n; ++s) {
+    __cilkrts_bump_worker_rank();
+    int64_t v = s;
+    for (int64_t k = 0; k < walk_length; ++k) {
+      int64_t degree = G.offsets[v+1] - G.offsets[v];
+      v = G.edges[G.offsets[v] + rng() % degree];
+    }
+    sum += v;
+  }
+#ifdef CILKPLUS
+  return sum.get_value();
+#else
+  return sum;
+#endif
+}
+
+int main(int argc, char *argv[]) {
+  uint64_t seed = 0x8c679c168e6bf733ul;
+  int num_trials = 20;
+  int scale = 20;
+
+  if (argc > 1) {
+    scale = atoi(argv[1]);
+
+    if (argc > 2)
+      num_trials = atoi(argv[2]);
+
+    if (argc > 3)
+      seed = atol(argv[3]);
+  }
+
+  Graph G = make_graph(scale);
+
+  dprng.init_seed(seed);
+#ifdef OPENCILK
+  __cilkrts_dprand_set_seed(seed);
+  __cilkrts_init_dprng();
+
+  for (int t = 0; t < num_trials; ++t) {
+    auto start = std::chrono::steady_clock::now();
+    int64_t res = random_walks(G, [] { return __cilkrts_get_dprand(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "randwalk_dprand(" << scale << ") = " << res << ", time " << elapsed.count() << "s\n";
+  }
+#endif
+
+  for (int t = 0; t < num_trials; ++t) {
+    auto start = std::chrono::steady_clock::now();
+    int64_t res = random_walks(G, [] { return dprng.get(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "randwalk_pedigree(" << scale << ") = " << res << ", time " << elapsed.count() << "s\n";
+  }
+
+  return 0;
+}
@@ -0,0 +1,128 @@
+#include <algorithm>
+#include <cstdio>
+#include <cstdlib>
+#include <chrono>
+#include <iostream>
+#include <vector>
+
+#include <cilk/cilk.h>
+#include <cilk/cilk_api.h>
+
+#include "cilkpub/dotmix.h"
+
+cilkpub::DotMixPrime dprng;
+
+// Maximum number of levels of the skip list.
+const int max_level = 32;
+// Number of elements that each strand of a parallel pack handles.
+const int64_t block = 2048;
+
+// A skip list over the keys 0, ..., n-1.  Level l lists, in order, the
+// keys whose height exceeds l, and for each of them, its position in
+// level l-1.
+struct SkipList {
+  std::vector<uint8_t> height;
+  std::vector<std::vector<int64_t>> keys;
+  std::vector<std::vector<int64_t>> down;
+};
+
+// Build level l of the skip list by packing, in parallel, the keys of
+// level l-1 whose height exceeds l.
+void build_level(SkipList &S, int l) {
+  const std::vector<int64_t> &below = S.keys[l-1];
+  int64_t m = below.size();
+  int64_t nblocks = (m + block - 1) / block;
+  std::vector<int64_t> counts(nblocks + 1, 0);
+  cilk_for (int64_t b = 0; b < nblocks; ++b) {
+    int64_t count = 0;
+    for (int64_t j = b * block; j < std::min(m, (b + 1) * block); ++j)
+      count += S.height[below[j]] > l;
+    counts[b] = count;
+  }
+  int64_t total = 0;
+  for (int64_t b = 0; b <= nblocks; ++b) {
+    int64_t count = counts[b];
+    counts[b] = total;
+    total += count;
+  }
+  S.keys[l].resize(total);
+  S.down[l].resize(total);
+  cilk_for (int64_t b = 0; b < nblocks; ++b) {
+    int64_t pos = counts[b];
+    for (int64_t j = b * block; j < std::min(m, (b + 1) * block); ++j) {
+      if (S.height[below[j]] > l) {
+        S.keys[l][pos] = below[j];
+        S.down[l][pos] = j;
+        ++pos;
+      }
+    }
+  }
+}
+
+// Build a skip list over n keys in bulk.  The height of each key is
+// drawn from a geometric distribution with rng.  Returns the number of
+// nonempty levels.
+template <typename RNG>
+int build_skiplist(SkipList &S, int64_t n, RNG rng) {
+  S.height.resize(n);
+  S.keys.assign(max_level, std::vector<int64_t>());
+  S.down.assign(max_level, std::vector<int64_t>());
+  cilk_for (int64_t i = 0; i < n; ++i) {
+    __cilkrts_bump_worker_rank();
+    uint64_t r = rng() | (1ul << (max_level - 1));
+    S.height[i] = __builtin_ctzll(r) + 1;
+  }
+  S.keys[0].resize(n);
+  cilk_for (int64_t i = 0; i < n; ++i)
+    S.keys[0][i] = i;
+  int levels = 1;
+  while (levels < max_level) {
+    build_level(S, levels);
+    if (S.keys[levels].empty())
+      break;
+    ++levels;
+  }
+  return levels;
+}
+
+int main(int argc, char *argv[]) {
+  uint64_t seed = 0x8c679c168e6bf733ul;
+  int num_trials = 20;
+  int64_t n = 10000000;
+
+  if (argc > 1) {
+    n = atol(argv[1]);
+
+    if (argc > 2)
+      num_trials = atoi(argv[2]);
+
+    if (argc > 3)
+      seed = atol(argv[3]);
+  }
+
+  SkipList S;
+
+  dprng.init_seed(seed);
+#ifdef OPENCILK
+  __cilkrts_dprand_set_seed(seed);
+  __cilkrts_init_dprng();
+
+  for (int t = 0; t < num_trials; ++t) {
+    auto start = std::chrono::steady_clock::now();
+    int res = build_skiplist(S, n, [] { return __cilkrts_get_dprand(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "skiplist_dprand(" << n << ") = " << res << ", time " << elapsed.count() << "s\n";
+  }
+#endif
+
+  for (int t = 0; t < num_trials; ++t) {
+    auto start = std::chrono::steady_clock::now();
+    int res = build_skiplist(S, n, [] { return dprng.get(); });
+    auto end = std::chrono::steady_clock::now();
+    std::chrono::duration<double> elapsed = end - start;
+    std::cout << "skiplist_pedigree(" << n << ") = " << res << ", time " << elapsed.count() << "s\n";
+  }
+
+  return 0;
+}
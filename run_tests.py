@@ -16,15 +16,21 @@ import argparse
 import csv
 import datetime
 import glob
+import json
 import logging
+import math
 import os
 import re
+import shutil
 import subprocess
 import statistics
 import sys
 import time
 
-from runner import run, get_cpu_ordering, get_n_cpus
+from runner import run, get_cpu_ordering, get_n_cpus, get_host_fingerprint, configure_noise_gate, configure_adaptive_sweep, set_cell_hook, set_trial_hook
+from scalability import geometric_cpu_counts
+from machine_probe import get_host_probe, get_probe_peaks
+from graph_catalog import expand_graph_names, get_graph_path, graph_missing, prepare_graph, touch_graph_files, evict_graphs, graph_orders, reordered_graph_name, split_graph_name
 
 # Logger to report actions of this script.
 logger = logging.getLogger(sys.argv[0])
@@ -37,6 +43,61 @@ cilkrts_dir = "/opt/cilkrts"
 compiler_bin_dir = "/opt/opencilk/bin/"
 rawdata_dir = "./rawdata"
 
+# Number of warm-up trials to run, and exclude, for each data point.
+warmup_trials = 0
+# Policy for rejecting outlier measurements before aggregating them:
+# - 'none' - Aggregate all measurements.
+# - 'mad' - Reject measurements whose modified z-score, based on the
+#   median absolute deviation (MAD), exceeds outlier_threshold.
+all_outlier_policies = ['none','mad']
+outlier_policy = 'none'
+outlier_threshold = 3.5
+
+# Peak performance of this host, used to report the efficiency of
+# benchmarks relative to the machine.  Maps 'gflops' and 'gflops_single'
+# to the peak double- and single-precision FLOP rates of one core in
+# GFLOP/s, and 'bandwidth' to the peak memory
+# bandwidth in GB/s, either as a single value or as a dictionary
+# mapping CPU count to bandwidth.
+host_peaks = dict()
+# Results of probing the host, saved with the metadata of the run, or
+# None if the host was not probed.
+host_probe = None
+
+# Set of build variants to run, or None to run all build variants.
+selected_variants = None
+# Orders in which to run build variants:
+# - 'grouped' - Run build variants grouped by test suite, experiment,
+#   and system.
+# - 'longest-first' - Run build variants in decreasing order of their
+#   estimated running times.
+all_job_orders = ['grouped','longest-first']
+# Record of the raw-data CSVs aggregated in this run.  Saved to a
+# manifest so that the results of shards can be merged later.
+manifest_entries = []
+
+# Sparse-matrix formats with which to build and run miniFE, and the
+# problem sizes to run miniFE on, as lists of the nx, ny, and nz
+# dimensions, or None to use the default size.
+minife_formats = ['csr']
+minife_sizes = None
+
+# Recursion depths at which to run fib_rng, or None to use the default
+# depth.
+fib_depths = None
+
+# Ways in which the GBBS benchmarks load their graph input.
+gbbs_load_modes = ['compressed-mmap']
+# Names of the graphs in the graph catalog on which to run the GBBS
+# benchmarks, or None to use the default graph.
+gbbs_graphs = None
+# Orders in which to relabel the vertices of the graphs on which to run
+# the GBBS benchmarks.
+gbbs_orders = ['original']
+# Number of bytes of disk the graph catalog may use, or None for no
+# limit.
+graph_cache_budget = None
+
 ###########################################################################
 ### Test-script parameters
 
@@ -67,6 +128,19 @@ all_experiments=['baseline','pedigrees','cilkscale','cilkscale-bitcode','dprng']
 # - 'builtin' - Use the OpenCilk runtime's built-in DPRNG.
 all_dprngs = ["dotmix", "builtin"]
 
+# Sparse-matrix formats for miniFE:
+# - 'csr' - Compressed sparse row (CSR) format
+# - 'ell' - ELLPACK (ELL) format, which pads every row to the same length
+all_minife_formats = ['csr','ell']
+
+# Ways for GBBS benchmarks to load their graph input:
+# - 'compressed-mmap' - Memory-map the byte-compressed graph
+# - 'compressed-read' - Read the byte-compressed graph into memory
+# - 'binary' - Memory-map the binary CSR graph
+# - 'text-mmap' - Memory-map and parse the text adjacency graph
+# - 'text-read' - Read and parse the text adjacency graph
+all_gbbs_load_modes = ['compressed-mmap','compressed-read','binary','text-mmap','text-read']
+
 # The set of Cilk-5 benchmarks to run
 all_cilk5_progs = ['cholesky', 'cilksort', 'fft', 'heat', 'lu', 'matmul', 'nqueens', 'qsort', 'rectmul', 'strassen']
 
@@ -77,7 +151,8 @@ all_gbbs_progs = ['BFS/NonDeterministicBFS:BFS_main',
                   'PageRank:PageRank_main']
 
 # The set of assorted randomized Cilk programs to run
-all_randbench_progs = ['pi','fib_rng']
+all_randbench_progs = ['pi','pi_unbalanced','fib_rng','quicksort_rng','skiplist_rng','randwalk_rng',
+                       'option_rng']
 
 # The set of randomized GBBS benchmarks to run
 all_rng_gbbs_progs = ["MaximalIndependentSet/RandomGreedy:MaximalIndependentSet_main",
@@ -97,9 +172,11 @@ def runcmd(subProcCommand):
                                 stdout=subprocess.DEVNULL,
                                 stderr=subprocess.DEVNULL)
 
+    start = time.time()
     proc.wait()
     if proc.returncode != 0:
         raise subprocess.CalledProcessError(proc.returncode, subProcCommand)
+    record_build(time.time() - start)
 
 ###########################################################################
 ### Methods for configuring different builds
@@ -154,6 +231,11 @@ def unset_environ_for_experiment(exp):
         del os.environ['EXTRA_CFLAGS']
         del os.environ['EXTRA_LDFLAGS']
 
+# Get the number of trials for a binary to run itself, including
+# warm-up trials, given the requested number of trials.
+def with_warmup(trials):
+    return str(int(trials)+warmup_trials)
+
 # Adjust CPU counts for a given system.  Currently, this method simply
 # sets cpu_counts to "1" for the serial system.
 def fix_cpu_counts(sys, cpu_counts):
@@ -161,6 +243,16 @@ def fix_cpu_counts(sys, cpu_counts):
         return "1"
     return cpu_counts
 
+# Get the list of CPU counts, as strings, that form the columns for a
+# given system in the aggregated results.  If the CPU counts were not
+# listed explicitly, e.g., because they were chosen by an adaptive
+# sweep, use the CPU counts for which accum_data has results.
+def get_cpu_count_columns(sys, cpu_counts, accum_data):
+    counts = fix_cpu_counts(sys, cpu_counts)
+    if counts == "all" or counts == "adaptive":
+        return sorted(set([c for (p,s,c) in accum_data if s == sys]), key=int)
+    return counts.split(',')
+
 # Returns True if the given system-experiment pair is valid to test,
 # False otherwise.
 def sys_exp_compatible(sys, exp):
@@ -180,6 +272,72 @@ def sys_dprng_compatible(sys, dprng):
         return False
     return True
 
+# Returns True if the given build variant should be run, False
+# otherwise.
+def variant_selected(variant):
+    return selected_variants is None or variant in selected_variants
+
+# Get the list of build variants to run for the given test suites,
+# systems, experiments, and programs, in the order in which they are
+# run.  Each build variant is a tuple whose first element is the test
+# suite.  The Makefile-based suites build all programs in a variant at
+# once, while each GBBS program is its own variant.
+def get_build_variants(test_suites, systems, experiments, programs=None):
+    variants = []
+    for test_suite in test_suites:
+        if test_suite == 'cilk5':
+            for exp in experiments:
+                if exp == 'dprng':
+                    continue
+                for sys in systems:
+                    if sys_exp_compatible(sys, exp):
+                        variants.append((test_suite, exp, sys))
+        elif test_suite == 'minife':
+            if programs is not None and 'minife' not in programs:
+                continue
+            for exp in experiments:
+                if exp == 'dprng':
+                    continue
+                for sys in systems:
+                    if not sys_exp_compatible(sys, exp):
+                        continue
+                    for fmt in minife_formats:
+                        variants.append((test_suite, exp, sys, fmt))
+        elif test_suite == 'gbbs':
+            for exp in experiments:
+                if exp == 'dprng':
+                    continue
+                for sys in systems:
+                    if not sys_exp_compatible(sys, exp):
+                        continue
+                    for prog in (all_gbbs_progs if programs is None else programs):
+                        if prog in all_gbbs_progs:
+                            variants.append((test_suite, exp, sys, prog))
+        elif test_suite == 'random':
+            if 'dprng' not in experiments:
+                continue
+            for sys in systems:
+                if sys != "serial" and sys != "openmp" and sys != "tbb":
+                    variants.append((test_suite, sys))
+        elif test_suite == 'gbbs-random':
+            if 'dprng' not in experiments:
+                continue
+            for sys in systems:
+                for dprng in all_dprngs:
+                    if not sys_dprng_compatible(sys, dprng):
+                        continue
+                    for prog in (all_rng_gbbs_progs if programs is None else programs):
+                        if prog in all_rng_gbbs_progs:
+                            variants.append((test_suite, sys, dprng, prog))
+    return variants
+
+# Get the build variants assigned to shard `index` of `count` shards.
+# Variants are assigned round-robin in the order that
+# get_build_variants() returns them, so every host running a shard of
+# the same sweep computes the same assignment.
+def get_shard_variants(variants, index, count):
+    return variants[index::count]
+
 
 ### Methods to get configuration for Bazel build system
 
@@ -239,6 +397,32 @@ def get_bazel_dprng_config(dprng, sys):
 ###########################################################################
 ### Methods for accumulating results into CSVs
 
+# Split the list of measurements vals into the measurements to keep and
+# the outliers to reject, according to outlier_policy.
+def reject_outliers(vals):
+    if outlier_policy == 'none' or len(vals) < 3:
+        return vals, []
+    median = statistics.median(vals)
+    mad = statistics.median([abs(x - median) for x in vals])
+    if mad == 0:
+        return vals, []
+    kept = []
+    rejected = []
+    for x in vals:
+        # 0.6745 is the 0.75 quantile of the standard normal
+        # distribution, which scales the MAD to a consistent estimate
+        # of the standard deviation.
+        if abs(0.6745 * (x - median) / mad) > outlier_threshold:
+            rejected.append(x)
+        else:
+            kept.append(x)
+    return kept, rejected
+
+# Get the name of the CSV file that records the outliers rejected from
+# the raw performance data in out_csv.
+def outliers_csv_name(out_csv):
+    return os.path.splitext(out_csv)[0]+"-outliers.csv"
+
 # Read raw data from out_csv, aggregate the performance measurements,
 # add the aggregated results to accum_data, and update sys_run
 # accordingly.
@@ -249,6 +433,7 @@ def get_bazel_dprng_config(dprng, sys):
 # for example, for handling the results of the randomized Cilk
 # benchmarks, where each run of the benchmark tests different DPRNGs.
 def accumulate_results(out_csv, bench, sys, sys_run, accum_data, parse_bench_name_fn=None):
+    outliers = []
     with open(out_csv, "r") as out_csv_file:
         # Read the rows of the CSV.
         rows = csv.reader(out_csv_file, delimiter=",")
@@ -261,8 +446,13 @@ def accumulate_results(out_csv, bench, sys, sys_run, accum_data, parse_bench_nam
                 sysname = sys+' '+parsed_bench[1]
             # Get the number of CPUs used.
             num_cpus = row[1]
-            # Compute the median of the timing measurements.
-            median = statistics.median([float(x) for x in row[2:]])
+            # Compute the median of the timing measurements, after
+            # rejecting outliers.  The raw CSV retains all
+            # measurements.
+            vals,rejected = reject_outliers([float(x) for x in row[2:]])
+            if rejected:
+                outliers.append(row[0:2]+rejected)
+            median = statistics.median(vals)
             # Add the system name and aggregated timing measurement to
             # sys_run and accum_data, respectively.
             if sysname not in sys_run:
@@ -270,6 +460,23 @@ def accumulate_results(out_csv, bench, sys, sys_run, accum_data, parse_bench_nam
             key = (bench, sysname, num_cpus)
             accum_data[key] = median
 
+    # Record any rejected outliers.
+    if outliers:
+        logger.info("Rejected "+str(sum([len(r)-2 for r in outliers]))+" outlier(s) from "+out_csv+".")
+        with open(outliers_csv_name(out_csv), "w") as outliers_csv_file:
+            csv.writer(outliers_csv_file, delimiter=',').writerows(outliers)
+
+# Record in the manifest that the raw data in out_csv, for the given
+# experiment, benchmark, and system, was aggregated by calling
+# accumulate_results() with the given parse_bench_name_fn.
+def record_manifest_entry(exp, out_csv, bench, sys, parse_bench_name_fn=None):
+    manifest_entries.append({
+        "experiment": exp,
+        "csv": os.path.basename(out_csv),
+        "bench": bench,
+        "system": sys,
+        "parse_bench_name": None if parse_bench_name_fn is None else parse_bench_name_fn.__name__})
+
 # Write the accumulated performance results to a CSV file named
 # accum_csv.
 def write_accumulated_results(accum_csv, accum_data, prog_run, sys_run, cpu_counts):
@@ -277,7 +484,7 @@ def write_accumulated_results(accum_csv, accum_data, prog_run, sys_run, cpu_coun
         # Create a CSV writer.
         accum_csv_writer = csv.writer(accum_csv_file, delimiter=',')
         # Generate a header for the output CSV.
-        header = ["benchmark"]+[s+' '+c for s in sys_run for c in fix_cpu_counts(s, cpu_counts).split(',')]
+        header = ["benchmark"]+[s+' '+c for s in sys_run for c in get_cpu_count_columns(s, cpu_counts, accum_data)]
         accum_csv_writer.writerow(header)
         # Iterate over the programs run, which will form the rows of
         # the output CSV.
@@ -286,7 +493,7 @@ def write_accumulated_results(accum_csv, accum_data, prog_run, sys_run, cpu_coun
             # Iterate over the systems run and CPU counts, which will
             # form the columns of the output CSV.
             for s in sys_run:
-                for c in fix_cpu_counts(s, cpu_counts).split(','):
+                for c in get_cpu_count_columns(s, cpu_counts, accum_data):
                     # Add data to the output row, if we have it.
                     if (prog,s,c) in accum_data:
                         out_row.append(accum_data[(prog,s,c)])
@@ -323,7 +530,7 @@ def combine_keys(accum_data, new_key, keys, prog_run, sys_run, cpu_counts):
                 if prog not in prog_run[new_key]:
                     prog_run[new_key].append(prog)
 
-                for c in fix_cpu_counts(sys, cpu_counts).split(','):
+                for c in get_cpu_count_columns(sys, cpu_counts, accum_data[key]):
                     # Copy data from the old key to the new key.
                     if (prog, sys, c) in accum_data[key]:
                         accum_data[new_key][(prog, new_sys, c)] = accum_data[key][(prog, sys, c)]
@@ -335,7 +542,7 @@ def combine_keys(accum_data, new_key, keys, prog_run, sys_run, cpu_counts):
 
 # Output parser for Cilk-5 benchmarks.  Extracts running time in
 # seconds from output.
-def parse_cilk5_output(output, err, prog, prog_args, timings):
+def parse_cilk5_output(output, err, prog, prog_args, timings, P):
     for line in output.split('\n'):
         m = re.match(r"(\d+\.\d+)", line.lower())
         if m:
@@ -374,6 +581,119 @@ def get_cilk5_input(prog, small_inputs):
         case "cilksort": return ["-n","80000000"]
         case _: raise ValueError("Unrecognized program "+prog)
 
+# Get the value of the option `opt` in the list of program arguments
+# args, as an integer.
+def get_int_option(args, opt):
+    return int(args[args.index(opt)+1])
+
+# Count the nodes in the search tree explored by the nqueens benchmark
+# on an n-by-n board, i.e., the number of calls to nqueens(): the root
+# plus every partial placement of queens that passes ok().
+def count_nqueens_nodes(n):
+    full = (1 << n) - 1
+    count = 0
+    stack = [(0, 0, 0)]
+    while stack:
+        cols, diag1, diag2 = stack.pop()
+        count += 1
+        avail = full & ~(cols | diag1 | diag2)
+        while avail:
+            bit = avail & -avail
+            avail ^= bit
+            stack.append((cols | bit, ((diag1 | bit) << 1) & full, (diag2 | bit) >> 1))
+    return count
+
+# Bytes per element of each floating-point precision.
+precision_bytes = {'single': 4, 'double': 8}
+
+# Get the precision, 'single' or 'double', of the floating-point
+# elements of the given Cilk-5 benchmark, from the type that its source
+# defines for them.
+def get_cilk5_precision(prog):
+    with open(os.path.join("cilk5", prog+".c"), "r") as f:
+        m = re.search(r"^#define\s+(?:REAL|Real|DTYPE)\s+(float|double)\b|"
+                      r"^typedef\s+(float|double)\s+(?:REAL|Real|DTYPE|Block)\b",
+                      f.read(), re.MULTILINE)
+    if m is None:
+        raise ValueError("Cannot find the element type of "+prog)
+    return 'single' if (m.group(1) or m.group(2)) == 'float' else 'double'
+
+# Get the work performed by one run of the given Cilk-5 benchmark with
+# the given program arguments.  Returns a tuple (ops, unit, scale,
+# kind, bytes_per_op, precision), where:
+# - ops is the number of operations performed;
+# - unit names the throughput reported, in operations per second
+#   divided by scale;
+# - kind is 'flops' for floating-point kernels, whose efficiency is
+#   measured against the peak FLOP rate; 'memory' for kernels whose
+#   efficiency is measured against the peak memory bandwidth; or None;
+# - bytes_per_op is the compulsory memory traffic per operation, in
+#   bytes, which determines the arithmetic intensity of 'flops' kernels
+#   for a roofline model, or None if it is unknown; and
+# - precision is the precision, 'single' or 'double', of 'flops'
+#   kernels, whose efficiency is measured against the peak FLOP rate of
+#   that precision, or None for other kernels.
+#
+# Strassen is credited with the 2n^3 operations of classical matrix
+# multiplication, and cholesky, which factors a sparse matrix, with the
+# n^3/3 operations of a dense Cholesky factorization.
+def get_cilk5_work(prog, prog_args):
+    match prog:
+        case "matmul":
+            n = get_int_option(prog_args, "-n")
+            precision = get_cilk5_precision(prog)
+            # Read A and B and write C, each n x n elements.
+            bytes_per_op = 3.0*n**2*precision_bytes[precision]/(2.0*n**3)
+            return (2.0*n**3, "GFLOP/s", 1e9, 'flops', bytes_per_op, precision)
+        case "rectmul":
+            x = get_int_option(prog_args, "-x")
+            y = get_int_option(prog_args, "-y")
+            z = get_int_option(prog_args, "-z")
+            precision = get_cilk5_precision(prog)
+            # Read A and B and write C, of x*y, y*z, and x*z elements.
+            bytes_per_op = (x*y+y*z+x*z)*precision_bytes[precision]/(2.0*x*y*z)
+            return (2.0*x*y*z, "GFLOP/s", 1e9, 'flops', bytes_per_op, precision)
+        case "strassen":
+            n = get_int_option(prog_args, "-n")
+            precision = get_cilk5_precision(prog)
+            # Read A and B and write C, each n x n elements.
+            bytes_per_op = 3.0*n**2*precision_bytes[precision]/(2.0*n**3)
+            return (2.0*n**3, "GFLOP/s (classical-equivalent)", 1e9, 'flops', bytes_per_op, precision)
+        case "lu":
+            n = get_int_option(prog_args, "-n")
+            precision = get_cilk5_precision(prog)
+            # Read and write one n x n matrix.
+            bytes_per_op = 2.0*n**2*precision_bytes[precision]/(2.0*n**3/3)
+            return (2.0*n**3/3, "GFLOP/s", 1e9, 'flops', bytes_per_op, precision)
+        case "cholesky":
+            n = get_int_option(prog_args, "-n")
+            return (n**3/3.0, "GFLOP/s (dense-equivalent)", 1e9, 'flops', None,
+                    get_cilk5_precision(prog))
+        case "fft":
+            n = get_int_option(prog_args, "-n")
+            precision = get_cilk5_precision(prog)
+            # Read and write n complex elements.
+            bytes_per_op = 2.0*n*2*precision_bytes[precision]/(5.0*n*math.log2(n))
+            return (5.0*n*math.log2(n), "GFLOP/s", 1e9, 'flops', bytes_per_op, precision)
+        case "cilksort":
+            # Each 8-byte element is read and written at least once.
+            n = get_int_option(prog_args, "-n")
+            return (float(n), "Melements/s", 1e6, 'memory', 16, None)
+        case "qsort":
+            # Each 4-byte element is read and written at least once.
+            n = int(prog_args[0])
+            return (float(n), "Melements/s", 1e6, 'memory', 8, None)
+        case "heat":
+            # Each update reads and writes at least one double.
+            nx = get_int_option(prog_args, "-nx")
+            ny = get_int_option(prog_args, "-ny")
+            nt = get_int_option(prog_args, "-nt")
+            return (float(nx)*ny*nt, "Mcell-updates/s", 1e6, 'memory', 16, None)
+        case "nqueens":
+            n = int(prog_args[0])
+            return (float(count_nqueens_nodes(n)), "Mnodes/s", 1e6, None, None, None)
+        case _: raise ValueError("Unrecognized program "+prog)
+
 # Build the Cilk-5 benchmark suite for the given system and experiment.
 def build_cilk5(sys, exp):
     logger.info("Building cilk5 bencharks with '"+sys+"' for experiment '"+exp+"'.")
@@ -400,6 +720,8 @@ def run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_
         for sys in systems:
             if not sys_exp_compatible(sys, exp):
                 continue
+            if not variant_selected(("cilk5", exp, sys)):
+                continue
 
             # Build the tests
             build_cilk5(sys, exp)
@@ -413,7 +735,7 @@ def run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_
                 # Run the program and output results into out_csv
                 run(os.path.join("./cilk5/",prog), get_cilk5_input(prog, small_inputs),
                     parse_cilk5_output, trials, fix_cpu_counts(sys, cpu_counts),
-                    out_csv)
+                    out_csv, warmup_trials)
 
                 # Record that this program was run for this experiment.
                 if exp not in all_prog_run:
@@ -425,6 +747,7 @@ def run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_
                 if exp not in all_sys_run:
                     all_sys_run[exp] = []
                 accumulate_results(out_csv, prog, sys, all_sys_run[exp], exp_data)
+                record_manifest_entry(exp, out_csv, prog, sys)
 
         if not exp_data:
             continue
@@ -439,8 +762,26 @@ def run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_
 
 minife_dir = "miniFE/src"
 
+# Phases of a miniFE run to report, from the YAML file miniFE writes.
+# Each phase is a tuple of the name of the phase, the path of keys of
+# its running time in the YAML file, and the path of keys of its MFLOP
+# rate, or None.
+minife_phases = [("structure generation", ["Matrix structure generation","Mat-struc-gen Time"], None),
+                 ("FE assembly", ["FE assembly","FE assembly Time"], None),
+                 ("CG solve", ["CG solve","Total","Total CG Time"], ["CG solve","Total","Total CG Mflops"]),
+                 ("matvec", ["CG solve","MATVEC Time"], ["CG solve","MATVEC Mflops"]),
+                 ("dot", ["CG solve","DOT Time"], ["CG solve","DOT Mflops"]),
+                 ("waxpy", ["CG solve","WAXPY Time"], ["CG solve","WAXPY Mflops"]),
+                 ("total", ["Total Program Time"], None)]
+
+# Aggregated per-phase results of miniFE, indexed by experiment.  Each
+# experiment maps to a dictionary mapping (benchmark, phase, metric,
+# system, cpu-count) to the median of that metric, where metric is
+# 'time' or 'mflops'.
+minife_phase_data = dict()
+
 # MiniFE output parser.  Extracts running time in seconds from output.
-def parse_minife_output(output, err, prog, prog_args, timings):
+def parse_minife_output(output, err, prog, prog_args, timings, P):
     for line in output.split('\n'):
         m = re.match(r"Total Program Time (\d+\.\d+)", line)
         if m:
@@ -450,21 +791,235 @@ def parse_minife_output(output, err, prog, prog_args, timings):
                 timings[key] = []
             timings[key].append(val)
 
+# Get the name of the directory that keeps the YAML files of the
+# trials whose raw performance data is in out_csv.
+def minife_yaml_dir(out_csv):
+    return os.path.splitext(out_csv)[0]+"-yaml"
+
+# Get the name of the CSV file that records the per-phase performance
+# data of the trials whose raw performance data is in out_csv.
+def minife_phases_csv_name(out_csv):
+    return os.path.splitext(out_csv)[0]+"-phases.csv"
+
+# Collect the YAML file that miniFE wrote in a trial on P CPUs into
+# yaml_dir.  The YAML files of warm-up trials are removed.
+def collect_minife_yaml(yaml_dir, P, trial, warmup):
+    yaml_files = sorted(glob.glob("miniFE.*.yaml"), key=os.path.getmtime)
+    for yaml_file in yaml_files[:-1]:
+        os.remove(yaml_file)
+    if not yaml_files:
+        return
+    if warmup:
+        os.remove(yaml_files[-1])
+        return
+    if not os.path.exists(yaml_dir):
+        os.mkdir(yaml_dir)
+    shutil.move(yaml_files[-1], os.path.join(yaml_dir, "P"+str(P)+"-t"+str(trial)+".yaml"))
+
+# Parse a YAML file written by miniFE.  MiniFE writes one "key: value"
+# pair per line, indenting the children of each key by two spaces.
+# Returns a dictionary mapping each top-level key to a tuple (value,
+# children), where children is a dictionary of the same form.
+def parse_minife_yaml(path):
+    doc = dict()
+    # Stack of (indentation, children) of the keys enclosing the
+    # current line.
+    stack = [(-1, doc)]
+    with open(path, "r") as yaml_file:
+        for line in yaml_file:
+            if ':' not in line:
+                continue
+            indent = len(line) - len(line.lstrip(' '))
+            key, value = line.strip().split(':', 1)
+            while stack[-1][0] >= indent:
+                stack.pop()
+            children = dict()
+            stack[-1][1][key] = (value.strip(), children)
+            stack.append((indent, children))
+    return doc
+
+# Get the value at the given path of keys in a parsed miniFE YAML
+# file, as a float, or None if it is missing or not a finite number.
+def get_minife_yaml_value(doc, keys):
+    value = None
+    for key in keys:
+        if key not in doc:
+            return None
+        value, doc = doc[key]
+    try:
+        result = float(value)
+    except (TypeError, ValueError):
+        return None
+    if not math.isfinite(result):
+        return None
+    return result
+
+# Parse the YAML files of the trials in yaml_dir and write their
+# per-phase performance data to phases_csv.  Each row contains a phase,
+# a metric, a CPU count, and the value of the metric in each trial on
+# that CPU count.
+def write_minife_phases(yaml_dir, phases_csv):
+    trials = dict()
+    for path in glob.glob(os.path.join(yaml_dir, "P*-t*.yaml")):
+        m = re.match(r"P(\d+)-t(\d+)\.yaml", os.path.basename(path))
+        if m:
+            P, t = int(m.group(1)), int(m.group(2))
+            trials.setdefault(P, []).append((t, parse_minife_yaml(path)))
+    with open(phases_csv, "w") as phases_csv_file:
+        phases_csv_writer = csv.writer(phases_csv_file, delimiter=',')
+        for P in sorted(trials):
+            docs = [doc for (t, doc) in sorted(trials[P], key=lambda x: x[0])]
+            for (phase, time_keys, mflops_keys) in minife_phases:
+                for (metric, keys) in (('time', time_keys), ('mflops', mflops_keys)):
+                    if keys is None:
+                        continue
+                    vals = [get_minife_yaml_value(doc, keys) for doc in docs]
+                    vals = [v for v in vals if v is not None]
+                    if vals:
+                        phases_csv_writer.writerow([phase, metric, P] + vals)
+
+# Read the per-phase performance data in phases_csv, for the given
+# miniFE benchmark and system, and add the medians of each metric to
+# phase_data.
+def accumulate_minife_phases(phases_csv, bench, sys, phase_data):
+    if not os.path.exists(phases_csv):
+        return
+    with open(phases_csv, "r") as phases_csv_file:
+        for row in csv.reader(phases_csv_file, delimiter=","):
+            vals,rejected = reject_outliers([float(x) for x in row[3:]])
+            phase_data[(bench, row[0], row[1], sys, row[2])] = statistics.median(vals)
+
+# Get the columns of a CSV of results in data for the given systems,
+# where the keys of data end with a system and a cpu count.  Returns a
+# list of tuples (system, cpu count, smallest cpu count of the system).
+def get_sys_count_columns(data, sys_run, cpu_counts):
+    columns = []
+    for s in sys_run:
+        counts = fix_cpu_counts(s, cpu_counts)
+        if counts == "all" or counts == "adaptive":
+            counts = sorted(set([key[-1] for key in data if key[-2] == s]), key=int)
+        else:
+            counts = counts.split(',')
+        for c in counts:
+            columns.append((s, c, counts[0]))
+    return columns
+
+# Write the aggregated per-phase results of the miniFE benchmarks in
+# phase_data to a CSV file named phases_csv.  For each system and CPU
+# count, the CSV reports the median running time of each phase, its
+# speedup over the smallest CPU count the system ran on, and its MFLOP
+# rate, if any.
+def write_minife_phase_results(phases_csv, phase_data, prog_run, sys_run, cpu_counts):
+    with open(phases_csv, "w") as phases_csv_file:
+        phases_csv_writer = csv.writer(phases_csv_file, delimiter=',')
+        columns = get_sys_count_columns(phase_data, sys_run, cpu_counts)
+        header = ["benchmark", "phase"]
+        for (s, c, base) in columns:
+            header += [s+' '+c+' time', s+' '+c+' speedup', s+' '+c+' MFLOPS']
+        phases_csv_writer.writerow(header)
+        for bench in prog_run:
+            for (phase, time_keys, mflops_keys) in minife_phases:
+                out_row = [bench, phase]
+                for (s, c, base) in columns:
+                    t = phase_data.get((bench,phase,'time',s,c), '')
+                    t_base = phase_data.get((bench,phase,'time',s,base), '')
+                    speedup = ''
+                    if t != '' and t_base != '' and t > 0:
+                        speedup = t_base / t
+                    out_row += [t, speedup, phase_data.get((bench,phase,'mflops',s,c), '')]
+                phases_csv_writer.writerow(out_row)
+
+# Write the total running time and the CG and matvec MFLOP rates of
+# each sparse-matrix format and problem size of miniFE in phase_data to
+# a CSV file named formats_csv.
+def write_minife_format_results(formats_csv, phase_data, prog_run, sys_run, cpu_counts,
+                                small_inputs):
+    with open(formats_csv, "w") as formats_csv_file:
+        formats_csv_writer = csv.writer(formats_csv_file, delimiter=',')
+        columns = get_sys_count_columns(phase_data, sys_run, cpu_counts)
+        header = ["benchmark", "format", "nx", "ny", "nz"]
+        for (s, c, base) in columns:
+            header += [s+' '+c+' time', s+' '+c+' CG MFLOPS', s+' '+c+' matvec MFLOPS']
+        formats_csv_writer.writerow(header)
+        for bench in prog_run:
+            fmt, size = parse_minife_bench_name(bench)
+            if size is None:
+                size = get_minife_input(small_inputs)[1::2]
+            out_row = [bench, fmt] + size
+            for (s, c, base) in columns:
+                out_row += [phase_data.get((bench,'total','time',s,c), ''),
+                            phase_data.get((bench,'CG solve','mflops',s,c), ''),
+                            phase_data.get((bench,'matvec','mflops',s,c), '')]
+            formats_csv_writer.writerow(out_row)
+
 # Get program inputs for the miniFE benchmark.
 def get_minife_input(small_inputs):
     if small_inputs:
         return ["--nx","100","--ny","100","--nz","100"]
     return ["--nx","150","--ny","150","--nz","150"]
 
-# Build the miniFE test for the given system and experiment.
-def build_minife(sys, exp):
-    logger.info("Building miniFE benchark with '"+sys+"' for experiment '"+exp+"'.")
+# Get the list of program inputs for the miniFE benchmark, one for each
+# problem size to run.
+def get_minife_inputs(small_inputs):
+    if minife_sizes is None:
+        return [get_minife_input(small_inputs)]
+    return [["--nx",nx,"--ny",ny,"--nz",nz] for (nx,ny,nz) in minife_sizes]
+
+# Parse a miniFE problem size, given as N or NXxNYxNZ, into a list of
+# the nx, ny, and nz dimensions.
+def parse_minife_size(spec):
+    dims = spec.split('x')
+    if len(dims) == 1:
+        dims = dims * 3
+    if len(dims) != 3 or not all([d.isdigit() for d in dims]):
+        raise argparse.ArgumentTypeError("invalid miniFE size '"+spec+"'")
+    return dims
+
+# Get the benchmark name for miniFE built with the given sparse-matrix
+# format and run with the given program inputs.  The name only records
+# the format if it is not CSR, and the problem size if the problem sizes
+# were given explicitly.
+def get_minife_bench_name(fmt, prog_args):
+    bench = 'minife'
+    if fmt != 'csr':
+        bench += '-'+fmt
+    if minife_sizes is not None:
+        bench += '-'+'x'.join(prog_args[1::2])
+    return bench
+
+# Parse the sparse-matrix format and problem size from a miniFE
+# benchmark name.  Returns a tuple of the format and the list of the
+# nx, ny, and nz dimensions, or None if the name does not record them.
+def parse_minife_bench_name(bench):
+    fmt = 'csr'
+    size = None
+    for part in bench.split('-')[1:]:
+        if part in all_minife_formats:
+            fmt = part
+        else:
+            size = part.split('x')
+    return fmt, size
+
+# Get the directory in which to build miniFE with the given
+# sparse-matrix format.
+def get_minife_build_dir(fmt):
+    return os.path.join(os.path.dirname(minife_dir), "build-"+fmt)
+
+# Build the miniFE test for the given system, experiment, and
+# sparse-matrix format.  Each format is built in its own copy of the
+# miniFE sources, so that the builds of different formats do not
+# clobber each other.
+def build_minife(sys, exp, fmt):
+    logger.info("Building miniFE benchark with '"+sys+"' for experiment '"+exp+"' and format '"+fmt+"'.")
     set_environ_for_experiment(exp)
     os.environ['CC'] = os.path.join(compiler_bin_dir,"clang")
     os.environ['CXX'] = os.path.join(compiler_bin_dir,"clang++")
     os.environ['OMPI_MPICXX'] = os.environ['CXX']
 
-    subProcCommand = "make -C "+minife_dir+" clean; make -C "+minife_dir+" "+make_sysflag(sys)
+    build_dir = get_minife_build_dir(fmt)
+    shutil.copytree(minife_dir, build_dir, dirs_exist_ok=True,
+                    ignore=shutil.ignore_patterns("*.o", "*.x", "*.yaml"))
+    subProcCommand = "make -C "+build_dir+" clean; make -C "+build_dir+" MINIFE_MATRIX_TYPE=-DMINIFE_"+fmt.upper()+"_MATRIX "+make_sysflag(sys)
     runcmd(subProcCommand)
 
     del os.environ['OMPI_MPICXX']
@@ -482,33 +1037,53 @@ def run_minife_tests(systems, experiments, small_inputs, trials, cpu_counts, csv
             continue
 
         exp_data = dict()
+        benches = []
 
-        # Iterate over the systems to run.
+        # Iterate over the systems and sparse-matrix formats to run.
         for sys in systems:
             if not sys_exp_compatible(sys, exp):
                 continue
-            # Build the test
-            build_minife(sys, exp)
-            out_csv = os.path.join(rawdata_dir,
-                                   "minife-"+'-'.join([sys,exp,csv_tag])+".csv")
-            # Run the test and output the results into out_csv
-            run(os.path.join(minife_dir,"miniFE.x"), get_minife_input(small_inputs),
-                parse_minife_output, trials, fix_cpu_counts(sys, cpu_counts),
-                out_csv)
-
-            # Aggregate the results in out_csv.
-            if exp not in all_sys_run:
-                all_sys_run[exp] = []
-            accumulate_results(out_csv, 'minife', sys, all_sys_run[exp], exp_data)
+            for fmt in minife_formats:
+                if not variant_selected(("minife", exp, sys, fmt)):
+                    continue
+                # Build the test
+                build_minife(sys, exp, fmt)
+                for prog_args in get_minife_inputs(small_inputs):
+                    bench = get_minife_bench_name(fmt, prog_args)
+                    out_csv = os.path.join(rawdata_dir,
+                                           bench+"-"+'-'.join([sys,exp,csv_tag])+".csv")
+                    # Run the test and output the results into out_csv.
+                    # Keep the YAML file of each trial, and extract the
+                    # performance of each phase from them.
+                    yaml_dir = minife_yaml_dir(out_csv)
+                    set_trial_hook(lambda P, trial, warmup: collect_minife_yaml(yaml_dir, P, trial, warmup))
+                    try:
+                        run(os.path.join(get_minife_build_dir(fmt),"miniFE.x"), prog_args,
+                            parse_minife_output, trials, fix_cpu_counts(sys, cpu_counts),
+                            out_csv, warmup_trials)
+                    finally:
+                        set_trial_hook(None)
+                    write_minife_phases(yaml_dir, minife_phases_csv_name(out_csv))
+
+                    # Aggregate the results in out_csv.
+                    if exp not in all_sys_run:
+                        all_sys_run[exp] = []
+                    accumulate_results(out_csv, bench, sys, all_sys_run[exp], exp_data)
+                    accumulate_minife_phases(minife_phases_csv_name(out_csv), bench, sys,
+                                             minife_phase_data.setdefault(exp, dict()))
+                    record_manifest_entry(exp, out_csv, bench, sys)
+                    if bench not in benches:
+                        benches.append(bench)
 
         if not exp_data:
             continue
 
-        # Record that this program was run for this experiment.
+        # Record that these programs were run for this experiment.
         if exp not in all_prog_run:
             all_prog_run[exp] = []
-        if 'minife' not in all_prog_run[exp]:
-            all_prog_run[exp].append('minife')
+        for bench in benches:
+            if bench not in all_prog_run[exp]:
+                all_prog_run[exp].append(bench)
 
         # Add the results of this experiment to accum_data.
         if exp not in accum_data:
@@ -518,15 +1093,115 @@ def run_minife_tests(systems, experiments, small_inputs, trials, cpu_counts, csv
 ###########################################################################
 ## GBBS benchmark handling (gbbs subdirectory)
 
+# Aggregated graph-load and per-round results of GBBS, indexed by
+# experiment.  Each experiment maps to a dictionary mapping (benchmark,
+# kind, system, cpu-count) to the median of that kind of timing, where
+# kind is 'load', 'warmup', or 'round'.
+gbbs_load_data = dict()
+
+# Get the names of the graphs in the graph catalog on which to run the
+# GBBS benchmarks, in each order of their vertices.
+def get_gbbs_graph_names(small_inputs):
+    graphs = gbbs_graphs
+    if graphs is None:
+        graphs = ['livejournal' if small_inputs else 'orkut']
+    return [reordered_graph_name(g, order) for g in graphs for order in gbbs_orders]
+
+# Get the format of the graph file that a GBBS benchmark loads in the
+# given load mode: 'compressed', 'binary', or 'text'.
+def get_gbbs_load_format(load_mode):
+    return load_mode.split('-')[0]
+
+# Get the path of the given graph in the graph catalog, in the format
+# loaded in the given load mode.
+def get_gbbs_graph(graph, load_mode='compressed-mmap'):
+    return os.path.join(".", get_graph_path(graph, get_gbbs_load_format(load_mode)))
+
+# Prepare the graphs on which to run the GBBS benchmarks, in the
+# formats that the load modes use, unless they are in the graph catalog
+# already.  Then evict other graphs from the catalog to keep it within
+# its disk budget.  Returns the names of the graphs.
+def prepare_gbbs_graphs(small_inputs):
+    graphs = get_gbbs_graph_names(small_inputs)
+    fmts = []
+    for load_mode in gbbs_load_modes:
+        if get_gbbs_load_format(load_mode) not in fmts:
+            fmts.append(get_gbbs_load_format(load_mode))
+    for graph in graphs:
+        if not graph_missing(graph, fmts):
+            continue
+        logger.info("Preparing graph '"+graph+"' in formats "+str(fmts)+".")
+        config = set_bazel_sysconfig("opencilk")
+        try:
+            prepare_graph(graph, fmts, config)
+        except subprocess.CalledProcessError as e:
+            logger.error("Failed to prepare graph '"+graph+"': "+str(e))
+            if build_output_fo is not None:
+                build_output_fo.write(str(e.stdout, 'utf-8')+str(e.stderr, 'utf-8'))
+        finally:
+            unset_bazel_sysconfig("opencilk")
+    used = [get_graph_path(graph, fmt) for graph in graphs for fmt in fmts]
+    touch_graph_files(used)
+    if graph_cache_budget is not None:
+        evict_graphs(graph_cache_budget, used)
+    return graphs
+
+# Get the flags with which a GBBS benchmark loads its graph in the given
+# load mode.
+def get_gbbs_load_flags(load_mode):
+    flags = []
+    if get_gbbs_load_format(load_mode) == 'compressed':
+        flags.append("-c")
+    elif get_gbbs_load_format(load_mode) == 'binary':
+        flags.append("-b")
+    if load_mode.endswith("mmap"):
+        flags.append("-m")
+    return flags
+
 # Get program inputs for the specified GBBS benchmark.
 #
 # This method takes the number of trials, because we use the "-rounds"
 # argument to the binary run multiple trials on the same graph
 # efficiently.
-def get_gbbs_input(prog, trials, small_inputs):
-    if small_inputs:
-        return ["-rounds",trials,"-c","-m","-s","-src","10","./gbbs/inputs/soc-LiveJournal1.bin"]
-    return ["-rounds",trials,"-c","-m","-s","-src","10","./gbbs/inputs/com-orkut.bin"]
+def get_gbbs_input(prog, trials, graph, load_mode='compressed-mmap'):
+    return ["-rounds",trials]+get_gbbs_load_flags(load_mode)+ \
+        ["-s","-src","10",get_gbbs_graph(graph, load_mode)]
+
+# Get the number of rounds of each GBBS run to treat as warm-up.  The
+# first round always pays for faulting in the graph, so it is never
+# included in the results.
+def gbbs_warmup_rounds():
+    return max(1, warmup_trials)
+
+# Get the benchmark name for the GBBS test run on the given graph in
+# the given load mode.  The name only records the graph if the graphs
+# or orders were given explicitly, and the load mode if it is not the
+# default.
+def get_gbbs_bench_name(test, graph, load_mode):
+    bench = test
+    if gbbs_graphs is not None or gbbs_orders != ['original']:
+        bench += '-'+graph
+    if load_mode != 'compressed-mmap':
+        bench += '-'+load_mode
+    return bench
+
+# Parse the test name, graph, and load mode from a GBBS benchmark name.
+# Returns a tuple of the test name, the graph name, or None if the name
+# does not record it, and the load mode.
+def parse_gbbs_bench_name(bench):
+    load_mode = 'compressed-mmap'
+    for mode in all_gbbs_load_modes:
+        if bench.endswith('-'+mode):
+            bench, load_mode = bench[:-len(mode)-1], mode
+            break
+    test, sep, graph = bench.partition('-')
+    return (test, graph if sep else None, load_mode)
+
+# Returns True if the given benchmark name is that of a non-randomized
+# GBBS test whose name records its graph.
+def is_gbbs_graph_bench(bench):
+    test, graph, load_mode = parse_gbbs_bench_name(bench)
+    return graph is not None and test in [get_test_name_from_prog(p) for p in all_gbbs_progs]
 
 # Parse the short test name from the given GBBS benchmark name.
 def get_test_name_from_prog(prog):
@@ -537,9 +1212,21 @@ def get_exe_for_prog(prog):
     return re.sub(':','/',prog)
 
 # GBBS output parser.  Extracts the application name, graph name, and
-# running time in seconds from output.
-def parse_gbbs_output(output, err, prog, prog_args, timings):
+# running time in seconds from output of a run on P CPUs.  If rounds is
+# given, also records the graph-load time and the running time of every
+# round in rounds, which maps a tuple (benchmark key, CPU count) to a
+# tuple of the time to load the graph and the list of the running times
+# of all rounds, including warm-up rounds.
+def parse_gbbs_output(output, err, prog, prog_args, timings, P, rounds=None):
+    load = None
     for line in output.split('\n'):
+        # Try to get the time to load the graph, which is reported
+        # before the application runs.
+        m = re.match(r"### Graph Load Time: (\d+\.\d+)", line)
+        if m:
+            load = m.group(1)
+            continue
+
         # Try to get the application name
         m = re.match(r"### Application: ([^\s]+)", line)
         if m:
@@ -560,6 +1247,123 @@ def parse_gbbs_output(output, err, prog, prog_args, timings):
             if key not in timings:
                 timings[key] = []
             timings[key].append(val)
+            if rounds is not None:
+                if (key, P) not in rounds:
+                    rounds[(key, P)] = (load, [])
+                rounds[(key, P)][1].append(val)
+
+# Get the name of the CSV file that records the graph-load and
+# per-round timings of the GBBS runs whose raw performance data is in
+# out_csv.
+def gbbs_rounds_csv_name(out_csv):
+    return os.path.splitext(out_csv)[0]+"-rounds.csv"
+
+# Write the graph-load and per-round timings in rounds, collected by
+# parse_gbbs_output, to rounds_csv.  Each row contains a kind of timing
+# ('load', 'warmup', or 'round'), a CPU count, and the timings of that
+# kind on that CPU count.
+def write_gbbs_rounds(rounds_csv, rounds, warmup_rounds):
+    with open(rounds_csv, "w") as rounds_csv_file:
+        rounds_csv_writer = csv.writer(rounds_csv_file, delimiter=',')
+        for (key, P) in sorted(rounds, key=lambda x: x[1]):
+            load, vals = rounds[(key, P)]
+            if load is not None:
+                rounds_csv_writer.writerow(['load', P, load])
+            if vals[:warmup_rounds]:
+                rounds_csv_writer.writerow(['warmup', P] + vals[:warmup_rounds])
+            if vals[warmup_rounds:]:
+                rounds_csv_writer.writerow(['round', P] + vals[warmup_rounds:])
+
+# Read the graph-load and per-round timings in rounds_csv, for the
+# given GBBS benchmark and system, and add them to load_data.  Load
+# and round timings are aggregated by their medians, while warm-up
+# rounds are represented by the first round.
+def accumulate_gbbs_rounds(rounds_csv, bench, sys, load_data):
+    if not os.path.exists(rounds_csv):
+        return
+    with open(rounds_csv, "r") as rounds_csv_file:
+        for row in csv.reader(rounds_csv_file, delimiter=","):
+            vals = [float(x) for x in row[2:]]
+            if row[0] == 'warmup':
+                load_data[(bench, row[0], sys, row[1])] = vals[0]
+            else:
+                vals,rejected = reject_outliers(vals)
+                load_data[(bench, row[0], sys, row[1])] = statistics.median(vals)
+
+# Write the aggregated graph-load results of the GBBS benchmarks in
+# load_data to a CSV file named load_csv.  For each system and CPU
+# count, the CSV reports the time to load the graph, the time of the
+# first round, the median time of the remaining rounds, and the ratio
+# of the load time to that median.
+def write_gbbs_load_results(load_csv, load_data, prog_run, sys_run, cpu_counts):
+    with open(load_csv, "w") as load_csv_file:
+        load_csv_writer = csv.writer(load_csv_file, delimiter=',')
+        columns = get_sys_count_columns(load_data, sys_run, cpu_counts)
+        header = ["benchmark", "graph", "load mode"]
+        for (s, c, base) in columns:
+            header += [s+' '+c+' load', s+' '+c+' first round', s+' '+c+' round',
+                       s+' '+c+' load/round']
+        load_csv_writer.writerow(header)
+        for bench in prog_run:
+            test, graph, load_mode = parse_gbbs_bench_name(bench)
+            out_row = [bench, graph, load_mode]
+            for (s, c, base) in columns:
+                load = load_data.get((bench,'load',s,c), '')
+                rnd = load_data.get((bench,'round',s,c), '')
+                ratio = ''
+                if load != '' and rnd != '' and rnd > 0:
+                    ratio = load / rnd
+                out_row += [load, load_data.get((bench,'warmup',s,c), ''), rnd, ratio]
+            load_csv_writer.writerow(out_row)
+
+# Get the ranking of the systems in sys_run by their running times in
+# accum_data of the given GBBS benchmark on the given CPU count, as a
+# string listing the systems from fastest to slowest.
+def get_gbbs_ranking(accum_data, bench, sys_run, c):
+    times = [(accum_data[(bench,s,c)], s) for s in sys_run if (bench,s,c) in accum_data]
+    return ' < '.join([s for (t, s) in sorted(times)])
+
+# Write the aggregated results of the GBBS benchmarks in accum_data on
+# reordered graphs to a CSV file named orders_csv.  For each benchmark,
+# graph, and order, the CSV reports the running time on each system and
+# CPU count and its ratio to the running time on the graph in its
+# original order.  For each CPU count, it reports the ranking of the
+# systems and whether that ranking matches the ranking on the original
+# order.
+def write_gbbs_order_results(orders_csv, accum_data, prog_run, sys_run, cpu_counts):
+    with open(orders_csv, "w") as orders_csv_file:
+        orders_csv_writer = csv.writer(orders_csv_file, delimiter=',')
+        columns = get_sys_count_columns(accum_data, sys_run, cpu_counts)
+        counts = []
+        for (s, c, base) in columns:
+            if c not in counts:
+                counts.append(c)
+        header = ["benchmark", "test", "graph", "order", "load mode"]
+        for (s, c, base) in columns:
+            header += [s+' '+c+' time', s+' '+c+' time/original']
+        for c in counts:
+            header += [c+' ranking', c+' same ranking']
+        orders_csv_writer.writerow(header)
+        for bench in prog_run:
+            test, graph, load_mode = parse_gbbs_bench_name(bench)
+            graph, order = split_graph_name(graph)
+            orig = get_gbbs_bench_name(test, graph, load_mode)
+            out_row = [bench, test, graph, order, load_mode]
+            for (s, c, base) in columns:
+                t = accum_data.get((bench,s,c), '')
+                t_orig = accum_data.get((orig,s,c), '')
+                ratio = ''
+                if t != '' and t_orig != '' and t_orig > 0:
+                    ratio = t / t_orig
+                out_row += [t, ratio]
+            for c in counts:
+                ranking = get_gbbs_ranking(accum_data, bench, sys_run, c)
+                orig_ranking = get_gbbs_ranking(accum_data, orig, sys_run, c)
+                same = ''
+                if ranking and orig_ranking:
+                    same = ranking == orig_ranking
+                out_row += [ranking, same]
+            orders_csv_writer.writerow(out_row)
 
 # Build the specified GBBS benchmark for the given system and experiment
 # or DPRNG.
@@ -590,6 +1394,7 @@ def build_gbbs(sys, exp, dprng, prog):
 # experiments, with the given configuration options.
 def run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
                    accum_data, all_prog_run, all_sys_run, programs=all_gbbs_progs):
+    graphs = prepare_gbbs_graphs(small_inputs)
     for exp in experiments:
         # The non-randomized GBBS tests are not used for the DPRNG
         # experiment.
@@ -607,27 +1412,47 @@ def run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_t
             for prog in programs:
                 if prog not in all_gbbs_progs:
                     continue
+                if not variant_selected(("gbbs", exp, sys, prog)):
+                    continue
 
                 test = get_test_name_from_prog(prog)
                 # Combine the program.
                 build_gbbs(sys, exp, "", prog)
-                out_csv = os.path.join(rawdata_dir,
-                                       '-'.join(["gbbs",test,sys,exp,csv_tag])+".csv")
-                # Run the program and output the results into out_csv.
-                run(os.path.join("./gbbs/bazel-bin/benchmarks/",get_exe_for_prog(prog)),
-                    get_gbbs_input(prog, trials, small_inputs), parse_gbbs_output,
-                    "1", fix_cpu_counts(sys, cpu_counts), out_csv)
-
-                # Record that this program was run for this experiment.
-                if exp not in all_prog_run:
-                    all_prog_run[exp] = []
-                if test not in all_prog_run[exp]:
-                    all_prog_run[exp].append(test)
-
-                # Aggregate the results in out_csv.
-                if exp not in all_sys_run:
-                    all_sys_run[exp] = []
-                accumulate_results(out_csv, test, sys, all_sys_run[exp], exp_data)
+                # Iterate over the graphs and the ways to load them.
+                for (graph, load_mode) in [(g, l) for g in graphs for l in gbbs_load_modes]:
+                    prog_args = get_gbbs_input(prog, str(int(trials)+gbbs_warmup_rounds()),
+                                               graph, load_mode)
+                    if not os.path.exists(prog_args[-1]):
+                        logger.warning("Skipping GBBS benchark '"+prog+"' in load mode '"+load_mode+
+                                       "': graph "+prog_args[-1]+" not found.")
+                        continue
+                    bench = get_gbbs_bench_name(test, graph, load_mode)
+                    out_csv = os.path.join(rawdata_dir,
+                                           '-'.join(["gbbs",bench,sys,exp,csv_tag])+".csv")
+                    # Run the program and output the results into
+                    # out_csv.  Record the graph-load time and the time
+                    # of every round separately.
+                    rounds = dict()
+                    run(os.path.join("./gbbs/bazel-bin/benchmarks/",get_exe_for_prog(prog)),
+                        prog_args,
+                        lambda out, err, exe, args, timings, P:
+                            parse_gbbs_output(out, err, exe, args, timings, P, rounds),
+                        "1", fix_cpu_counts(sys, cpu_counts), out_csv, gbbs_warmup_rounds(), True)
+                    write_gbbs_rounds(gbbs_rounds_csv_name(out_csv), rounds, gbbs_warmup_rounds())
+
+                    # Record that this program was run for this experiment.
+                    if exp not in all_prog_run:
+                        all_prog_run[exp] = []
+                    if bench not in all_prog_run[exp]:
+                        all_prog_run[exp].append(bench)
+
+                    # Aggregate the results in out_csv.
+                    if exp not in all_sys_run:
+                        all_sys_run[exp] = []
+                    accumulate_results(out_csv, bench, sys, all_sys_run[exp], exp_data)
+                    accumulate_gbbs_rounds(gbbs_rounds_csv_name(out_csv), bench, sys,
+                                           gbbs_load_data.setdefault(exp, dict()))
+                    record_manifest_entry(exp, out_csv, bench, sys)
 
         if not exp_data:
             continue
@@ -642,7 +1467,7 @@ def run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_t
 
 # Output parser for assorted randomized Cilk programs.  Extracts
 # running time in seconds from output.
-def parse_randbench_output(output, err, prog, prog_args, timings):
+def parse_randbench_output(output, err, prog, prog_args, timings, P):
     for line in output.split('\n'):
         m = re.match(r"([^\s]+).*,\D+time\D+(\d+\.\d+)", line.lower())
         if m:
@@ -655,18 +1480,152 @@ def parse_randbench_output(output, err, prog, prog_args, timings):
 # Get program inputs for the specified randomized Cilk benchmark.
 #
 # This method takes the number of trials, because we let the
-# executable itself run multiple trials efficiently.
-def get_randbench_input(prog, trials, small_inputs):
+# executable itself run multiple trials efficiently.  If size is given,
+# it overrides the default problem size.
+def get_randbench_input(prog, trials, small_inputs, size=None):
+    if size is not None:
+        return [str(size),trials]
     if small_inputs:
         match prog:
-            case "pi": return ["10000000",trials]
+            case "pi" | "pi_unbalanced": return ["10000000",trials]
             case "fib_rng": return ["35",trials]
+            case "quicksort_rng" | "skiplist_rng": return ["1000000",trials]
+            case "randwalk_rng": return ["16",trials]
+            case "option_rng": return ["100000",trials]
             case _: raise ValueError("Unrecognized program "+prog)
     match prog:
-        case "pi": return ["100000000",trials]
+        case "pi" | "pi_unbalanced": return ["100000000",trials]
         case "fib_rng": return ["40",trials]
+        case "quicksort_rng" | "skiplist_rng": return ["10000000",trials]
+        case "randwalk_rng": return ["20",trials]
+        case "option_rng": return ["1000000",trials]
         case _: raise ValueError("Unrecognized program "+prog)
 
+# Get the problem sizes on which to run the specified randomized Cilk
+# benchmark, as a list whose single entry is None for the default size.
+def get_randbench_sizes(prog):
+    if prog == "fib_rng" and fib_depths is not None:
+        return fib_depths
+    return [None]
+
+# Get the benchmark name for the randomized Cilk benchmark run with the
+# given problem size, which the name only records if it is not the
+# default.
+def get_randbench_bench_name(prog, size):
+    if size is None:
+        return prog
+    return prog+'-'+str(size)
+
+# Parse a list of fib_rng recursion depths, given as a comma-separated
+# list of depths N or ranges N1:N2, optionally with a step as N1:N2:S.
+def parse_fib_depths(spec):
+    depths = []
+    for item in spec.split(','):
+        bounds = item.split(':')
+        if len(bounds) > 3 or not all([b.isdigit() for b in bounds]):
+            raise argparse.ArgumentTypeError("invalid fib depth '"+item+"'")
+        if len(bounds) == 1:
+            depths.append(int(bounds[0]))
+        else:
+            step = int(bounds[2]) if len(bounds) == 3 else 1
+            if step < 1:
+                raise argparse.ArgumentTypeError("invalid fib depth '"+item+"'")
+            depths += list(range(int(bounds[0]), int(bounds[1])+1, step))
+    return depths
+
+# Get the approximate depth of the spawn tree of a cilk_for loop of n
+# iterations.  Its grain size depends on the number of workers, and is
+# at most 2048.
+def get_cilk_for_depth(n):
+    return max(math.ceil(math.log2(n / 2048)), 0)
+
+# Get the number of random numbers that the specified randomized Cilk
+# benchmark generates per trial, and the depth of its spawn tree,
+# which bounds the length of the pedigrees of the random numbers.  The
+# counts and depths of quicksort_rng, whose recursion is random, are
+# expected values for a cutoff of 256 elements.
+def get_randbench_work(prog, prog_args):
+    n = int(prog_args[0])
+    match prog:
+        case "fib_rng":
+            # Every leaf, fib(0) or fib(1), gets one random number.
+            leaves = [1, 1]
+            for i in range(2, n+1):
+                leaves.append(leaves[-1] + leaves[-2])
+            return (leaves[n], max(n-1, 0))
+        case "pi":
+            return (2*n, get_cilk_for_depth(n))
+        case "pi_unbalanced":
+            # Mirror the uneven split of count_inside() in pi.cpp.
+            depth = 0
+            while n > 2048:
+                n -= n // 8
+                depth += 1
+            return (2*int(prog_args[0]), depth)
+        case "quicksort_rng":
+            # One pivot per partitioning stage, and the average depth of
+            # a node of a random binary search tree.
+            if n <= 256:
+                return (0, 0)
+            return (2*(n+1)//(256+2) - 1, math.ceil(2*math.log(n / 256)))
+        case "skiplist_rng":
+            # One random height per key.
+            return (n, get_cilk_for_depth(n))
+        case "randwalk_rng":
+            # One random number per step of the 32-step walk from each
+            # of the 2^n vertices.
+            return (32 * 2**n, get_cilk_for_depth(2**n))
+        case "option_rng":
+            # One uniform per step of the 64-step path of each option.
+            return (64*n, get_cilk_for_depth(n))
+        case _: raise ValueError("Unrecognized program "+prog)
+
+# Write the throughput of the DPRNGs in the randomized Cilk benchmarks
+# in accum_data to a CSV file named throughput_csv.  For each
+# benchmark, the CSV reports the number of random numbers generated and
+# the depth of the spawn tree, and for each system, DPRNG, and CPU
+# count, the running time and the millions of random numbers generated
+# per second per worker.  For each CPU count, it reports the ratio of
+# the throughput of the builtin DPRNG to that of the dotmix DPRNG of
+# each system.  Returns False if no randomized Cilk benchmarks ran.
+def write_rng_throughput_results(throughput_csv, accum_data, prog_run, sys_run, cpu_counts,
+                                 small_inputs):
+    benches = [b for b in prog_run if b.partition('-')[0] in all_randbench_progs]
+    if not benches:
+        return False
+    with open(throughput_csv, "w") as throughput_csv_file:
+        throughput_csv_writer = csv.writer(throughput_csv_file, delimiter=',')
+        columns = get_sys_count_columns(accum_data, sys_run, cpu_counts)
+        base_systems = [s for s in sys_run if s.endswith(' dotmix') and
+                        s[:-len('dotmix')]+'builtin' in sys_run]
+        header = ["benchmark", "program", "size", "random numbers", "spawn depth"]
+        for (s, c, base) in columns:
+            header += [s+' '+c+' time', s+' '+c+' Mnumbers/s/worker']
+        for s in base_systems:
+            for c in get_cpu_count_columns(s, cpu_counts, accum_data):
+                header.append(s[:-len(' dotmix')]+' '+c+' builtin/dotmix')
+        throughput_csv_writer.writerow(header)
+        for bench in benches:
+            prog, sep, size = bench.partition('-')
+            prog_args = get_randbench_input(prog, "1", small_inputs, size if sep else None)
+            count, depth = get_randbench_work(prog, prog_args)
+            out_row = [bench, prog, prog_args[0], count, depth]
+            rates = dict()
+            for (s, c, base) in columns:
+                t = accum_data.get((bench,s,c), '')
+                if t == '' or float(t) <= 0:
+                    out_row += [t, '']
+                    continue
+                rates[(s,c)] = count / float(t) / int(c) / 1e6
+                out_row += [t, rates[(s,c)]]
+            for s in base_systems:
+                for c in get_cpu_count_columns(s, cpu_counts, accum_data):
+                    builtin = rates.get((s[:-len('dotmix')]+'builtin',c))
+                    dotmix = rates.get((s,c))
+                    out_row.append('' if builtin is None or dotmix is None else builtin / dotmix)
+            throughput_csv_writer.writerow(out_row)
+    return True
+
 # Build the randomized Cilk programs for the given system.  These
 # programs are hard-coded to test different DPRNGs.
 def build_randbench(sys):
@@ -691,6 +1650,8 @@ def run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
     for sys in systems:
         if sys == "serial" or sys == "openmp" or sys == "tbb":
             continue
+        if not variant_selected(("random", sys)):
+            continue
         # Build the tests
         build_randbench(sys)
 
@@ -698,19 +1659,24 @@ def run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
         for prog in programs:
             if prog not in all_randbench_progs:
                 continue
-            out_csv = os.path.join(rawdata_dir,
-                                   '-'.join(["random",prog,sys,csv_tag])+".csv")
-            # Run the program and output results into out_csv
-            run(os.path.join("./random/",prog), get_randbench_input(prog, trials, small_inputs),
-                parse_randbench_output, "1", fix_cpu_counts(sys, cpu_counts),
-                out_csv)
+            # Iterate over the problem sizes to run on.
+            for size in get_randbench_sizes(prog):
+                bench = get_randbench_bench_name(prog, size)
+                out_csv = os.path.join(rawdata_dir,
+                                       '-'.join(["random",bench,sys,csv_tag])+".csv")
+                # Run the program and output results into out_csv
+                run(os.path.join("./random/",prog),
+                    get_randbench_input(prog, with_warmup(trials), small_inputs, size),
+                    parse_randbench_output, "1", fix_cpu_counts(sys, cpu_counts),
+                    out_csv, warmup_trials, True)
 
-            # Record taht this program was run for this experiment.
-            if prog not in prog_run:
-                prog_run.append(prog)
+                # Record taht this program was run for this experiment.
+                if bench not in prog_run:
+                    prog_run.append(bench)
 
-            # Aggregate the results in out_csv.
-            accumulate_results(out_csv, prog, sys, sys_run, accum_data, parse_randbench_name)
+                # Aggregate the results in out_csv.
+                accumulate_results(out_csv, bench, sys, sys_run, accum_data, parse_randbench_name)
+                record_manifest_entry('dprng', out_csv, bench, sys, parse_randbench_name)
 
 ## Randomized GBBS benchmark handling (gbbs subdirectory)
 
@@ -718,6 +1684,7 @@ def run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
 # DPRNGs, with the given configuration options.
 def run_rng_gbbs_tests(systems, dprngs, small_inputs, trials, cpu_counts, csv_tag,
                        accum_data, prog_run, sys_run, programs = all_rng_gbbs_progs):
+    graphs = prepare_gbbs_graphs(small_inputs)
     # Iterate over the systems to run.
     for sys in systems:
         # Iterate over the DPRNGs to use.
@@ -728,22 +1695,641 @@ def run_rng_gbbs_tests(systems, dprngs, small_inputs, trials, cpu_counts, csv_ta
             for prog in programs:
                 if prog not in all_rng_gbbs_progs:
                     continue
+                if not variant_selected(("gbbs-random", sys, dprng, prog)):
+                    continue
                 test = get_test_name_from_prog(prog)
                 # Build the test.
                 build_gbbs(sys, 'dprng', dprng, prog)
-                out_csv = os.path.join(rawdata_dir,
-                                       '-'.join(["gbbs","random",test,sys,dprng,csv_tag])+".csv")
-                # Run the program and output results into out_csv
-                run(os.path.join("./gbbs/bazel-bin/benchmarks/",get_exe_for_prog(prog)),
-                    get_gbbs_input(prog, trials, small_inputs), parse_gbbs_output,
-                    "1", fix_cpu_counts(sys, cpu_counts), out_csv)
+                # Iterate over the graphs to run on.
+                for graph in graphs:
+                    bench = get_gbbs_bench_name(test, graph, 'compressed-mmap')
+                    out_csv = os.path.join(rawdata_dir,
+                                           '-'.join(["gbbs","random",bench,sys,dprng,csv_tag])+".csv")
+                    # Run the program and output results into out_csv
+                    run(os.path.join("./gbbs/bazel-bin/benchmarks/",get_exe_for_prog(prog)),
+                        get_gbbs_input(prog, str(int(trials)+gbbs_warmup_rounds()), graph),
+                        parse_gbbs_output, "1", fix_cpu_counts(sys, cpu_counts), out_csv,
+                        gbbs_warmup_rounds(), True)
+
+                    # Record that this program was run for this experiment.
+                    if bench not in prog_run:
+                        prog_run.append(bench)
+
+                    # Aggregate the results in out_csv.
+                    accumulate_results(out_csv, bench, sys+" "+dprng, sys_run, accum_data)
+                    record_manifest_entry('dprng', out_csv, bench, sys+" "+dprng)
 
-                # Record that this program was run for this experiment.
-                if test not in prog_run:
-                    prog_run.append(test)
+###########################################################################
+### Methods for running build variants
 
-                # Aggregate the results in out_csv.
-                accumulate_results(out_csv, test, sys+" "+dprng, sys_run, accum_data)
+# Get a string that identifies the given build variant.
+def variant_key(variant):
+    return '|'.join(variant)
+
+# Build and run the tests of the given build variant, with the given
+# configuration options.
+def run_build_variant(variant, systems, experiments, small_inputs, trials, cpu_counts,
+                      csv_tag, accum_data, all_prog_run, all_sys_run, programs):
+    global selected_variants, current_variant
+    selected_variants = set([variant])
+    current_variant = variant
+    test_suite = variant[0]
+    if test_suite == 'cilk5':
+        # Run the Cilk-5 benchmarks for all experiments.
+        if programs is not None:
+            run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
+                            accum_data, all_prog_run, all_sys_run, programs)
+        else:
+            run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
+                            accum_data, all_prog_run, all_sys_run)
+    elif test_suite == 'gbbs':
+        # Run the non-randomized GBBS benchmarks for all experiments.
+        if programs is not None:
+            run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
+                           accum_data, all_prog_run, all_sys_run, programs)
+        else:
+            run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
+                           accum_data, all_prog_run, all_sys_run)
+    elif test_suite == 'minife':
+        # Run the miniFE benchmark for all experiments.
+        run_minife_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
+                         accum_data, all_prog_run, all_sys_run)
+    elif test_suite == 'random' or test_suite == 'gbbs-random':
+        # The random and gbbs-random suites only apply to the DPRNG
+        # experiment.  If necessary, initialize the appropriate
+        # entries in accum_data, all_prog_run, and all_sys_run.
+        if 'dprng' not in accum_data:
+            accum_data['dprng'] = dict()
+            all_prog_run['dprng'] = []
+            all_sys_run['dprng'] = []
+
+        if test_suite == 'random':
+            # Run the assorted randomized benchmarks.
+            if programs is not None:
+                run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
+                                    accum_data['dprng'], all_prog_run['dprng'],
+                                    all_sys_run['dprng'], programs)
+            else:
+                run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
+                                    accum_data['dprng'], all_prog_run['dprng'],
+                                    all_sys_run['dprng'])
+        else:
+            # Run the randomized GBBS benchmarks.
+            if programs is not None:
+                run_rng_gbbs_tests(systems, all_dprngs, small_inputs, trials, cpu_counts,
+                                   csv_tag, accum_data['dprng'], all_prog_run['dprng'],
+                                   all_sys_run['dprng'], programs)
+            else:
+                run_rng_gbbs_tests(systems, all_dprngs, small_inputs, trials, cpu_counts,
+                                   csv_tag, accum_data['dprng'], all_prog_run['dprng'],
+                                   all_sys_run['dprng'])
+    selected_variants = None
+    current_variant = None
+
+###########################################################################
+### Methods for estimating running times and reporting progress
+###
+### Each run appends the wall-clock time of every build and of every
+### set of trials on a CPU count (a "cell") to a history file.  Later
+### runs use that history to estimate the cost of each build variant,
+### in order to order build variants, report an ETA, and stay within a
+### time budget.
+
+history_csv = os.path.join(top_dir, rawdata_dir, "history.csv")
+
+# Default estimates, in seconds, for builds and for single trials that
+# have no history.
+default_build_seconds = {'gbbs': 300.0, 'gbbs-random': 300.0}
+default_make_build_seconds = 30.0
+default_trial_seconds = 10.0
+
+# Build variant currently being built or run.
+current_variant = None
+# Progress of this run.
+progress = dict()
+
+# Append a row to the history file.
+def append_history(row):
+    with open(history_csv, "a") as history_csv_file:
+        csv.writer(history_csv_file, delimiter=',').writerow(row)
+
+# Load the history file.  Returns a dictionary mapping each build
+# variant key to a list of build times, and a dictionary mapping each
+# (build variant key, program, small inputs, CPU count) tuple to a list
+# of running times per trial.
+def load_history():
+    builds = dict()
+    cells = dict()
+    if not os.path.exists(history_csv):
+        return builds, cells
+    with open(history_csv, "r") as history_csv_file:
+        for row in csv.reader(history_csv_file, delimiter=","):
+            if len(row) != 7:
+                continue
+            kind, key, prog, small, P, trials, seconds = row
+            if kind == "build":
+                builds.setdefault(key, []).append(float(seconds))
+            elif kind == "cell":
+                cells.setdefault((key, prog, small, int(P)), []).append(float(seconds) / int(trials))
+    return builds, cells
+
+# Get the cells that the given build variant runs, as a list of
+# (program, CPU count) pairs, where program is the name of the binary.
+def get_variant_cells(variant, programs, small_inputs, cpu_counts):
+    test_suite = variant[0]
+    if test_suite == 'cilk5':
+        sys = variant[2]
+        progs = [p for p in (all_cilk5_progs if programs is None else programs) if p in all_cilk5_progs]
+    elif test_suite == 'minife':
+        sys = variant[2]
+        progs = ["miniFE.x"] * (1 if minife_sizes is None else len(minife_sizes))
+    elif test_suite == 'gbbs':
+        sys = variant[2]
+        progs = [os.path.basename(get_exe_for_prog(variant[3]))] * \
+            (len(get_gbbs_graph_names(small_inputs)) * len(gbbs_load_modes))
+    elif test_suite == 'random':
+        sys = variant[1]
+        progs = [p for p in (all_randbench_progs if programs is None else programs)
+                 if p in all_randbench_progs for size in get_randbench_sizes(p)]
+    else:
+        sys = variant[1]
+        progs = [os.path.basename(get_exe_for_prog(variant[3]))] * len(get_gbbs_graph_names(small_inputs))
+
+    ncpus = get_n_cpus()
+    counts = fix_cpu_counts(sys, cpu_counts)
+    if counts == "all":
+        counts = list(range(1, ncpus+1))
+    elif counts == "adaptive":
+        counts = geometric_cpu_counts(ncpus)
+    else:
+        counts = [c for c in map(int, counts.split(',')) if c <= ncpus]
+    return [(prog, c) for prog in progs for c in counts]
+
+# Estimate the running time of the given build variant from history.
+# Returns the estimated number of seconds and the number of cells the
+# build variant runs.
+def estimate_variant_cost(variant, history, programs, small_inputs, trials, cpu_counts):
+    builds, cells = history
+    key = variant_key(variant)
+    small = str(bool(small_inputs))
+    num_trials = int(trials) + warmup_trials
+    if key in builds:
+        cost = statistics.median(builds[key])
+    else:
+        cost = default_build_seconds.get(variant[0], default_make_build_seconds)
+    variant_cells = get_variant_cells(variant, programs, small_inputs, cpu_counts)
+    for (prog, P) in variant_cells:
+        if (key, prog, small, P) in cells:
+            per_trial = statistics.median(cells[(key, prog, small, P)])
+        else:
+            # Extrapolate from the closest CPU count with history,
+            # assuming linear speedup.
+            others = [(abs(P - c), c) for (k, p, s, c) in cells
+                      if k == key and p == prog and s == small]
+            if others:
+                c = min(others)[1]
+                per_trial = statistics.median(cells[(key, prog, small, c)]) * c / P
+            else:
+                per_trial = default_trial_seconds
+        cost += per_trial * num_trials
+    return cost, len(variant_cells)
+
+# Format a number of seconds as hours, minutes, and seconds.
+def format_seconds(seconds):
+    seconds = int(max(seconds, 0))
+    return "{}h{:02d}m{:02d}s".format(seconds // 3600, (seconds // 60) % 60, seconds % 60)
+
+# Start tracking the progress of running the given build variants,
+# with the given estimated costs, input sizes, and number of trials.
+def start_progress(jobs, costs, small_inputs, trials):
+    progress["start"] = time.time()
+    progress["small"] = str(bool(small_inputs))
+    progress["trials"] = int(trials) + warmup_trials
+    progress["costs"] = costs
+    progress["remaining"] = list(jobs)
+    progress["total_cells"] = sum([costs[v][1] for v in jobs])
+    progress["done_cells"] = 0
+    progress["done_jobs"] = 0
+    progress["total_jobs"] = len(jobs)
+    progress["variant_cells"] = 0
+    logger.info("Running {} build variants with {} cells, estimated to take {}.".format(
+        len(jobs), progress["total_cells"], format_seconds(sum([costs[v][0] for v in jobs]))))
+
+# Report the progress of this run.
+def report_progress():
+    elapsed = time.time() - progress["start"]
+    costs = progress["costs"]
+    # Estimate the remaining time from the estimated costs of the
+    # remaining work, less the cells already run of the current build
+    # variant.
+    remaining = sum([costs[v][0] for v in progress["remaining"]])
+    if current_variant is not None and current_variant in costs and costs[current_variant][1] > 0:
+        remaining -= costs[current_variant][0] * progress["variant_cells"] / costs[current_variant][1]
+    logger.info("Progress: {}/{} cells, {}/{} build variants done, {} cells remaining.  Elapsed {}, ETA {}.".format(
+        progress["done_cells"], progress["total_cells"], progress["done_jobs"], progress["total_jobs"],
+        progress["total_cells"] - progress["done_cells"], format_seconds(elapsed),
+        format_seconds(remaining)))
+
+# Record the build time of the current build variant.
+def record_build(seconds):
+    if current_variant is None:
+        return
+    append_history(["build", variant_key(current_variant), "", "", "", "", seconds])
+
+# Record the running time of a cell of the current build variant and
+# report progress.  Called by the runner after running each cell.
+def record_cell(prog, P, seconds):
+    if current_variant is None:
+        return
+    append_history(["cell", variant_key(current_variant), os.path.basename(prog),
+                    progress["small"], P, progress["trials"], seconds])
+    progress["done_cells"] += 1
+    progress["variant_cells"] += 1
+    report_progress()
+
+# Record that the given build variant has finished running.
+def finish_progress(variant):
+    progress["remaining"].remove(variant)
+    progress["done_jobs"] += 1
+    # Cells of adaptive sweeps are not known in advance, so adjust the
+    # cell counts by the cells actually run.
+    progress["total_cells"] += progress["variant_cells"] - progress["costs"][variant][1]
+    progress["variant_cells"] = 0
+
+# Record that the given build variant was skipped.
+def skip_progress(variant):
+    progress["remaining"].remove(variant)
+    progress["total_jobs"] -= 1
+    progress["total_cells"] -= progress["costs"][variant][1]
+
+###########################################################################
+### Methods for writing results
+
+# Get the peak memory bandwidth of this host, in GB/s, when using P
+# CPUs, or None if it is unknown.
+def get_peak_bandwidth(P):
+    bandwidth = host_peaks.get('bandwidth')
+    if isinstance(bandwidth, dict):
+        return bandwidth.get(P)
+    return bandwidth
+
+# Keys of host_peaks holding the peak FLOP rate of each precision.
+peak_gflops_keys = {'double': 'gflops', 'single': 'gflops_single'}
+
+# Get the attainable rate of operations, per second, of a benchmark on
+# P CPUs under a roofline model, given the kind of the benchmark, its
+# compulsory memory traffic per operation, and the precision of its
+# floating-point operations.  Returns a tuple (rate, bound), where
+# bound is 'compute' or 'memory', or (None, None) if the peaks of the
+# host needed are unknown.
+def get_roofline(kind, bytes_per_op, P, precision=None):
+    bandwidth = get_peak_bandwidth(P)
+    memory_rate = None
+    if bandwidth is not None and bytes_per_op is not None:
+        memory_rate = bandwidth * 1e9 / bytes_per_op
+    if kind == 'flops' and peak_gflops_keys.get(precision) in host_peaks:
+        compute_rate = host_peaks[peak_gflops_keys[precision]] * 1e9 * P
+        if memory_rate is not None and memory_rate < compute_rate:
+            return memory_rate, 'memory'
+        return compute_rate, 'compute'
+    if kind == 'memory' and memory_rate is not None:
+        return memory_rate, 'memory'
+    return None, None
+
+# Write the throughput of the Cilk-5 benchmarks in the accumulated
+# results to a CSV file named throughput_csv.  For each system and CPU
+# count, the CSV reports the running time, the throughput derived from
+# the work the benchmark performs, and the efficiency of the benchmark
+# as a fraction of the roofline of the host on that many CPUs, along
+# with whether the roofline is bound by compute or memory, if known.
+def write_throughput_results(throughput_csv, accum_data, prog_run, sys_run, cpu_counts,
+                             small_inputs):
+    progs = [prog for prog in prog_run if prog in all_cilk5_progs]
+    if not progs:
+        return False
+    with open(throughput_csv, "w") as throughput_csv_file:
+        throughput_csv_writer = csv.writer(throughput_csv_file, delimiter=',')
+        header = ["benchmark", "unit", "work"]
+        for s in sys_run:
+            for c in get_cpu_count_columns(s, cpu_counts, accum_data):
+                header += [s+' '+c+' time', s+' '+c+' throughput', s+' '+c+' % of roofline',
+                           s+' '+c+' bound']
+        throughput_csv_writer.writerow(header)
+        for prog in progs:
+            ops, unit, scale, kind, bytes_per_op, precision = \
+                get_cilk5_work(prog, get_cilk5_input(prog, small_inputs))
+            out_row = [prog, unit, ops]
+            for s in sys_run:
+                for c in get_cpu_count_columns(s, cpu_counts, accum_data):
+                    t = accum_data.get((prog,s,c), '')
+                    if t == '' or float(t) <= 0:
+                        out_row += [t, '', '', '']
+                        continue
+                    rate = ops / float(t)
+                    roof, bound = get_roofline(kind, bytes_per_op, int(c), precision)
+                    out_row += [t, rate / scale, '' if roof is None else 100.0 * rate / roof,
+                                '' if bound is None else bound]
+            throughput_csv_writer.writerow(out_row)
+        # Record the peaks used to compute efficiencies.
+        throughput_csv_writer.writerow([])
+        throughput_csv_writer.writerow(["peak double-precision FLOP rate per core (GFLOP/s)",
+                                        host_peaks.get('gflops', '')])
+        throughput_csv_writer.writerow(["peak single-precision FLOP rate per core (GFLOP/s)",
+                                        host_peaks.get('gflops_single', '')])
+        bandwidth = host_peaks.get('bandwidth', '')
+        if isinstance(bandwidth, dict):
+            for P in sorted(bandwidth):
+                throughput_csv_writer.writerow(["peak memory bandwidth on "+str(P)+" cpus (GB/s)", bandwidth[P]])
+        else:
+            throughput_csv_writer.writerow(["peak memory bandwidth (GB/s)", bandwidth])
+        if host_probe is not None:
+            for latency in host_probe["latency"]:
+                throughput_csv_writer.writerow([latency["level"]+" load latency (ns)", latency["ns"]])
+    return True
+
+# Write CSVs of the accumulated performance results of all experiments.
+def write_all_results(experiments, csv_tag, cpu_counts, accum_data, all_prog_run, all_sys_run,
+                      small_inputs):
+    have_all_cilkscale_results = \
+        'cilkscale' in experiments and \
+        'cilkscale-bitcode' in experiments and \
+        'cilkscale' in accum_data and accum_data['cilkscale'] and \
+        'cilkscale-bitcode' in accum_data and accum_data['cilkscale-bitcode']
+    for exp in experiments:
+        # We will separately combine the results of the Cilkscale
+        # experiments, so don't generate CSVs of their results here.
+        if have_all_cilkscale_results and (exp == 'cilkscale' or exp == 'cilkscale-bitcode'):
+            continue
+
+        # Write a CSV of the experiment's results.
+        if exp in accum_data and accum_data[exp]:
+            accum_csv = '-'.join([exp,csv_tag])+".csv"
+            write_accumulated_results(accum_csv, accum_data[exp], all_prog_run[exp],
+                                      all_sys_run[exp], cpu_counts)
+            logger.info("Results saved to "+accum_csv+".")
+
+    # Write CSVs of the throughput of the Cilk-5 benchmarks.
+    for exp in experiments:
+        if exp in accum_data and accum_data[exp]:
+            throughput_csv = '-'.join([exp,"throughput",csv_tag])+".csv"
+            if write_throughput_results(throughput_csv, accum_data[exp], all_prog_run[exp],
+                                        all_sys_run[exp], cpu_counts, small_inputs):
+                logger.info("Throughput saved to "+throughput_csv+".")
+
+    # Write a CSV of the throughput of the DPRNGs in the randomized Cilk
+    # benchmarks.
+    if 'dprng' in experiments and 'dprng' in accum_data and accum_data['dprng']:
+        throughput_csv = '-'.join(["dprng","rng-throughput",csv_tag])+".csv"
+        if write_rng_throughput_results(throughput_csv, accum_data['dprng'], all_prog_run['dprng'],
+                                        all_sys_run['dprng'], cpu_counts, small_inputs):
+            logger.info("DPRNG throughput saved to "+throughput_csv+".")
+
+    # Write CSVs of the performance of each phase, sparse-matrix
+    # format, and problem size of miniFE.
+    for exp in experiments:
+        if exp in minife_phase_data and minife_phase_data[exp]:
+            phase_data = minife_phase_data[exp]
+            prog_run = [p for p in all_prog_run[exp] if p in set([b for (b,p,m,s,c) in phase_data])]
+            sys_run = [s for s in all_sys_run[exp] if s in set([ps for (b,p,m,ps,c) in phase_data])]
+            phases_csv = '-'.join([exp,"minife-phases",csv_tag])+".csv"
+            write_minife_phase_results(phases_csv, phase_data, prog_run, sys_run, cpu_counts)
+            logger.info("miniFE phase results saved to "+phases_csv+".")
+            formats_csv = '-'.join([exp,"minife-formats",csv_tag])+".csv"
+            write_minife_format_results(formats_csv, phase_data, prog_run, sys_run, cpu_counts,
+                                        small_inputs)
+            logger.info("miniFE format results saved to "+formats_csv+".")
+
+    # Write CSVs of the graph-load and per-round times of GBBS.
+    for exp in experiments:
+        if exp in gbbs_load_data and gbbs_load_data[exp]:
+            load_data = gbbs_load_data[exp]
+            prog_run = [p for p in all_prog_run[exp] if p in set([b for (b,k,s,c) in load_data])]
+            sys_run = [s for s in all_sys_run[exp] if s in set([ls for (b,k,ls,c) in load_data])]
+            load_csv = '-'.join([exp,"gbbs-load",csv_tag])+".csv"
+            write_gbbs_load_results(load_csv, load_data, prog_run, sys_run, cpu_counts)
+            logger.info("GBBS graph-load results saved to "+load_csv+".")
+
+    # Write CSVs comparing the GBBS results on the graphs in each order
+    # of their vertices.
+    for exp in experiments:
+        if exp in accum_data and accum_data[exp]:
+            prog_run = [p for p in all_prog_run[exp] if is_gbbs_graph_bench(p)]
+            if all([split_graph_name(parse_gbbs_bench_name(p)[1])[1] == 'original' for p in prog_run]):
+                continue
+            orders_csv = '-'.join([exp,"gbbs-orders",csv_tag])+".csv"
+            write_gbbs_order_results(orders_csv, accum_data[exp], prog_run, all_sys_run[exp],
+                                     cpu_counts)
+            logger.info("GBBS graph-order results saved to "+orders_csv+".")
+
+    # Collect the results of the cilkscale and cilkscale-bitcode
+    # experiments to generate a single CSV for comparing their results.
+    if have_all_cilkscale_results:
+        # Combine the results of the cilkscale and cilkscale-bitcode experiments.
+        combined_key = 'cilkscale-compare'
+        combine_keys(accum_data, combined_key, ['cilkscale','cilkscale-bitcode'],
+                     all_prog_run, all_sys_run, cpu_counts)
+        # Write these combined results to a single CSV.
+        accum_csv = '-'.join([combined_key,csv_tag])+".csv"
+        write_accumulated_results(accum_csv, accum_data[combined_key],
+                                  all_prog_run[combined_key], all_sys_run[combined_key],
+                                  cpu_counts)
+        logger.info("Results saved to "+accum_csv+".")
+
+    # Uncomment the following to generate an additional CSV comparing
+    # the baseline runtime performance and the performance of OpenCilk
+    # with pedigrees enabled.  This CSV was _not_ included as its own
+    # figure in the paper.
+
+    # have_baseline_and_pedigress = \
+    #     'baseline' in experiments and \
+    #     'pedigrees' in experiments and \
+    #     'baseline' in accum_data and accum_data['baseline'] and \
+    #     'pedigrees' in accum_data and accum_data['pedigrees']
+    # if have_baseline_and_pedigress:
+    #     # Combine the results of the baseline and pedigrees experiments.
+    #     combined_key = 'pedigrees-compare'
+    #     combine_keys(accum_data, combined_key, ['baseline','pedigrees'],
+    #                  all_prog_run, all_sys_run, cpu_counts)
+    #     # Write these combined results to a single CSV.
+    #     accum_csv = '-'.join([combined_key,csv_tag])+".csv"
+    #     write_accumulated_results(accum_csv, accum_data[combined_key],
+    #                               all_prog_run[combined_key], all_sys_run[combined_key],
+    #                               cpu_counts)
+    #     logger.info("Results saved to "+accum_csv+".")
+
+###########################################################################
+### Methods for sharded runs
+###
+### A sweep can be split into shards by build variant, to run each shard
+### on a different, identical host under the same run tag.  Each shard
+### saves a manifest of the raw-data CSVs it aggregated, along with a
+### fingerprint of its host.  Merging the shards then combines their raw
+### data and build output and aggregates the union of their results.
+
+# Parse a shard specification of the form "I/N", denoting shard I of N
+# shards, numbered from 0.
+def parse_shard(spec):
+    m = re.match(r"(\d+)/(\d+)$", spec)
+    if not m or int(m.group(1)) >= int(m.group(2)):
+        raise ValueError("Invalid shard specification "+spec+", expected I/N with 0 <= I < N")
+    return (int(m.group(1)), int(m.group(2)))
+
+# Get the suffix of files saved for the given shard.
+def shard_suffix(shard):
+    if shard is None:
+        return ""
+    return "-shard{}of{}".format(shard[0], shard[1])
+
+# Get the CPU counts on which to probe the bandwidth of the host for a
+# run on the given CPU counts.
+def get_probe_cpu_counts(cpu_counts):
+    if cpu_counts == "all" or cpu_counts == "adaptive":
+        return list(range(1, get_n_cpus()+1))
+    # Serial systems always run on 1 CPU.
+    return sorted(set([1] + [int(c) for c in cpu_counts.split(',')]))
+
+# Get the settings that determine which measurements are aggregated.
+def get_measurement_settings():
+    return {"warmup_trials": warmup_trials,
+            "outlier_policy": outlier_policy,
+            "outlier_threshold": outlier_threshold}
+
+# Write a manifest of the results of this run to the given path, along
+# with the fingerprint of the host and the results of probing it.
+def write_manifest(path, csv_tag, shard, experiments, cpu_counts, small_inputs):
+    with open(path, "w") as manifest_file:
+        json.dump({"tag": csv_tag,
+                   "shard": None if shard is None else list(shard),
+                   "experiments": list(experiments),
+                   "cpu_counts": cpu_counts,
+                   "small_inputs": small_inputs,
+                   "measurement": get_measurement_settings(),
+                   "host": get_host_fingerprint(),
+                   "probe": host_probe,
+                   "entries": manifest_entries}, manifest_file, indent=1)
+
+# Sort key to order programs in merged results as a single run would.
+def prog_order(prog):
+    all_progs = all_cilk5_progs + [get_test_name_from_prog(p) for p in all_gbbs_progs] + \
+        ['minife'] + all_randbench_progs + [get_test_name_from_prog(p) for p in all_rng_gbbs_progs]
+    # Order all miniFE formats and sizes with miniFE, and all load modes
+    # of a GBBS test with that test.
+    name = 'minife' if prog.startswith('minife') else parse_gbbs_bench_name(prog)[0]
+    return (all_progs.index(name) if name in all_progs else len(all_progs), prog)
+
+# Sort key to order systems in merged results as a single run would.
+def sys_order(sysname):
+    sys = sysname.split(' ')[0]
+    return (all_systems.index(sys) if sys in all_systems else len(all_systems), sysname)
+
+# Merge the results of the shards of a run with the given tag.  Each
+# directory in shard_dirs contains the raw data of one or more shards,
+# i.e., the rawdata directory of a host that ran those shards.
+# Returns 0 on success, nonzero otherwise.
+def merge_shards(shard_dirs, csv_tag):
+    manifests = []
+    for shard_dir in shard_dirs:
+        for path in sorted(glob.glob(os.path.join(shard_dir, "manifest-"+csv_tag+"-shard*.json"))):
+            with open(path, "r") as manifest_file:
+                manifests.append((shard_dir, json.load(manifest_file)))
+    if not manifests:
+        logger.error("No shard manifests found for run tag "+csv_tag+".")
+        return 1
+
+    # Verify that the shards ran on identical hosts with the same
+    # parameters.
+    host = manifests[0][1]["host"]
+    cpu_counts = manifests[0][1]["cpu_counts"]
+    for (shard_dir, manifest) in manifests:
+        if manifest["host"]["hash"] != host["hash"]:
+            logger.error("Host fingerprint of shard "+str(manifest["shard"])+" in "+shard_dir+
+                         " does not match: "+str(manifest["host"])+" vs. "+str(host))
+            return 1
+        if manifest["cpu_counts"] != cpu_counts:
+            logger.error("CPU counts of shard "+str(manifest["shard"])+" in "+shard_dir+
+                         " do not match: "+str(manifest["cpu_counts"])+" vs. "+str(cpu_counts))
+            return 1
+        # The merge rejects outliers from the shards' measurements as
+        # a single run would, so it must use the shards' settings.
+        if manifest.get("measurement") != get_measurement_settings():
+            logger.error("Warm-up and outlier settings of shard "+str(manifest["shard"])+" in "+shard_dir+
+                         " do not match: "+str(manifest.get("measurement"))+" vs. "+str(get_measurement_settings())+
+                         ".  Pass the shards' --warmup-trials, --outlier-policy, and --outlier-threshold to --merge.")
+            return 1
+    shards = set([tuple(manifest["shard"]) for (shard_dir, manifest) in manifests])
+
+    # Use the peaks measured by probing the host, unless given.
+    global host_probe
+    host_probe = manifests[0][1].get("probe")
+    if host_probe is not None:
+        host_probe["bandwidth"] = dict([(int(P), bw) for (P, bw) in host_probe["bandwidth"].items()])
+        for (key, peak) in get_probe_peaks(host_probe).items():
+            host_peaks.setdefault(key, peak)
+    num_shards = manifests[0][1]["shard"][1]
+    if len(shards) != num_shards:
+        logger.warning("Merging "+str(len(shards))+" of "+str(num_shards)+" shards.")
+
+    if not os.path.exists(rawdata_dir):
+        os.mkdir(rawdata_dir)
+
+    # Combine the build output of the shards.
+    build_out = os.path.join(rawdata_dir, "build-"+csv_tag+".out")
+    with open(build_out, "w") as build_out_file:
+        for (shard_dir, manifest) in manifests:
+            shard_out = os.path.join(shard_dir, "build-"+csv_tag+shard_suffix(manifest["shard"])+".out")
+            if not os.path.exists(shard_out):
+                continue
+            build_out_file.write(">> BUILD OUTPUT (shard "+str(manifest["shard"])+")\n")
+            with open(shard_out, "r") as shard_out_file:
+                shutil.copyfileobj(shard_out_file, build_out_file)
+            build_out_file.write("<< END BUILD OUTPUT\n")
+
+    # Copy the raw data of the shards, and aggregate it.
+    experiments = []
+    accum_data = dict()
+    all_prog_run = dict()
+    all_sys_run = dict()
+    for (shard_dir, manifest) in manifests:
+        for exp in manifest["experiments"]:
+            if exp not in experiments:
+                experiments.append(exp)
+        for entry in manifest["entries"]:
+            base = os.path.splitext(entry["csv"])[0]
+            for path in glob.glob(os.path.join(shard_dir, glob.escape(base)+"*.csv")):
+                dest = os.path.join(rawdata_dir, os.path.basename(path))
+                if not os.path.exists(dest) or not os.path.samefile(path, dest):
+                    shutil.copy(path, dest)
+            exp = entry["experiment"]
+            if exp not in accum_data:
+                accum_data[exp] = dict()
+                all_prog_run[exp] = []
+                all_sys_run[exp] = []
+            parse_bench_name_fn = None
+            if entry["parse_bench_name"] is not None:
+                parse_bench_name_fn = globals()[entry["parse_bench_name"]]
+            accumulate_results(os.path.join(rawdata_dir, entry["csv"]), entry["bench"],
+                               entry["system"], all_sys_run[exp], accum_data[exp],
+                               parse_bench_name_fn)
+            if entry["bench"].startswith('minife'):
+                accumulate_minife_phases(minife_phases_csv_name(os.path.join(rawdata_dir, entry["csv"])),
+                                         entry["bench"], entry["system"],
+                                         minife_phase_data.setdefault(exp, dict()))
+            accumulate_gbbs_rounds(gbbs_rounds_csv_name(os.path.join(rawdata_dir, entry["csv"])),
+                                   entry["bench"], entry["system"],
+                                   gbbs_load_data.setdefault(exp, dict()))
+            if entry["bench"] not in all_prog_run[exp]:
+                all_prog_run[exp].append(entry["bench"])
+
+    # Order programs and systems as a single run would.
+    for exp in accum_data:
+        all_prog_run[exp].sort(key=prog_order)
+        all_sys_run[exp].sort(key=sys_order)
+    experiments.sort(key=lambda e: all_experiments.index(e) if e in all_experiments else len(all_experiments))
+
+    write_all_results(experiments, csv_tag, cpu_counts, accum_data, all_prog_run, all_sys_run,
+                      manifests[0][1]["small_inputs"])
+    print("Merged {} shard(s).  Run tag: {}.".format(len(manifests), csv_tag))
+    return 0
 
 ###########################################################################
 
@@ -764,11 +2350,73 @@ def main():
     ap.add_argument("--small", "-s", help="Run tests with small inputs.", default=False,
                     action=argparse.BooleanOptionalAction)
     ap.add_argument("--cpu-counts", "-c",
-                    help="Comma-separated list of cpu counts to use.  (default: "+str(get_n_cpus())+")",
+                    help="Comma-separated list of cpu counts to use, 'all' to use every cpu count, or 'adaptive' to choose cpu counts by fitting scalability models.  (default: "+str(get_n_cpus())+")",
                     default=str(get_n_cpus()))
     ap.add_argument("--trials", "-t", help="Number of trials to run.  (default: 10)", default="10")
     ap.add_argument("--programs",
                     help="Comma-separated list of programs to run.  Programs must be within the test-suites to run.")
+    ap.add_argument("--minife-formats",
+                    help="Comma-separated list of sparse-matrix formats with which to build and run miniFE.  Available formats: "+','.join(all_minife_formats)+".  (default: csr)",
+                    default="csr")
+    ap.add_argument("--minife-sizes",
+                    help="Comma-separated list of problem sizes on which to run miniFE, each given as N or NXxNYxNZ.  (default: 150x150x150, or 100x100x100 with --small)")
+    ap.add_argument("--fib-depths",
+                    help="Comma-separated list of recursion depths at which to run fib_rng in the random test-suite.  Use 'N1:N2' to sweep depths N1 through N2, or 'N1:N2:S' to sweep them in steps of S, e.g., 20:45:5.  (default: 40, or 35 with --small)")
+    ap.add_argument("--gbbs-load-modes",
+                    help="Comma-separated list of ways in which the GBBS benchmarks load their graph input, from its byte-compressed, binary CSR, or text adjacency form.  Forms other than the distributed compressed graphs are converted and cached in gbbs/inputs/catalog.  Available modes: "+','.join(all_gbbs_load_modes)+".  (default: compressed-mmap)",
+                    default="compressed-mmap")
+    ap.add_argument("--gbbs-graphs",
+                    help="Comma-separated list of graphs on which to run the GBBS benchmarks.  Graphs are 'orkut' and 'livejournal', RMAT graphs 'rmat<S>' with 2^S vertices and edge factor 16, or 'rmat<S>e<F>' with edge factor F, and Barabasi-Albert graphs 'ba<N>m<M>' with N vertices and M edges per vertex.  Synthetic graphs are generated and cached in gbbs/inputs/catalog.  Use 'rmat<S1>:<S2>' to sweep RMAT scales S1 through S2, and '<name>=<path>' to use an edge-list or Ligra adjacency-graph file.  (default: orkut, or livejournal with --small)")
+    ap.add_argument("--gbbs-orders",
+                    help="Comma-separated list of orders in which to relabel the vertices of the graphs on which to run the GBBS benchmarks, to study the effect of locality.  Reordered graphs are generated by gbbs/utils/reorder and cached in gbbs/inputs/catalog.  Available orders: "+','.join(graph_orders)+".  (default: original)",
+                    default="original")
+    ap.add_argument("--graph-cache-budget", type=float,
+                    help="Disk space, in GB, that the graphs cached in gbbs/inputs/catalog may use.  The least recently used graph files beyond the budget are evicted.  (default: unlimited)")
+
+    ap.add_argument("--warmup-trials", "-w", type=int, default=0,
+                    help="Number of warm-up trials to run for each data point and exclude from the results.  (default: 0)")
+    ap.add_argument("--outlier-policy", choices=all_outlier_policies, default='none',
+                    help="Policy for rejecting outlier measurements before computing their median.  Rejected measurements remain in the raw data.  (default: none)")
+    ap.add_argument("--outlier-threshold", type=float, default=3.5,
+                    help="Modified z-score above which the 'mad' outlier policy rejects a measurement.  (default: 3.5)")
+
+    # Peak performance of the host, used to report efficiencies.
+    ap.add_argument("--peak-gflops", type=float,
+                    help="Peak double-precision FLOP rate of one core of this host, in GFLOP/s, used to report the efficiency of double-precision benchmarks.")
+    ap.add_argument("--peak-gflops-single", type=float,
+                    help="Peak single-precision FLOP rate of one core of this host, in GFLOP/s, used to report the efficiency of single-precision benchmarks.")
+    ap.add_argument("--peak-bandwidth", type=float,
+                    help="Peak memory bandwidth of this host, in GB/s, used to report the efficiency of memory-bound benchmarks.")
+    ap.add_argument("--probe", default=False, action=argparse.BooleanOptionalAction,
+                    help="Probe the bandwidth, load latency, and peak FLOP rate of this host, once per host, to report the efficiency of benchmarks when --peak-gflops, --peak-gflops-single, or --peak-bandwidth is not given.  Ignored with --quick-test.  (default: --no-probe)")
+
+    # Options for ordering and budgeting the work to run.
+    ap.add_argument("--job-order", choices=all_job_orders, default='grouped',
+                    help="Order in which to run build variants: 'grouped' runs them grouped by test suite, experiment, and system; 'longest-first' runs them in decreasing order of their running times estimated from previous runs.  (default: grouped)")
+    ap.add_argument("--time-budget", type=float,
+                    help="Number of seconds the tests may take.  Build variants whose estimated running time would exceed the remaining budget are skipped.  (default: no budget)")
+
+    # Options for splitting a sweep into shards across hosts.
+    ap.add_argument("--shard",
+                    help="Run only shard I of N of the build variants, specified as I/N with 0 <= I < N, and save a manifest of its results for merging.  Use with --run-tag.")
+    ap.add_argument("--run-tag",
+                    help="Run tag to use instead of one based on the current time, e.g., so that all shards of a sweep share a tag.")
+    ap.add_argument("--merge",
+                    help="Comma-separated list of rawdata directories of shards run with the run tag given by --run-tag.  Merges their results instead of running tests.")
+
+    # Options for adaptive sweeps over CPU counts.
+    ap.add_argument("--adaptive-tolerance", type=float, default=0.05,
+                    help="With '-c adaptive', add cpu counts until the Amdahl and USL models fit the measured running times to within this relative tolerance.  (default: 0.05)")
+    ap.add_argument("--adaptive-max-cells", type=int,
+                    help="With '-c adaptive', the maximum number of cpu counts to measure per program and system.  (default: twice the number of initial geometric cpu counts)")
+
+    # Options to reduce the effect of other processes on the host.
+    ap.add_argument("--noise-threshold", type=float,
+                    help="Before each cell, wait until the mean busy fraction of the CPUs to use, due to other processes, is at most this value, and record a noise score for each trial.  (default: disabled)")
+    ap.add_argument("--noise-max-wait", type=float, default=300.0,
+                    help="Maximum number of seconds to wait for the system to quiesce before running a cell anyway.  (default: 300)")
+    ap.add_argument("--reserve-cpus", default=False, action=argparse.BooleanOptionalAction,
+                    help="Reserve the CPUs to use in a cgroup v2 cpuset partition while running each cell, moving other tasks off of them.  Requires --noise-threshold and permission to modify /sys/fs/cgroup.")
 
     # Helper option to run a small version of the tests, just to
     # verify that the tests compile and run.
@@ -779,6 +2427,19 @@ def main():
 
     logging.basicConfig(level=logging.INFO)
 
+    # Configure warm-up trials and outlier rejection.  Merging shards
+    # rejects outliers too, so this precedes the merge.
+    global warmup_trials, outlier_policy, outlier_threshold
+    warmup_trials = args.warmup_trials
+    outlier_policy = args.outlier_policy
+    outlier_threshold = args.outlier_threshold
+
+    # If requested, merge the results of shards instead of running tests.
+    if args.merge is not None:
+        if args.run_tag is None:
+            ap.error("--merge requires --run-tag")
+        return merge_shards(args.merge.split(','), args.run_tag)
+
     # The list of test suites to run.
     test_suites = args.test_suites.split(',')
     # The list of systems to use.
@@ -802,6 +2463,45 @@ def main():
         if 'minife' in programs and 'minife' not in test_suites:
             test_suites.append('minife')
 
+    # Configure the sparse-matrix formats and problem sizes of miniFE.
+    global minife_formats, minife_sizes
+    minife_formats = args.minife_formats.split(',')
+    for fmt in minife_formats:
+        if fmt not in all_minife_formats:
+            ap.error("unknown miniFE format '"+fmt+"'")
+    if args.minife_sizes is not None:
+        try:
+            minife_sizes = [parse_minife_size(size) for size in args.minife_sizes.split(',')]
+        except argparse.ArgumentTypeError as e:
+            ap.error(str(e))
+
+    # Configure the recursion depths of fib_rng.
+    global fib_depths
+    if args.fib_depths is not None:
+        try:
+            fib_depths = parse_fib_depths(args.fib_depths)
+        except argparse.ArgumentTypeError as e:
+            ap.error(str(e))
+
+    # Configure the ways in which GBBS loads its graph input.
+    global gbbs_load_modes
+    gbbs_load_modes = args.gbbs_load_modes.split(',')
+    for load_mode in gbbs_load_modes:
+        if load_mode not in all_gbbs_load_modes:
+            ap.error("unknown GBBS load mode '"+load_mode+"'")
+    global gbbs_graphs, gbbs_orders, graph_cache_budget
+    gbbs_orders = args.gbbs_orders.split(',')
+    for order in gbbs_orders:
+        if order not in graph_orders:
+            ap.error("unknown graph order '"+order+"'")
+    if args.graph_cache_budget is not None:
+        graph_cache_budget = int(args.graph_cache_budget * 1e9)
+    if args.gbbs_graphs is not None:
+        try:
+            gbbs_graphs = expand_graph_names(args.gbbs_graphs)
+        except ValueError as e:
+            ap.error(str(e))
+
     # If requested, override options to perform a quick test.
     if args.quick_test:
         logger.info("ALERT: Running a quick test to check that test suites build and run.")
@@ -811,8 +2511,34 @@ def main():
         small_inputs = True
         cpu_counts = str(get_n_cpus())
         trials = "1"
+        warmup_trials = 0
         programs = [all_cilk5_progs[0],all_gbbs_progs[0],"minife",all_randbench_progs[0],all_rng_gbbs_progs[0]]
 
+    # Get the build variants to run.  If requested, run only one shard
+    # of the build variants.
+    jobs = get_build_variants(test_suites, systems, experiments, programs)
+    shard = None
+    if args.shard is not None:
+        shard = parse_shard(args.shard)
+        jobs = get_shard_variants(jobs, shard[0], shard[1])
+    job_order = args.job_order
+    time_budget = args.time_budget
+
+    # Record the peak performance of the host.
+    if args.peak_gflops is not None:
+        host_peaks['gflops'] = args.peak_gflops
+    if args.peak_gflops_single is not None:
+        host_peaks['gflops_single'] = args.peak_gflops_single
+    if args.peak_bandwidth is not None:
+        host_peaks['bandwidth'] = args.peak_bandwidth
+
+    # Configure adaptive sweeps over CPU counts in the runner.
+    configure_adaptive_sweep(args.adaptive_tolerance, args.adaptive_max_cells)
+
+    # Configure the system-noise gate in the runner.
+    configure_noise_gate(args.noise_threshold, args.noise_max_wait,
+                         "ppopp-23-ae-bench" if args.reserve_cpus else None)
+
     # Print out run options
     logger.info("Running with the following options:")
     logger.info("\texperiments: "+str(experiments))
@@ -823,8 +2549,26 @@ def main():
         logger.info("\tprograms: "+str(programs))
     logger.info("\tsystems: "+str(systems))
     logger.info("\tsmall inputs: "+str(small_inputs))
+    if 'minife' in test_suites:
+        logger.info("\tminiFE formats: "+str(minife_formats))
+        if minife_sizes is not None:
+            logger.info("\tminiFE sizes: "+str(['x'.join(size) for size in minife_sizes]))
+    if 'random' in test_suites and fib_depths is not None:
+        logger.info("\tfib_rng depths: "+str(fib_depths))
+    if 'gbbs' in test_suites:
+        logger.info("\tGBBS load modes: "+str(gbbs_load_modes))
+    if 'gbbs' in test_suites or 'gbbs-random' in test_suites:
+        logger.info("\tGBBS graphs: "+str(get_gbbs_graph_names(small_inputs)))
+        if gbbs_orders != ['original']:
+            logger.info("\tGBBS graph orders: "+str(gbbs_orders))
     logger.info("\tcpu counts: "+cpu_counts)
     logger.info("\ttrials: "+trials)
+    logger.info("\twarm-up trials: "+str(warmup_trials))
+    logger.info("\toutlier policy: "+outlier_policy)
+    if args.noise_threshold is not None:
+        logger.info("\tnoise threshold: "+str(args.noise_threshold))
+    if shard is not None:
+        logger.info("\tshard: {} of {} ({} build variants)".format(shard[0], shard[1], len(jobs)))
 
     # Tag all CSVs generated with the year, month, day, hour, and
     # minute when this script is invoked.
@@ -832,6 +2576,8 @@ def main():
     # Also record if we're using small inputs in the tag.
     if small_inputs:
         csv_tag = "small-"+csv_tag
+    if args.run_tag is not None:
+        csv_tag = args.run_tag
     print("Tests starting.  Run tag: {}.".format(csv_tag))
 
     # Ensure there is a directory for raw data.
@@ -840,7 +2586,21 @@ def main():
 
     # Open file object for build output.
     global build_output_fo
-    build_output_fo = open(os.path.join(rawdata_dir,"build-"+csv_tag+".out"), 'w')
+    build_output_fo = open(os.path.join(rawdata_dir,"build-"+csv_tag+shard_suffix(shard)+".out"), 'w')
+
+    # Probe the host for the peaks not given, or use the cached results
+    # of probing it before.
+    global host_probe
+    if args.probe and not args.quick_test and \
+       ('gflops' not in host_peaks or 'gflops_single' not in host_peaks or
+        'bandwidth' not in host_peaks):
+        try:
+            host_probe = get_host_probe(rawdata_dir, get_probe_cpu_counts(cpu_counts),
+                                        os.path.join(compiler_bin_dir,"clang"))
+            for (key, peak) in get_probe_peaks(host_probe).items():
+                host_peaks.setdefault(key, peak)
+        except (subprocess.CalledProcessError, RuntimeError) as e:
+            logger.warning("Failed to probe the host: "+str(e))
 
     # All aggregated performance results will be placed into this
     # dictionary, indexed by experiment.  Each experiment maps to a
@@ -858,132 +2618,47 @@ def main():
     # because why not.
     start = time.time()
 
-    # Iterate over the test suites.
-    for test_suite in test_suites:
-        if test_suite == 'cilk5':
-            # Run the Cilk-5 benchmarks for all experiments.
-            if programs is not None:
-                run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
-                                accum_data, all_prog_run, all_sys_run, programs)
-            else:
-                run_cilk5_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
-                                accum_data, all_prog_run, all_sys_run)
-        elif test_suite == 'gbbs':
-            # Run the non-randomized GBBS benchmarks for all experiments.
-            if programs is not None:
-                run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
-                               accum_data, all_prog_run, all_sys_run, programs)
-            else:
-                run_gbbs_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
-                               accum_data, all_prog_run, all_sys_run)
-        elif test_suite == 'minife' and (programs is None or 'minife' in programs):
-            # Run the miniFE benchmark for all experiments.
-            run_minife_tests(systems, experiments, small_inputs, trials, cpu_counts, csv_tag,
-                             accum_data, all_prog_run, all_sys_run)
-        elif test_suite == 'random':
-            # The ramdom suite only applies to the DPRNG experiment.
-            if 'dprng' not in experiments:
-                continue
-
-            # If necessary, initialize the appropriate entries in
-            # accum_data, all_prog_run, and all_sys_run.
-            if 'dprng' not in accum_data:
-                accum_data['dprng'] = dict()
-                all_prog_run['dprng'] = []
-                all_sys_run['dprng'] = []
-
-            # Run the assorted randomized benchmarks.
-            if programs is not None:
-                run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
-                                    accum_data['dprng'], all_prog_run['dprng'],
-                                    all_sys_run['dprng'], programs)
-            else:
-                run_randbench_tests(systems, small_inputs, trials, cpu_counts, csv_tag,
-                                    accum_data['dprng'], all_prog_run['dprng'],
-                                    all_sys_run['dprng'])
-        elif test_suite == 'gbbs-random':
-            # This gbbs-random suite only applies to the DPRNG experiment.
-            if 'dprng' not in experiments:
-                continue
-
-            # If necessary, initialize the appropriate entries in
-            # accum_data, all_prog_run, and all_sys_run.
-            if 'dprng' not in accum_data:
-                accum_data['dprng'] = dict()
-                all_prog_run['dprng'] = []
-                all_sys_run['dprng'] = []
+    # Estimate the cost of each build variant to run, from the running
+    # times recorded by previous runs, and order the build variants.
+    history = load_history()
+    costs = dict([(v, estimate_variant_cost(v, history, programs, small_inputs, trials, cpu_counts))
+                  for v in jobs])
+    if job_order == 'longest-first':
+        jobs = sorted(jobs, key=lambda v: costs[v][0], reverse=True)
+    start_progress(jobs, costs, small_inputs, trials)
+    set_cell_hook(record_cell)
+
+    # Iterate over the build variants.
+    for variant in jobs:
+        if time_budget is not None and \
+           time.time() - start + costs[variant][0] > time_budget:
+            logger.warning("Skipping "+variant_key(variant)+", which is estimated to exceed the time budget.")
+            skip_progress(variant)
+            continue
+        run_build_variant(variant, systems, experiments, small_inputs, trials, cpu_counts,
+                          csv_tag, accum_data, all_prog_run, all_sys_run, programs)
+        finish_progress(variant)
 
-            # Run the randomized GBBS benchmarks.
-            if programs is not None:
-                run_rng_gbbs_tests(systems, all_dprngs, small_inputs, trials, cpu_counts,
-                                   csv_tag, accum_data['dprng'], all_prog_run['dprng'],
-                                    all_sys_run['dprng'], programs)
-            else:
-                run_rng_gbbs_tests(systems, all_dprngs, small_inputs, trials, cpu_counts,
-                                   csv_tag, accum_data['dprng'], all_prog_run['dprng'],
-                                    all_sys_run['dprng'])
+    # Order programs and systems as a run in the default order would.
+    if job_order != 'grouped':
+        for exp in accum_data:
+            all_prog_run[exp].sort(key=prog_order)
+            all_sys_run[exp].sort(key=sys_order)
 
     # print(accum_data)
     # print(all_prog_run)
     # print(all_sys_run)
 
-    have_all_cilkscale_results = \
-        'cilkscale' in experiments and \
-        'cilkscale-bitcode' in experiments and \
-        'cilkscale' in accum_data and accum_data['cilkscale'] and \
-        'cilkscale-bitcode' in accum_data and accum_data['cilkscale-bitcode']
-    for exp in experiments:
-        # We will separately combine the results of the Cilkscale
-        # experiments, so don't generate CSVs of their results here.
-        if have_all_cilkscale_results and (exp == 'cilkscale' or exp == 'cilkscale-bitcode'):
-            continue
-
-        # Write a CSV of the experiment's results.
-        if exp in accum_data and accum_data[exp]:
-            accum_csv = '-'.join([exp,csv_tag])+".csv"
-            write_accumulated_results(accum_csv, accum_data[exp], all_prog_run[exp],
-                                      all_sys_run[exp], cpu_counts)
-            logger.info("Results saved to "+accum_csv+".")
-
-    # Collect the results of the cilkscale and cilkscale-bitcode
-    # experiments to generate a single CSV for comparing their results.
-    if have_all_cilkscale_results:
-        # Combine the results of the cilkscale and cilkscale-bitcode experiments.
-        combined_key = 'cilkscale-compare'
-        combine_keys(accum_data, combined_key, ['cilkscale','cilkscale-bitcode'],
-                     all_prog_run, all_sys_run, cpu_counts)
-        # Write these combined results to a single CSV.
-        accum_csv = '-'.join([combined_key,csv_tag])+".csv"
-        write_accumulated_results(accum_csv, accum_data[combined_key],
-                                  all_prog_run[combined_key], all_sys_run[combined_key],
-                                  cpu_counts)
-        logger.info("Results saved to "+accum_csv+".")
-
-    # Uncomment the following to generate an additional CSV comparing
-    # the baseline runtime performance and the performance of OpenCilk
-    # with pedigrees enabled.  This CSV was _not_ included as its own
-    # figure in the paper.
-
-    # have_baseline_and_pedigress = \
-    #     'baseline' in experiments and \
-    #     'pedigrees' in experiments and \
-    #     'baseline' in accum_data and accum_data['baseline'] and \
-    #     'pedigrees' in accum_data and accum_data['pedigrees']
-    # if have_baseline_and_pedigress:
-    #     # Combine the results of the baseline and pedigrees experiments.
-    #     combined_key = 'pedigrees-compare'
-    #     combine_keys(accum_data, combined_key, ['baseline','pedigrees'],
-    #                  all_prog_run, all_sys_run, cpu_counts)
-    #     # Write these combined results to a single CSV.
-    #     accum_csv = '-'.join([combined_key,csv_tag])+".csv"
-    #     write_accumulated_results(accum_csv, accum_data[combined_key],
-    #                               all_prog_run[combined_key], all_sys_run[combined_key],
-    #                               cpu_counts)
-    #     logger.info("Results saved to "+accum_csv+".")
+    if shard is None:
+        write_all_results(experiments, csv_tag, cpu_counts, accum_data,
+                          all_prog_run, all_sys_run, small_inputs)
 
-    # Clean any YAML files generated by miniFE.
-    for yaml_file in glob.glob("*.yaml"):
-        os.remove(yaml_file)
+    # Save a manifest of this run's results, along with the metadata
+    # of the host.  The manifest of a shard is used to merge its results
+    # with the results of other shards later.
+    manifest = os.path.join(rawdata_dir, "manifest-"+csv_tag+shard_suffix(shard)+".json")
+    write_manifest(manifest, csv_tag, shard, experiments, cpu_counts, small_inputs)
+    logger.info("Manifest saved to "+manifest+".")
 
     end = time.time()
     print("Tests completed in {:0.6f} seconds.  Run tag: {}.".format(end-start, csv_tag))
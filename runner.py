@@ -11,10 +11,15 @@
 import argparse
 import csv
 import datetime
+import hashlib
+import json
 import logging
 import os
 import subprocess
 import sys
+import time
+
+from scalability import geometric_cpu_counts, next_cpu_count, write_model_fits
 
 logger = logging.getLogger(__name__)
 
@@ -49,28 +54,253 @@ def run_command(cmd, asyn = False):
     else:
         return ""
 
+# Get a fingerprint of the hardware and software configuration of this
+# host, to check that results gathered on different hosts are
+# comparable.  Returns a dictionary describing the host, including a
+# "hash" entry that summarizes the other entries.
+def get_host_fingerprint():
+    info = dict()
+    info["platform"] = sys.platform
+    info["kernel"] = os.uname().release
+    info["machine"] = os.uname().machine
+    # Record the number of cores available on each socket, rather than
+    # their IDs, so that containers pinned to disjoint but identical
+    # sockets have the same fingerprint.
+    cpu_ordering = get_cpu_ordering()
+    info["cores per socket"] = sorted([len([c for (c,m) in cpu_ordering if m == socket])
+                                       for socket in set([m for (c,m) in cpu_ordering])])
+    if sys.platform == "darwin":
+        out,err = run_command("sysctl -n machdep.cpu.brand_string hw.memsize")
+        items = str(out, 'utf-8').splitlines()
+        info["cpu model"] = items[0].strip() if items else ""
+        info["memory"] = items[1].strip() if len(items) > 1 else ""
+    else:
+        info["cpu model"] = ""
+        if os.path.exists("/proc/cpuinfo"):
+            with open("/proc/cpuinfo", "r") as f:
+                for l in f:
+                    if l.startswith("model name"):
+                        info["cpu model"] = l.split(':',1)[1].strip()
+                        break
+        info["memory"] = ""
+        if os.path.exists("/proc/meminfo"):
+            with open("/proc/meminfo", "r") as f:
+                for l in f:
+                    if l.startswith("MemTotal"):
+                        # Round to the nearest GiB, since the reported
+                        # total varies slightly across identical hosts.
+                        kb = int(l.split()[1])
+                        info["memory"] = str(round(kb / (1024*1024)))+" GiB"
+                        break
+    info["hash"] = hashlib.sha256(json.dumps(info, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+    return info
+
+################################################################################
+## System-noise gate
+##
+## On shared hosts, other processes running on the CPUs a benchmark is
+## pinned to produce outliers.  The following methods sample
+## /proc/loadavg and /proc/stat to estimate how busy the target CPUs
+## are, wait (with backoff) for the machine to quiesce before running a
+## cell, and optionally reserve the target CPUs in a cgroup v2 cpuset
+## partition for the duration of the run.  These methods are only
+## supported on Linux.
+
+# Default parameters of the noise gate.  A noise threshold of None
+# disables the gate.
+noise_threshold = None
+noise_max_wait = 300.0
+noise_sample_interval = 0.25
+reserve_cgroup = None
+
+# Configure the noise gate.  Passing threshold=None disables the
+# gate.  If reserve_name is not None, the target CPUs of each cell are
+# reserved in a cgroup v2 cpuset partition with that name.
+def configure_noise_gate(threshold, max_wait=300.0, reserve_name=None):
+    global noise_threshold, noise_max_wait, reserve_cgroup
+    noise_threshold = threshold
+    noise_max_wait = max_wait
+    reserve_cgroup = reserve_name
+    if threshold is not None and not noise_gate_supported():
+        logger.warning("Noise gate is not supported on this system.  Ignoring.")
+
+# Return True if the noise gate can inspect this system.
+def noise_gate_supported():
+    return os.path.exists("/proc/stat") and os.path.exists("/proc/loadavg")
+
+# Read /proc/loadavg.  Returns the 1-minute load average and the
+# number of currently runnable scheduling entities.
+def read_loadavg():
+    with open("/proc/loadavg", "r") as f:
+        items = f.read().split()
+    return float(items[0]), int(items[3].split('/')[0])
+
+# Read /proc/stat.  Returns a dictionary mapping each CPU ID to a
+# (busy, total) pair of cumulative jiffies, along with the number of
+# processes currently in the runnable state.
+def read_cpu_times():
+    cpu_times = dict()
+    procs_running = 0
+    with open("/proc/stat", "r") as f:
+        for l in f:
+            items = l.split()
+            if not items:
+                continue
+            if items[0].startswith("cpu") and items[0] != "cpu":
+                vals = [int(x) for x in items[1:]]
+                # Fields 3 and 4 are idle and iowait time.  Guest time
+                # is already accounted for in user time.
+                idle = vals[3] + (vals[4] if len(vals) > 4 else 0)
+                total = sum(vals[:8])
+                cpu_times[int(items[0][3:])] = (total - idle, total)
+            elif items[0] == "procs_running":
+                procs_running = int(items[1])
+    return cpu_times, procs_running
+
+# Sample the given CPUs for `interval` seconds and compute a noise
+# score for them: the mean fraction of time those CPUs spent busy
+# during the interval.  Because the runner sleeps while sampling, any
+# busy time is attributable to other processes.  Returns the noise
+# score and the number of runnable processes, excluding this one.
+def measure_noise(cpus, interval=None):
+    if interval is None:
+        interval = noise_sample_interval
+    before,_ = read_cpu_times()
+    time.sleep(interval)
+    after,procs_running = read_cpu_times()
+    fracs = []
+    for cpu in cpus:
+        if cpu not in before or cpu not in after:
+            continue
+        busy = after[cpu][0] - before[cpu][0]
+        total = after[cpu][1] - before[cpu][1]
+        if total > 0:
+            fracs.append(busy / total)
+    score = sum(fracs) / len(fracs) if fracs else 0.0
+    return score, max(procs_running - 1, 0)
+
+# Wait until the given CPUs are quiet, i.e., their noise score is at
+# most `threshold` and there are no more runnable processes than the
+# CPUs the benchmark leaves free.  Polls with exponential backoff, up
+# to `max_wait` seconds in total.  Returns the last measured noise
+# score.
+def wait_for_quiescence(cpus, threshold=None, max_wait=None):
+    if threshold is None:
+        threshold = noise_threshold
+    if max_wait is None:
+        max_wait = noise_max_wait
+    max_runnable = max(len(get_cpu_ordering()) - len(cpus), 0)
+    start = time.time()
+    backoff = 1.0
+    while True:
+        score,runnable = measure_noise(cpus)
+        if score <= threshold and runnable <= max_runnable:
+            return score
+        waited = time.time() - start
+        if waited >= max_wait:
+            load,_ = read_loadavg()
+            logger.warning("System not quiet after {:0.1f} seconds (noise {:0.3f}, runnable {}, loadavg {:0.2f}).  Running anyway.".format(waited, score, runnable, load))
+            return score
+        logger.info("Waiting for system to quiesce (noise {:0.3f}, runnable {}).".format(score, runnable))
+        time.sleep(min(backoff, max(max_wait - waited, 0)))
+        backoff = min(backoff * 2, 30.0)
+
+# Path of the cgroup v2 hierarchy.
+cgroup_root = "/sys/fs/cgroup"
+
+# Write `value` to the cgroup control file `path`.
+def write_cgroup_file(path, value):
+    with open(path, "w") as f:
+        f.write(value)
+
+# Reserve the given CPUs in a new cgroup v2 cpuset partition named
+# `name`.  Making the cgroup a partition root removes its CPUs from
+# the effective cpusets of its siblings, which moves other tasks off
+# of those CPUs.  Returns the path of the cgroup, or None if the CPUs
+# could not be reserved, e.g., because this script lacks permission
+# to modify the cgroup hierarchy.
+def reserve_cpus(cpus, name):
+    path = os.path.join(cgroup_root, name)
+    try:
+        write_cgroup_file(os.path.join(cgroup_root, "cgroup.subtree_control"), "+cpuset")
+        if not os.path.exists(path):
+            os.mkdir(path)
+        write_cgroup_file(os.path.join(path, "cpuset.cpus"), ",".join([str(c) for c in cpus]))
+        write_cgroup_file(os.path.join(path, "cpuset.cpus.partition"), "root")
+    except OSError as e:
+        logger.warning("Failed to reserve CPUs in cgroup "+path+": "+str(e))
+        release_cpus(path)
+        return None
+    return path
+
+# Release CPUs reserved with reserve_cpus().
+def release_cpus(path):
+    if path is None or not os.path.exists(path):
+        return
+    try:
+        write_cgroup_file(os.path.join(path, "cpuset.cpus.partition"), "member")
+        os.rmdir(path)
+    except OSError as e:
+        logger.warning("Failed to release cgroup "+path+": "+str(e))
+
 # Run the command `rcommand` for `trials` times on `P` CPUs.  Uses
 # taskset to restrict process to a given list of CPU IDs, if possible.
 # In particular, Darwin does not support taskset.
-def run_on_p_workers(P, trials, rcommand):
+#
+# If the noise gate is enabled, waits for the target CPUs to quiesce
+# before running the trials and appends a noise score for each trial
+# to the noise_scores list, if one is given.
+#
+# The first `warmup_trials` runs of the command are executed but their
+# output is discarded.
+def run_on_p_workers(P, trials, rcommand, noise_scores=None, warmup_trials=0):
     cpu_ordering = get_cpu_ordering()
     cpu_online = cpu_ordering[:P]
+    cpu_ids = [p for (p,m) in cpu_online]
 
     # time.sleep(0.1)
     if sys.platform != "darwin":
-        rcommand = "taskset -c " + ",".join([str(p) for (p,m) in
-                                             cpu_online]) + " " + rcommand
+        rcommand = "taskset -c " + ",".join([str(p) for p in cpu_ids]) + " " + rcommand
+
+    gated = noise_threshold is not None and noise_gate_supported()
+    cgroup = None
+    if gated and reserve_cgroup is not None:
+        cgroup = reserve_cpus(cpu_ids, reserve_cgroup)
+
+    # Move each trial into the reserved cgroup, if we have one.
+    def enter_cgroup():
+        write_cgroup_file(os.path.join(cgroup, "cgroup.procs"), str(os.getpid()))
 
     logger.info(rcommand)
     output = ""
     errout = ""
-    for t in range(1, int(trials)+1):
-        proc = subprocess.Popen([rcommand], shell=True,
-                                stdout=subprocess.PIPE,
-                                stderr=subprocess.PIPE)
-        out,err=proc.communicate()
-        output = output + str(out, "utf-8")
-        errout = errout + str(err, "utf-8")
+    try:
+        if gated:
+            wait_for_quiescence(cpu_ids)
+        # Run the warm-up trials.
+        for t in range(1, int(warmup_trials)+1):
+            proc = subprocess.Popen([rcommand], shell=True,
+                                    stdout=subprocess.DEVNULL,
+                                    stderr=subprocess.DEVNULL,
+                                    preexec_fn=(enter_cgroup if cgroup is not None else None))
+            proc.wait()
+            if trial_hook is not None:
+                trial_hook(P, t, True)
+        for t in range(1, int(trials)+1):
+            if gated and noise_scores is not None:
+                score,_ = measure_noise(cpu_ids)
+                noise_scores.append(score)
+            proc = subprocess.Popen([rcommand], shell=True,
+                                    stdout=subprocess.PIPE,
+                                    stderr=subprocess.PIPE,
+                                    preexec_fn=(enter_cgroup if cgroup is not None else None))
+            out,err=proc.communicate()
+            output = output + str(out, "utf-8")
+            errout = errout + str(err, "utf-8")
+            if trial_hook is not None:
+                trial_hook(P, t, False)
+    finally:
+        release_cpus(cgroup)
     return output,errout
 
 # Attempt to parse the CPU configuration of the system and return a
@@ -101,6 +331,12 @@ def get_cpu_ordering():
         socket_id = int(items[2])
         avail_cpus.append((socket_id, core_id, cpu_id))
 
+    # Only use CPU IDs this process is allowed to run on, e.g., if it
+    # runs in a container pinned to a subset of sockets.
+    if hasattr(os, "sched_getaffinity"):
+        allowed = os.sched_getaffinity(0)
+        avail_cpus = [x for x in avail_cpus if x[2] in allowed]
+
     # Get the set of CPU IDs that correspond with distinct physical
     # cores.
     avail_cpus = sorted(avail_cpus)
@@ -114,23 +350,75 @@ def get_cpu_ordering():
         ret.append((x[2], x[0]))
     return ret
 
+################################################################################
+## Adaptive CPU-count sweeps
+
+# Relative tolerance within which the scalability models must fit the
+# results of an adaptive sweep, and the maximum number of CPU counts
+# to measure in a sweep.  A maximum of None measures at most twice as
+# many CPU counts as the initial geometric set.
+adaptive_tolerance = 0.05
+adaptive_max_cells = None
+
+# Configure adaptive CPU-count sweeps.
+def configure_adaptive_sweep(tolerance, max_cells=None):
+    global adaptive_tolerance, adaptive_max_cells
+    adaptive_tolerance = tolerance
+    adaptive_max_cells = max_cells
+
+################################################################################
+## Progress reporting
+
+# Function to call after running the trials on each CPU count, or
+# None.  It is called with the binary, the CPU count, and the elapsed
+# wall-clock time in seconds, e.g., to report progress.
+cell_hook = None
+
+# Set the function to call after running the trials on each CPU count.
+def set_cell_hook(fn):
+    global cell_hook
+    cell_hook = fn
+
+# Function to call after each trial, or None.  It is called with the
+# CPU count, the number of the trial, counting from 1, and whether the
+# trial is a warm-up trial, e.g., to collect files the trial wrote.
+trial_hook = None
+
+# Set the function to call after each trial.
+def set_trial_hook(fn):
+    global trial_hook
+    trial_hook = fn
+
 ################################################################################
 # Run the specified program with the given arguments.
 #   prog - Binary executable to run.
 #   prog_args - List of arguments to pass to the binary
 #   parse_output_fn - Function to parse the output of running the
-#     binary to extract the running time.
+#     binary to extract the running time.  It is called with the
+#     output, the error output, prog, prog_args, the dictionary of
+#     timings to add to, and the CPU count the binary ran on.
 #   requested_trials - Number of times to rerun the binary.
-#   cpu_counts - String describing the set of CPU counts to run the binary on.
+#   cpu_counts - String describing the set of CPU counts to run the
+#     binary on: a comma-separated list of CPU counts, "all", or
+#     "adaptive" to choose CPU counts by fitting scalability models.
 #   out_csv - CSV filename where raw performance data will be written.
+#   warmup_trials - Number of warm-up trials to run on each CPU count
+#     and exclude from the results.
+#   warmup_internal - If True, the binary itself runs the warm-up
+#     trials, e.g., as extra rounds included in prog_args, and the first
+#     warmup_trials timings parsed for each benchmark are discarded.
 def run(prog, prog_args, parse_output_fn, requested_trials="1",
-        cpu_counts=None, out_csv="out.csv"):
+        cpu_counts=None, out_csv="out.csv", warmup_trials="0",
+        warmup_internal=False):
     # Parse cpu_counts argument to get list of CPU counts.
     NCPUS = get_n_cpus()
+    adaptive = False
     if cpu_counts is None:
         cpu_counts = [NCPUS]
     elif cpu_counts == "all":
         cpu_counts = range(1, NCPUS+1)
+    elif cpu_counts == "adaptive":
+        adaptive = True
     else:
         cpu_counts = list(map(int, cpu_counts.split(",")))
 
@@ -140,29 +428,68 @@ def run(prog, prog_args, parse_output_fn, requested_trials="1",
     logger.info("Timing " + run_command + " on <= " + str(NCPUS) + " cpus.")
 
     results = dict()
-    last_CPU = NCPUS+1
-    # Loop over possible CPU counts.
-    for count in range(1, NCPUS+1):
-        # If this count is a requested CPU count to use, run the
-        # program on that CPU count.
-        if count in cpu_counts:
-            try:
-                timings = dict()
-                # Run the program on that CPU count.
-                out,err = run_on_p_workers(count, requested_trials,
-                                           run_command)
-                # Parse the output of the run to extract timings.
-                parse_output_fn(out, err, prog, prog_args, timings)
-                # Add the timings to the set of results.
-                if str(count) not in results:
-                    results[str(count)] = timings
-                else:
-                    results[str(count)].append(timings)
-            except KeyboardInterrupt:
-                logger.info("Benchmarking stopped early at " +
-                            str(count-1) + " cpus.")
-                last_CPU = count
-                break
+    # Noise scores of the trials run, indexed by CPU count.
+    noise = dict()
+
+    # Run the program on the given CPU count and add the timings to the
+    # set of results.
+    def run_cell(count):
+        start = time.time()
+        timings = dict()
+        noise_scores = []
+        # Run the program on that CPU count.
+        out,err = run_on_p_workers(count, requested_trials,
+                                   run_command, noise_scores,
+                                   0 if warmup_internal else warmup_trials)
+        if noise_scores:
+            noise[str(count)] = noise_scores
+        # Parse the output of the run to extract timings.
+        parse_output_fn(out, err, prog, prog_args, timings, count)
+        # Discard the timings of warm-up trials run by the
+        # binary itself.
+        if warmup_internal:
+            for bench in timings:
+                timings[bench] = timings[bench][int(warmup_trials):]
+        # Add the timings to the set of results.
+        results[str(count)] = timings
+        if cell_hook is not None:
+            cell_hook(prog, count, time.time() - start)
+
+    if adaptive:
+        # Start with a coarse, geometric set of CPU counts.  Then
+        # repeatedly fit scalability models to the results and measure
+        # the CPU count where the models are least certain, until the
+        # models fit everywhere or the budget of cells is exhausted.
+        cpu_counts = geometric_cpu_counts(NCPUS)
+        max_cells = adaptive_max_cells
+        if max_cells is None:
+            max_cells = 2 * len(cpu_counts)
+        try:
+            for count in cpu_counts:
+                run_cell(count)
+            while len(results) < max_cells:
+                count = next_cpu_count(results, adaptive_tolerance)
+                if count is None:
+                    break
+                logger.info("Adding measurement on " + str(count) + " cpus.")
+                run_cell(count)
+        except KeyboardInterrupt:
+            logger.info("Benchmarking stopped early after " +
+                        str(len(results)) + " cpu counts.")
+    else:
+        last_CPU = NCPUS+1
+        # Loop over possible CPU counts.
+        for count in range(1, NCPUS+1):
+            # If this count is a requested CPU count to use, run the
+            # program on that CPU count.
+            if count in cpu_counts:
+                try:
+                    run_cell(count)
+                except KeyboardInterrupt:
+                    logger.info("Benchmarking stopped early at " +
+                                str(count-1) + " cpus.")
+                    last_CPU = count
+                    break
 
     # Determine number of trials run.
     trials = 0
@@ -175,7 +502,30 @@ def run(prog, prog_args, parse_output_fn, requested_trials="1",
         # # Generate header for CSV file
         # out_csv_file.write("bench,P," + ','.join(["t" + str(i) for i
         #                                           in range(1,trials+1)]) + '\n')
-        for cpu_count in results:
+        for cpu_count in sorted(results, key=int):
             for bench in results[cpu_count]:
                 out_csv_file.write(bench + ',' + str(cpu_count) + ','
                                    + ','.join(results[cpu_count][bench]) + '\n')
+
+    # Output noise scores, if any, to a separate CSV file.
+    if noise:
+        write_noise_scores(noise_csv_name(out_csv), noise)
+
+    # Output the fitted scalability models of an adaptive sweep.
+    if adaptive:
+        base = os.path.splitext(out_csv)[0]
+        write_model_fits(results, NCPUS, base+"-fit.csv", base+"-curve.csv")
+
+# Get the name of the CSV file that records the noise scores for the
+# raw performance data in out_csv.
+def noise_csv_name(out_csv):
+    return os.path.splitext(out_csv)[0]+"-noise.csv"
+
+# Write the noise score of each trial to noise_csv.  Each row contains
+# the CPU count followed by the noise scores of the trials run on that
+# CPU count.
+def write_noise_scores(noise_csv, noise):
+    with open(noise_csv, "w") as noise_csv_file:
+        for cpu_count in noise:
+            noise_csv_file.write(str(cpu_count) + ','
+                                 + ','.join(["{:0.4f}".format(x) for x in noise[cpu_count]]) + '\n')
@@ -0,0 +1,211 @@
+###########################################################################
+### scalability.py: Methods for fitting scalability models to running
+### times measured on different numbers of processors, and for
+### choosing which processor counts to measure adaptively.
+###
+### Two models are fit to the running times T(P) of a program:
+###
+### - Amdahl's law: T(P) = T1 * (s + (1 - s) / P), where s is the
+###   serial fraction of the program.
+###
+### - The Universal Scalability Law (USL):
+###   T(P) = T1 * (1 + sigma * (P - 1) + kappa * P * (P - 1)) / P, where
+###   sigma models contention and kappa models coherency costs.
+###
+### Both models are linear in their parameters once T1 is fixed, so
+### they are fit with ordinary least squares on the measured medians.
+###########################################################################
+
+import csv
+import math
+import statistics
+
+all_models = ['amdahl', 'usl']
+
+# Get a coarse, geometric set of CPU counts between 1 and ncpus, which
+# always includes ncpus.
+def geometric_cpu_counts(ncpus):
+    counts = []
+    p = 1
+    while p < ncpus:
+        counts.append(p)
+        p *= 2
+    counts.append(ncpus)
+    return counts
+
+# Fit Amdahl's law to the points in timings, a dictionary mapping CPU
+# count to running time.  Returns the tuple (T1, s).
+def fit_amdahl(timings):
+    # T(P) = a + b / P, where a = T1 * s and b = T1 * (1 - s).
+    xs = [1.0 / p for p in timings]
+    ys = [timings[p] for p in timings]
+    if len(xs) < 2:
+        return ys[0], 0.0
+    mx = statistics.mean(xs)
+    my = statistics.mean(ys)
+    sxx = sum([(x - mx) ** 2 for x in xs])
+    sxy = sum([(x - mx) * (y - my) for (x, y) in zip(xs, ys)])
+    b = sxy / sxx if sxx > 0 else 0.0
+    a = my - b * mx
+    # Keep the parameters physically meaningful.
+    a = max(a, 0.0)
+    b = max(b, 0.0)
+    T1 = a + b
+    if T1 == 0:
+        return ys[0], 0.0
+    return T1, a / T1
+
+# Fit the USL to the points in timings, a dictionary mapping CPU count
+# to running time.  The running time on 1 CPU must be among the
+# points.  Returns the tuple (T1, sigma, kappa).
+def fit_usl(timings):
+    T1 = timings[1]
+    # P * T(P) / T1 - 1 = sigma * (P - 1) + kappa * P * (P - 1)
+    rows = [(p - 1.0, p * (p - 1.0), p * timings[p] / T1 - 1.0)
+            for p in timings if p > 1]
+    s11 = sum([u * u for (u, v, y) in rows])
+    s12 = sum([u * v for (u, v, y) in rows])
+    s22 = sum([v * v for (u, v, y) in rows])
+    s1y = sum([u * y for (u, v, y) in rows])
+    s2y = sum([v * y for (u, v, y) in rows])
+    det = s11 * s22 - s12 * s12
+    if len(rows) >= 2 and det > 0:
+        sigma = (s22 * s1y - s12 * s2y) / det
+        kappa = (s11 * s2y - s12 * s1y) / det
+    else:
+        sigma = s1y / s11 if s11 > 0 else 0.0
+        kappa = 0.0
+    # Negative coefficients are not meaningful.  Refit the remaining
+    # coefficient alone if one of them is clamped.
+    if kappa < 0:
+        kappa = 0.0
+        sigma = s1y / s11 if s11 > 0 else 0.0
+    if sigma < 0:
+        sigma = 0.0
+        kappa = max(s2y / s22, 0.0) if s22 > 0 else 0.0
+    return T1, sigma, kappa
+
+# Predict the running time on P CPUs using Amdahl's law.
+def predict_amdahl(params, P):
+    T1, s = params
+    return T1 * (s + (1.0 - s) / P)
+
+# Predict the running time on P CPUs using the USL.
+def predict_usl(params, P):
+    T1, sigma, kappa = params
+    return T1 * (1.0 + sigma * (P - 1) + kappa * P * (P - 1)) / P
+
+# Get the CPU count at which the USL predicts peak throughput, or None
+# if the predicted throughput does not peak.
+def usl_peak(params):
+    T1, sigma, kappa = params
+    if kappa <= 0 or sigma >= 1:
+        return None
+    return math.sqrt((1.0 - sigma) / kappa)
+
+# Fit both models to the given timings.  Returns a dictionary mapping
+# each model name to its parameters, or None if the timings do not
+# include a running time on 1 CPU.
+def fit_models(timings):
+    if 1 not in timings:
+        return None
+    return {'amdahl': fit_amdahl(timings), 'usl': fit_usl(timings)}
+
+# Predict the running time on P CPUs using the given model.
+def predict(model, params, P):
+    if model == 'amdahl':
+        return predict_amdahl(params, P)
+    return predict_usl(params, P)
+
+# Get the median running time on each CPU count for each benchmark in
+# results, which maps CPU counts, as strings, to dictionaries mapping
+# benchmark names to lists of timing strings.  Returns a dictionary
+# mapping each benchmark to a dictionary mapping CPU count to median.
+def median_timings(results):
+    medians = dict()
+    for cpu_count in results:
+        for bench in results[cpu_count]:
+            vals = [float(x) for x in results[cpu_count][bench]]
+            if not vals:
+                continue
+            if bench not in medians:
+                medians[bench] = dict()
+            medians[bench][int(cpu_count)] = statistics.median(vals)
+    return medians
+
+# Get the largest relative error of the given model over the timings.
+def max_relative_error(timings, model, params):
+    return max([abs(predict(model, params, p) - timings[p]) / max(timings[p], 1e-12)
+                for p in timings])
+
+# Score how uncertain the fitted models are between the measured CPU
+# counts a and b, for the benchmark timings given.  The score is the
+# larger of the relative residual of the better-fitting model at a and
+# b, and the relative disagreement at the midpoint of a and b between
+# the models that fit all timings to within tol.
+def gap_score(timings, fits, a, b, tol):
+    mid = (a + b) // 2
+    errors = dict([(m, max_relative_error(timings, m, fits[m])) for m in all_models])
+    plausible = [m for m in all_models if errors[m] <= tol]
+    if not plausible:
+        plausible = [min(all_models, key=lambda m: errors[m])]
+    preds = [predict(m, fits[m], mid) for m in plausible]
+    disagreement = (max(preds) - min(preds)) / max(min(preds), 1e-12)
+    residual = 0.0
+    for p in (a, b):
+        residual = max(residual,
+                       min([abs(predict(m, fits[m], p) - timings[p]) / max(timings[p], 1e-12)
+                            for m in plausible]))
+    return max(disagreement, residual)
+
+# Choose the next CPU count to measure, given the results measured so
+# far.  Returns None if the models fit all benchmarks to within the
+# relative tolerance tol everywhere between the measured CPU counts.
+def next_cpu_count(results, tol):
+    medians = median_timings(results)
+    best_score = tol
+    best_count = None
+    for bench in medians:
+        timings = medians[bench]
+        fits = fit_models(timings)
+        if fits is None:
+            continue
+        measured = sorted(timings)
+        for (a, b) in zip(measured, measured[1:]):
+            if b - a <= 1 or str((a + b) // 2) in results:
+                continue
+            score = gap_score(timings, fits, a, b, tol)
+            if score > best_score:
+                best_score = score
+                best_count = (a + b) // 2
+    return best_count
+
+# Write the fitted model parameters for the benchmarks in results to
+# fit_csv, and the measured and predicted running times on every CPU
+# count from 1 to ncpus to curve_csv.
+def write_model_fits(results, ncpus, fit_csv, curve_csv):
+    medians = median_timings(results)
+    with open(fit_csv, "w") as fit_csv_file, open(curve_csv, "w") as curve_csv_file:
+        fit_writer = csv.writer(fit_csv_file, delimiter=',')
+        curve_writer = csv.writer(curve_csv_file, delimiter=',')
+        fit_writer.writerow(["bench", "model", "T1", "serial fraction", "sigma", "kappa",
+                             "peak P", "rmse"])
+        curve_writer.writerow(["bench", "P", "measured"] + all_models)
+        for bench in medians:
+            timings = medians[bench]
+            fits = fit_models(timings)
+            if fits is None:
+                continue
+            for m in all_models:
+                params = fits[m]
+                rmse = math.sqrt(statistics.mean([(predict(m, params, p) - timings[p]) ** 2
+                                                  for p in timings]))
+                if m == 'amdahl':
+                    fit_writer.writerow([bench, m, params[0], params[1], '', '', '', rmse])
+                else:
+                    peak = usl_peak(params)
+                    fit_writer.writerow([bench, m, params[0], '', params[1], params[2],
+                                         '' if peak is None else peak, rmse])
+            for p in range(1, ncpus+1):
+                curve_writer.writerow([bench, p, timings.get(p, '')] +
+                                      [predict(m, fits[m], p) for m in all_models])